@@ -0,0 +1 @@
+"""xs 命令行工具"""
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""xs 命令的统一入口: python -m xs_tools <子命令> [选项]
+
+子命令对应的模块只在被调用时才导入；设置 XS_TIMINGS=1 时输出导入和执行耗时。
+"""
+import os
+import sys
+import time
+import importlib
+
+# 各子命令模块以平铺方式互相导入，需要把本目录加入搜索路径
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+if TOOLS_DIR not in sys.path:
+    sys.path.insert(0, TOOLS_DIR)
+
+# 子命令 -> (模块名, 追加在参数前面的固定参数)
+COMMANDS = {
+    'make-user-space': ('mucs', []),
+    'create-project': ('mkpro', []),
+    'clean-user-space': ('rmucs', []),
+    'clean-project': ('rmpro', []),
+    'clone-project': ('cppro', []),
+    'move-project': ('mvpro', []),
+    'find': ('view_project', []),
+    'symbols': ('xs_symbols', []),
+    'cache': ('xs_cache', []),
+    'config': ('xs_config', []),
+    'watch': ('xs_watch', []),
+    'b': ('xs_build', ['b']),
+    'build': ('xs_build', ['build']),
+    'stats': ('xs_build', ['stats']),
+    'daemon': ('xs_daemon', []),
+    'trash': ('xs_trash', []),
+}
+
+# 直接交给 build.py 的子命令
+MENUCONFIG_COMMANDS = {
+    'menu': ['menuconfig'],
+    'menuconfig': ['ws63-liteos-app', 'menuconfig'],
+}
+
+def print_timings(command, import_time, exec_time):
+    print(f"[XS_TIMINGS] {command}: 导入 {import_time * 1000:.1f} ms，执行 {exec_time * 1000:.1f} ms",
+          file=sys.stderr)
+    # 只有实际加过文件锁的命令才会导入 xs_fileio
+    fileio = sys.modules.get('xs_fileio')
+    waits = fileio.lock_waits() if fileio else []
+    if waits:
+        path, longest = max(waits, key=lambda item: item[1])
+        print(f"[XS_TIMINGS] {command}: 文件锁 {len(waits)} 次，共等待 {sum(w for _, w in waits) * 1000:.1f} ms，"
+              f"最长 {longest * 1000:.1f} ms ({path})", file=sys.stderr)
+
+def dispatch(argv):
+    if not argv:
+        print("无效的命令，请使用 xs -h 查看简要帮助信息，或使用 xs --help 查看详细帮助信息。")
+        return 1
+
+    command, args = argv[0], argv[1:]
+
+    if command in ('-h', '--help'):
+        import xs_help
+        print(xs_help.BRIEF_HELP if command == '-h' else xs_help.DETAILED_HELP, end='')
+        return 0
+
+    if command in MENUCONFIG_COMMANDS:
+        import xs_build
+        return xs_build.run_build_py(MENUCONFIG_COMMANDS[command])
+
+    if command == 'find' and not args:
+        print("无效的参数，请使用 xs find all 查找所有项目，或使用 xs find <代码空间> 查找指定代码空间的项目。")
+        return 1
+
+    if command not in COMMANDS:
+        print("无效的命令，请使用 xs -h 查看简要帮助信息，或使用 xs --help 查看详细帮助信息。")
+        return 1
+
+    module_name, fixed_args = COMMANDS[command]
+    timings = os.environ.get('XS_TIMINGS') == '1'
+
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    imported = time.perf_counter()
+    # argparse 用 sys.argv[0] 作为 usage 中的程序名，改成用户输入的 xs <子命令>；
+    # 带固定参数的命令(如 xs build)由子解析器补上子命令名，这里只写 xs
+    argv0 = sys.argv[0]
+    sys.argv[0] = 'xs' if fixed_args else f'xs {command}'
+    try:
+        result = module.main(fixed_args + args)
+    except SystemExit as e:
+        result = e.code
+    finally:
+        sys.argv[0] = argv0
+        if timings:
+            print_timings(command, imported - start, time.perf_counter() - imported)
+    return result
+
+def main():
+    sys.exit(dispatch(sys.argv[1:]))
+
+if __name__ == "__main__":
+    main()
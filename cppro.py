@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""xs clone-project: 以已有项目为模板复制出新项目
+
+文件优先用 reflink(写时复制)复制，不支持时只读文件使用硬链接、其余文件普通复制，大体积资源不会逐字节复制。
+源码、Kconfig 和 CMakeLists.txt 等文本文件中由 create-project 生成的全大写/全小写项目名标识符
+(CONFIG_<项目>、<项目>_TASK_PRIO、<项目小写>_test_task 等)以及文件名中的项目名替换为新项目名，
+新项目按 create-project 的方式登记到用户代码空间的 Kconfig 和 CMakeLists.txt。
+"""
+import os
+import re
+import sys
+import stat
+import shutil
+import argparse
+import time
+
+from xs_common import is_valid_project_name, find_application_dir
+import xs_fileio
+import xs_index
+import mkpro
+
+# 需要替换项目名的文本文件，其余文件不读取内容直接复制
+TEXT_EXTS = ('.c', '.h', '.cpp', '.hpp', '.S', '.s', '.txt', '.cmake', '.ld', '.md', '.json', '.py')
+TEXT_NAMES = ('Kconfig',)
+# 超过该大小的文件不当作源码处理
+MAX_TEXT_SIZE = 1024 * 1024
+
+# create-project 生成的引用项目名的标识符形式，只替换这些，SDK 中恰好含有项目名的标识符
+# (如项目 APP 时的 app_init.h、app_run，项目 OSAL 时的 soc_osal.h、osal_printk)保持不变
+UPPER_PREFIXES = ('CONFIG_', 'SAMPLE_SUPPORT_', 'SparkLine_')
+UPPER_SUFFIXES = ('_TASK_STACK_SIZE', '_TASK_PRIO', '_DURATION_MS', 'Task')
+LOWER_SUFFIXES = ('_test_task', '_test_entry')
+
+def name_pattern(name):
+    """匹配 create-project 生成的项目名形式: <NAME>、CONFIG_<NAME>、SAMPLE_SUPPORT_<NAME>、<NAME>_TASK_PRIO 等，
+    以及 <name>_test_task、<name>_test_entry 和 <name>.c/.h；整个标识符前后都不能再接字母、数字或 _"""
+    upper = re.escape(name.upper())
+    lower = re.escape(name.lower())
+    alt = lambda items: '|'.join(re.escape(item) for item in items)
+    return re.compile(
+        rf'(?<![A-Za-z0-9_])(?:'
+        rf'(?P<pre>{alt(UPPER_PREFIXES)})?(?P<upper>{upper})(?P<usuf>{alt(UPPER_SUFFIXES)})?'
+        rf'|(?P<lower>{lower})(?P<lsuf>{alt(LOWER_SUFFIXES)}|(?=\.[ch](?![A-Za-z0-9_])))'
+        rf')(?![A-Za-z0-9_])')
+
+def rename_identifiers(text, pattern, new_name):
+    def replace(m):
+        if m.group('upper'):
+            return (m.group('pre') or '') + new_name.upper() + (m.group('usuf') or '')
+        return new_name.lower() + m.group('lsuf')
+    return pattern.sub(replace, text)
+
+def is_text_file(name, size):
+    return (name in TEXT_NAMES or name.endswith(TEXT_EXTS)) and size <= MAX_TEXT_SIZE
+
+def clone_tree(src_dir, dst_dir, src_name, dst_name):
+    """复制项目目录并替换项目名，返回各复制方式的文件数"""
+    pattern = name_pattern(src_name)
+    counts = {'reflink': 0, 'hardlink': 0, 'copy': 0, 'rewrite': 0}
+    for dirpath, dirnames, filenames in os.walk(src_dir):
+        rel = os.path.relpath(dirpath, src_dir)
+        target_dir = os.path.normpath(os.path.join(dst_dir, rename_identifiers(rel, pattern, dst_name)))
+        os.makedirs(target_dir, exist_ok=True)
+        shutil.copystat(dirpath, target_dir)
+        for name in filenames:
+            src = os.path.join(dirpath, name)
+            dst = os.path.join(target_dir, rename_identifiers(name, pattern, dst_name))
+            if os.path.islink(src):
+                os.symlink(os.readlink(src), dst)
+                counts['copy'] += 1
+                continue
+
+            st = os.stat(src)
+            if is_text_file(name, st.st_size):
+                with open(src, 'rb') as f:
+                    data = f.read()
+                try:
+                    text = data.decode('utf-8')
+                except UnicodeDecodeError:
+                    text = None
+                if text is not None and pattern.search(text):
+                    xs_fileio.write_text(dst, rename_identifiers(text, pattern, dst_name),
+                                         mode=stat.S_IMODE(st.st_mode))
+                    counts['rewrite'] += 1
+                    continue
+
+            # 没有写权限的文件视为只读资源，可以与源项目共用数据
+            read_only = not st.st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+            counts[xs_fileio.clone_file(src, dst, allow_link=read_only)] += 1
+    return counts
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='复制项目工具')
+    parser.add_argument('source', help='作为模板的已有项目名称')
+    parser.add_argument('dest', help='新项目名称')
+    parser.add_argument('-p', '--parent', help='指定父级用户代码空间名称')
+
+    args = parser.parse_args(argv)
+
+    space = args.parent or 'user_project'
+
+    start_time = time.perf_counter()
+
+    # 查找application目录
+    application_dir = find_application_dir()
+    samples_dir = os.path.join(application_dir, 'samples')
+    user_project_dir = os.path.join(samples_dir, space)
+
+    if not is_valid_project_name(args.source):
+        sys.exit(1)
+    src_dir = os.path.join(user_project_dir, args.source.upper())
+    if not os.path.isdir(src_dir):
+        print(f"错误: 项目 '{args.source}' 在用户代码空间 '{space}' 中不存在!")
+        sys.exit(1)
+
+    # 与 create-project 相同的名称、存在性和配置符号冲突检查
+    if not mkpro.check_batch([(space, args.dest)], samples_dir):
+        sys.exit(1)
+
+    # 1. 复制项目目录，中途失败时删除已复制的部分
+    dst_dir = os.path.join(user_project_dir, args.dest.upper())
+    try:
+        counts = clone_tree(src_dir, dst_dir, args.source, args.dest)
+    except OSError as e:
+        shutil.rmtree(dst_dir, ignore_errors=True)
+        print(f"错误: 复制项目目录失败: {e}")
+        sys.exit(1)
+    print(f"已复制项目目录: {src_dir} -> {dst_dir}")
+
+    # 2. 更新CMakeLists.txt
+    mkpro.update_cmakelists([args.dest], user_project_dir)
+
+    # 3. 更新Kconfig
+    mkpro.update_kconfig([args.dest], user_project_dir)
+
+    # 刷新项目索引
+    xs_index.refresh_index(samples_dir)
+
+    xs_fileio.report_touched()
+
+    elapsed = time.perf_counter() - start_time
+    print(f"\n项目 '{args.source.upper()}' 已复制为 '{args.dest.upper()}' (用户代码空间 '{space}')，耗时 {elapsed:.3f} 秒")
+    print(f"  替换项目名 {counts['rewrite']} 个文件，reflink {counts['reflink']} 个，"
+          f"硬链接 {counts['hardlink']} 个，普通复制 {counts['copy']} 个")
+
+if __name__ == "__main__":
+    main()
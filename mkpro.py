@@ -2,26 +2,16 @@
 import os
 import sys
 import stat
-import re
 import argparse
+import json
+import time
 
-def is_valid_project_name(name):
-    # 检查是否是有效的变量名
-    if not re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', name):
-        print(f"错误: 项目名 '{name}' 不符合变量名规则")
-        print("项目名必须以字母或下划线开头，后面可以跟字母、数字或下划线")
-        return False
-    return True
-
-def find_application_dir():
-    current_dir = os.getcwd()
-    application_dir = os.path.join(current_dir, 'application')
-    
-    if os.path.exists(application_dir) and os.path.isdir(application_dir):
-        return application_dir
-    else:
-        print("错误: 未找到 'application' 目录!")
-        sys.exit(1)
+from xs_common import is_valid_project_name, find_application_dir
+import xs_daemon
+import xs_fileio
+import xs_index
+import xs_parse
+import xs_symbols
 
 def check_project_exists(project_name, user_project_dir):
     project_dir = os.path.join(user_project_dir, project_name.upper())
@@ -30,41 +20,15 @@ def check_project_exists(project_name, user_project_dir):
         return True
     return False
 
-def update_cmakelists(project_name, user_project_dir):
-    cmake_file = os.path.join(user_project_dir, 'CMakeLists.txt')
-    
-    if not os.path.exists(cmake_file):
-        print(f"错误: {cmake_file} 文件不存在!")
-        sys.exit(1)
-    
-    with open(cmake_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    insert_pos = content.find('set(SOURCES "${SOURCES}" PARENT_SCOPE)')
-    if insert_pos == -1:
-        print("错误: 未找到插入位置!")
-        sys.exit(1)
-    
-    new_entry = f'''
+def cmake_entry(project_name):
+    return f'''
 if(DEFINED CONFIG_SAMPLE_SUPPORT_{project_name.upper()})
   add_subdirectory_if_exist({project_name.upper()})
 endif()
 '''
-    updated_content = content[:insert_pos] + new_entry + content[insert_pos:]
-    
-    with open(cmake_file, 'w', encoding='utf-8') as f:
-        f.write(updated_content)
-    
-    print(f"已更新 {cmake_file}")
 
-def update_kconfig(project_name, user_project_dir):
-    kconfig_file = os.path.join(user_project_dir, 'Kconfig')
-    
-    if not os.path.exists(kconfig_file):
-        print(f"错误: {kconfig_file} 文件不存在!")
-        sys.exit(1)
-    
-    config_entry = f'''
+def kconfig_entry(project_name, user_project_dir):
+    return f'''
 config SAMPLE_SUPPORT_{project_name.upper()}
   bool
   prompt "Support {project_name.upper()} Sample."
@@ -81,11 +45,52 @@ endmenu
 
 endif
 '''
+
+def update_cmakelists(project_names, user_project_dir):
+    # 一次读写完成整批项目的插入
+    cmake_file = os.path.join(user_project_dir, 'CMakeLists.txt')
     
-    with open(kconfig_file, 'a', encoding='utf-8') as f:
-        f.write(config_entry)
+    with xs_fileio.file_lock(cmake_file):
+        cmake = xs_parse.load_cmakelists(cmake_file)
+        if cmake is None:
+            print(f"错误: {cmake_file} 文件不存在!")
+            sys.exit(1)
+    
+        insert_pos = cmake.find(('set', 'SOURCES'))
+        if insert_pos is None:
+            print("错误: 未找到插入位置!")
+            sys.exit(1)
+    
+        for name in project_names:
+            if cmake.has(('config', f'SAMPLE_SUPPORT_{name.upper()}')):
+                print(f"警告: {cmake_file} 中已存在 {name.upper()} 配置!")
+                continue
+            cmake.insert_before(insert_pos, cmake_entry(name))
+    
+        if cmake.save():
+            print(f"已更新 {cmake_file}")
+        else:
+            print(f"{cmake_file} 内容无变化，未写入")
+
+def update_kconfig(project_names, user_project_dir):
+    kconfig_file = os.path.join(user_project_dir, 'Kconfig')
     
-    print(f"已更新 {kconfig_file}")
+    with xs_fileio.file_lock(kconfig_file):
+        kconfig = xs_parse.load_kconfig(kconfig_file)
+        if kconfig is None:
+            print(f"错误: {kconfig_file} 文件不存在!")
+            sys.exit(1)
+    
+        for name in project_names:
+            if kconfig.has(('config', f'SAMPLE_SUPPORT_{name.upper()}')):
+                print(f"警告: {kconfig_file} 中已存在 {name.upper()} 配置!")
+                continue
+            kconfig.append(kconfig_entry(name, user_project_dir))
+    
+        if kconfig.save():
+            print(f"已更新 {kconfig_file}")
+        else:
+            print(f"{kconfig_file} 内容无变化，未写入")
 
 def create_project_dir(project_name, user_project_dir):
     project_dir = os.path.join(user_project_dir, project_name.upper())
@@ -105,15 +110,12 @@ def create_project_kconfig(project_name, project_dir):
         print(f"警告: {kconfig_path} 已存在!")
         return
     
-    with open(kconfig_path, 'w', encoding='utf-8') as f:
-        f.write(f'''config {project_name.upper()}
+    # 写入并修改权限为777
+    xs_fileio.write_text(kconfig_path, f'''config {project_name.upper()}
     int
     prompt "{project_name.upper()}"
     default 0
-''')
-    
-    # 修改权限为777
-    os.chmod(kconfig_path, stat.S_IRWXU | stat.S_IRWXG | stat.S_IRWXO)
+''', mode=stat.S_IRWXU | stat.S_IRWXG | stat.S_IRWXO)
     print(f"已创建并设置权限: {kconfig_path}")
 
 def create_cmakelists(project_name, project_dir):
@@ -123,18 +125,15 @@ def create_cmakelists(project_name, project_dir):
         print(f"警告: {cmake_path} 已存在!")
         return
     
-    with open(cmake_path, 'w', encoding='utf-8') as f:
-        f.write(f'''set(PUBLIC_HEADER "${{PUBLIC_HEADER}}"  
+    # 写入并修改权限为777
+    xs_fileio.write_text(cmake_path, f'''set(PUBLIC_HEADER "${{PUBLIC_HEADER}}"  
 "${{CMAKE_CURRENT_SOURCE_DIR}}/inc" 
 PARENT_SCOPE)
 
 set(SOURCES "${{SOURCES}}" 
 "${{CMAKE_CURRENT_SOURCE_DIR}}/{project_name.upper()}.c" 
 PARENT_SCOPE)
-''')
-    
-    # 修改权限为777
-    os.chmod(cmake_path, stat.S_IRWXU | stat.S_IRWXG | stat.S_IRWXO)
+''', mode=stat.S_IRWXU | stat.S_IRWXG | stat.S_IRWXO)
     print(f"已创建并设置权限: {cmake_path}")
 
 def create_c_file(project_name, project_dir):
@@ -190,61 +189,187 @@ static void {project_name.lower()}_test_entry(void)
 app_run({project_name.lower()}_test_entry);
 '''
     
-    with open(c_file_path, 'w', encoding='utf-8') as f:
-        f.write(c_content)
+    xs_fileio.write_text(c_file_path, c_content)
     
     print(f"已创建: {c_file_path}")
 
-def main():
-    parser = argparse.ArgumentParser(description='创建项目工具')
-    parser.add_argument('project_name', help='项目名称')
-    parser.add_argument('-p', '--parent', help='指定父级用户代码空间名称')
-    
-    args = parser.parse_args()
-    
-    project_name = args.project_name
-    parent_space = args.parent
-    
-    # 验证项目名是否符合变量名规则
-    if not is_valid_project_name(project_name):
+def load_manifest(manifest_path, default_space):
+    """读取批量创建清单(JSON/YAML)，返回 [(用户代码空间, 项目名), ...]"""
+    if not os.path.exists(manifest_path):
+        print(f"错误: 清单文件 {manifest_path} 不存在!")
         sys.exit(1)
     
-    # 查找application目录
-    application_dir = find_application_dir()
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        text = f.read()
     
-    # 定位user_project目录
-    if parent_space:
-        user_project_dir = os.path.join(application_dir, 'samples', parent_space)
+    if manifest_path.endswith(('.yaml', '.yml')):
+        try:
+            import yaml
+        except ImportError:
+            print("错误: 读取 YAML 清单需要安装 PyYAML (pip install pyyaml)")
+            sys.exit(1)
+        data = yaml.safe_load(text)
     else:
-        user_project_dir = os.path.join(application_dir, 'samples', 'user_project')
+        try:
+            data = json.loads(text)
+        except ValueError as e:
+            print(f"错误: 清单文件 {manifest_path} 解析失败: {e}")
+            sys.exit(1)
+    
+    # 支持三种写法:
+    #   ["A", "B"]
+    #   {"parent": "TEST001", "projects": ["A", "B"]}
+    #   [{"name": "A", "parent": "TEST001"}, "B"]
+    def space_of(item):
+        space = item.get('parent')
+        if not space:
+            return default_space
+        # parent 会拼接到 application/samples 下，不能含路径分隔符或 ..
+        space = str(space)
+        if not is_valid_project_name(space):
+            print(f"错误: 清单文件 {manifest_path} 中的 parent '{space}' 不是有效的用户代码空间名称!")
+            sys.exit(1)
+        return space
+
+    if isinstance(data, dict):
+        default_space = space_of(data)
+        data = data.get('projects', [])
     
-    if not os.path.exists(user_project_dir):
-        print(f"错误: {user_project_dir} 目录不存在!")
+    if not isinstance(data, list):
+        print(f"错误: 清单文件 {manifest_path} 格式不正确!")
         sys.exit(1)
     
-    # 检查项目是否已存在
-    if check_project_exists(project_name, user_project_dir):
-        sys.exit(1)
+    entries = []
+    for item in data:
+        if isinstance(item, dict):
+            if 'name' not in item:
+                print(f"错误: 清单条目缺少 name 字段: {item}")
+                sys.exit(1)
+            entries.append((space_of(item), str(item['name'])))
+        else:
+            entries.append((default_space, str(item)))
+    return entries
+
+def check_batch(batch, samples_dir):
+    """在写入任何文件前，对整批项目统一做名称、重复和存在性检查"""
+    ok = True
+    seen = set()
+    for space, project_name in batch:
+        if not is_valid_project_name(project_name):
+            ok = False
+            continue
+        
+        key = (space, project_name.upper())
+        if key in seen:
+            print(f"错误: 项目 '{project_name}' 在本批次中重复!")
+            ok = False
+            continue
+        seen.add(key)
+        
+        user_project_dir = os.path.join(samples_dir, space)
+        if not os.path.exists(user_project_dir):
+            print(f"错误: {user_project_dir} 目录不存在!")
+            ok = False
+            continue
+        
+        if check_project_exists(project_name, user_project_dir):
+            ok = False
+    return ok and check_symbol_conflicts(batch, samples_dir)
+
+def check_symbol_conflicts(batch, samples_dir):
+    """通过全局符号索引检查新项目引入的配置符号是否已在别处定义"""
+    sdk_root = os.path.dirname(os.path.dirname(samples_dir))
+    samples_rel = os.path.relpath(samples_dir, sdk_root)
+    index = xs_daemon.query_or_load(sdk_root, 'lookup', names=[
+        symbol for _, name in batch for symbol in (f'SAMPLE_SUPPORT_{name.upper()}', name.upper())])
+    ok = True
+    claimed = {}
+    for space, project_name in batch:
+        # 用户代码空间 Kconfig 中残留的同名配置会在更新时复用，不算冲突
+        own = (os.path.join(samples_rel, space, 'Kconfig'),)
+        for symbol in (f'SAMPLE_SUPPORT_{project_name.upper()}', project_name.upper()):
+            others = xs_symbols.foreign_definitions(index, symbol, own)
+            if others:
+                print(f"错误: 配置符号 {symbol} 已在 {', '.join(others)} 中定义，与项目 '{project_name}' 冲突!")
+                ok = False
+            elif symbol in claimed:
+                print(f"错误: 项目 '{project_name}' 与 '{claimed[symbol]}' 会定义相同的配置符号 {symbol}!")
+                ok = False
+            else:
+                claimed[symbol] = f'{space}/{project_name}'
+    return ok
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='创建项目工具')
+    parser.add_argument('project_names', nargs='*', metavar='project_name', help='项目名称，可一次指定多个')
+    parser.add_argument('-p', '--parent', help='指定父级用户代码空间名称')
+    parser.add_argument('-m', '--manifest', help='批量创建清单文件(JSON/YAML)')
+    parser.add_argument('--enable', action='store_true', help='创建后直接在目标配置中打开新项目，无需进入 menuconfig')
     
-    # 1. 更新CMakeLists.txt
-    update_cmakelists(project_name, user_project_dir)
+    args = parser.parse_args(argv)
     
-    # 2. 更新Kconfig
-    update_kconfig(project_name, user_project_dir)
+    parent_space = args.parent or 'user_project'
     
-    # 3. 创建项目目录
-    project_dir = create_project_dir(project_name, user_project_dir)
+    batch = [(parent_space, name) for name in args.project_names]
+    if args.manifest:
+        batch += load_manifest(args.manifest, parent_space)
     
-    # 4. 创建项目Kconfig
-    create_project_kconfig(project_name, project_dir)
+    if not batch:
+        parser.error('请至少指定一个项目名称或清单文件')
     
-    # 5. 创建CMakeLists.txt
-    create_cmakelists(project_name, project_dir)
+    start_time = time.perf_counter()
     
-    # 6. 创建C文件
-    create_c_file(project_name, project_dir)
+    # 查找application目录
+    application_dir = find_application_dir()
+    samples_dir = os.path.join(application_dir, 'samples')
+    
+    # 整批检查，任何一项不通过都不做修改
+    if not check_batch(batch, samples_dir):
+        sys.exit(1)
     
-    print(f"\n项目 '{project_name}' 在用户代码空间 '{user_project_dir.split('/')[-1]}' 中创建完成!")
+    # 按用户代码空间分组，保持输入顺序
+    spaces = {}
+    for space, project_name in batch:
+        spaces.setdefault(space, []).append(project_name)
+    
+    for space, project_names in spaces.items():
+        user_project_dir = os.path.join(samples_dir, space)
+        
+        # 1. 更新CMakeLists.txt
+        update_cmakelists(project_names, user_project_dir)
+        
+        # 2. 更新Kconfig
+        update_kconfig(project_names, user_project_dir)
+        
+        for project_name in project_names:
+            # 3. 创建项目目录
+            project_dir = create_project_dir(project_name, user_project_dir)
+            
+            # 4. 创建项目Kconfig
+            create_project_kconfig(project_name, project_dir)
+            
+            # 5. 创建CMakeLists.txt
+            create_cmakelists(project_name, project_dir)
+            
+            # 6. 创建C文件
+            create_c_file(project_name, project_dir)
+            
+            print(f"\n项目 '{project_name}' 在用户代码空间 '{space}' 中创建完成!")
+    
+    # 刷新项目索引
+    xs_index.refresh_index(samples_dir)
+    
+    # 7. 在目标配置中打开新项目
+    if args.enable:
+        import xs_config
+        xs_config.enable_projects(os.path.dirname(application_dir), [name for _, name in batch])
+    
+    xs_fileio.report_touched()
+    
+    elapsed = time.perf_counter() - start_time
+    print(f"\n本批次共在 {len(spaces)} 个用户代码空间中创建 {len(batch)} 个项目，耗时 {elapsed:.3f} 秒")
+    for space, project_names in spaces.items():
+        print(f"  - {space}: {', '.join(name.upper() for name in project_names)}")
 
 if __name__ == "__main__":
-    main()        
\ No newline at end of file
+    main()        
@@ -2,25 +2,25 @@
 import os
 import sys
 import stat
-import re
 
-def is_valid_project_name(name):
-    # 检查是否是有效的变量名
-    if not re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', name):
-        print(f"错误: 项目名 '{name}' 不符合变量名规则")
-        print("项目名必须以字母或下划线开头，后面可以跟字母、数字或下划线")
-        return False
-    return True
+from xs_common import is_valid_project_name, find_application_dir
+import xs_daemon
+import xs_fileio
+import xs_index
+import xs_parse
 
-def find_application_dir():
-    current_dir = os.getcwd()
-    application_dir = os.path.join(current_dir, 'application')
-    
-    if os.path.exists(application_dir) and os.path.isdir(application_dir):
-        return application_dir
-    else:
-        print("错误: 未找到 'application' 目录!")
-        sys.exit(1)
+def check_symbol_conflicts(samples_dir, project_name):
+    """通过全局符号索引检查 ENABLE_<空间>_SAMPLE 是否已被其他用户代码空间占用"""
+    sdk_root = os.path.dirname(os.path.dirname(samples_dir))
+    symbol = f'ENABLE_{project_name.upper()}_SAMPLE'
+    osource = f"application/samples/{project_name}/Kconfig"
+    index = xs_daemon.query_or_load(sdk_root, 'lookup', names=[symbol], osources=[osource])
+    owners = index.lookup(symbol)
+    # 已经注册过的同一个空间沿用原来的警告逻辑
+    if not owners or index.osource_users(osource):
+        return True
+    print(f"错误: 配置符号 {symbol} 已在 {', '.join(owners)} 中定义，与用户代码空间 '{project_name}' 冲突!")
+    return False
 
 def create_user_project_dir(samples_dir, project_name):
     user_project_dir = os.path.join(samples_dir, project_name)
@@ -51,11 +51,8 @@ set(SOURCES "${{SOURCES}}" PARENT_SCOPE)
 set(PUBLIC_HEADER "${{PUBLIC_HEADER}}" PARENT_SCOPE)
 '''
     
-    with open(cmake_file, 'w', encoding='utf-8') as f:
-        f.write(cmake_content)
-    
-    # 修改权限为777
-    os.chmod(cmake_file, stat.S_IRWXU | stat.S_IRWXG | stat.S_IRWXO)
+    # 写入并修改权限为777
+    xs_fileio.write_text(cmake_file, cmake_content, mode=stat.S_IRWXU | stat.S_IRWXG | stat.S_IRWXO)
     print(f"已创建并设置权限: {cmake_file}")
 
 def create_user_project_kconfig(user_project_dir, project_name):
@@ -83,27 +80,26 @@ def create_user_project_kconfig(user_project_dir, project_name):
 # endif
 '''
     
-    with open(kconfig_file, 'w', encoding='utf-8') as f:
-        f.write(kconfig_content)
-    
-    # 修改权限为777
-    os.chmod(kconfig_file, stat.S_IRWXU | stat.S_IRWXG | stat.S_IRWXO)
+    # 写入并修改权限为777
+    xs_fileio.write_text(kconfig_file, kconfig_content, mode=stat.S_IRWXU | stat.S_IRWXG | stat.S_IRWXO)
     print(f"已创建并设置权限: {kconfig_file}")
 
 def update_samples_kconfig(samples_dir, project_name):
     kconfig_file = os.path.join(samples_dir, 'Kconfig')
     
-    # 检查文件是否存在
-    if not os.path.exists(kconfig_file):
-        print(f"错误: {kconfig_file} 文件不存在!")
-        sys.exit(1)
+    with xs_fileio.file_lock(kconfig_file):
+        # 检查文件是否存在
+        kconfig = xs_parse.load_kconfig(kconfig_file)
+        if kconfig is None:
+            print(f"错误: {kconfig_file} 文件不存在!")
+            sys.exit(1)
     
-    # 读取文件内容
-    with open(kconfig_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+        # 检查是否已添加过配置
+        if kconfig.has(('config', f'ENABLE_{project_name.upper()}_SAMPLE')):
+            print(f"警告: {kconfig_file} 中已存在 {project_name} 配置!")
+            return
     
-    # 检查是否已添加过配置
-    config_entry = f'''
+        config_entry = f'''
 config ENABLE_{project_name.upper()}_SAMPLE
     bool
     prompt "Enable the Sample of {project_name}."
@@ -117,88 +113,79 @@ osource "application/samples/{project_name}/Kconfig"
 endif
 '''
     
-    if config_entry in content:
-        print(f"警告: {kconfig_file} 中已存在 {project_name} 配置!")
-        return
-    
-    # 添加配置到文件末尾
-    with open(kconfig_file, 'a', encoding='utf-8') as f:
-        f.write(config_entry)
-    
-    print(f"已更新 {kconfig_file}")
+        # 添加配置到文件末尾
+        kconfig.append(config_entry)
+        if kconfig.save():
+            print(f"已更新 {kconfig_file}")
+        else:
+            print(f"{kconfig_file} 内容无变化，未写入")
 
 def update_samples_cmakelists(samples_dir, project_name):
     cmake_file = os.path.join(samples_dir, 'CMakeLists.txt')
     
-    # 检查文件是否存在
-    if not os.path.exists(cmake_file):
-        print(f"错误: {cmake_file} 文件不存在!")
-        sys.exit(1)
-    
-    # 读取文件内容
-    with open(cmake_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+    with xs_fileio.file_lock(cmake_file):
+        # 检查文件是否存在
+        cmake = xs_parse.load_cmakelists(cmake_file)
+        if cmake is None:
+            print(f"错误: {cmake_file} 文件不存在!")
+            sys.exit(1)
     
-    # 添加 add_subdirectory 语句
-    subdir_entry = f'''
+        # 添加 add_subdirectory 语句
+        subdir_entry = f'''
 if(DEFINED CONFIG_ENABLE_{project_name.upper()}_SAMPLE)
     add_subdirectory_if_exist({project_name})
 endif()
 '''
     
-    if subdir_entry not in content:
-        # 找到custom的位置
-        custom_pos = content.find('add_subdirectory_if_exist(custom)')
-        if custom_pos == -1:
-            # 如果找不到custom，就添加到所有if语句后面
-            insert_pos = content.find('add_subdirectory_if_exist(custom)')
-            if insert_pos == -1:
-                # 如果连custom都没有，就添加到最后一个endif后面
-                endif_pos = content.rfind('endif()')
-                if endif_pos != -1:
-                    insert_pos = endif_pos + 7  # endif()的长度
+        if not cmake.has(('config', f'ENABLE_{project_name.upper()}_SAMPLE')):
+            # 插入到custom之前
+            custom_pos = cmake.find(('subdir', 'custom'))
+            if custom_pos is not None:
+                cmake.insert_before(custom_pos, subdir_entry)
+            else:
+                # 如果找不到custom，就添加到最后一个if语句块后面
+                endif_pos = cmake.last_index('if')
+                if endif_pos is not None:
+                    cmake.insert_after(endif_pos, subdir_entry)
                 else:
                     # 如果没有endif，就添加到文件末尾
-                    insert_pos = len(content)
-            else:
-                insert_pos = custom_pos
+                    cmake.append(subdir_entry)
         else:
-            insert_pos = custom_pos
-        
-        content = content[:insert_pos] + subdir_entry + content[insert_pos:]
-    else:
-        print(f"警告: {cmake_file} 中已存在 {project_name} 的 add_subdirectory 配置!")
+            print(f"警告: {cmake_file} 中已存在 {project_name} 的 add_subdirectory 配置!")
     
-    # 添加 install_sdk 语句
-    install_entry = f'install_sdk("${{CMAKE_CURRENT_SOURCE_DIR}}/{project_name}" "*")\n'
+        # 添加 install_sdk 语句
+        install_entry = f'install_sdk("${{CMAKE_CURRENT_SOURCE_DIR}}/{project_name}" "*")\n'
     
-    if install_entry not in content:
-        # 找到build_component()的位置
-        build_pos = content.find('build_component()')
-        if build_pos == -1:
-            # 如果找不到build_component，就添加到文件末尾
-            content += install_entry
+        if not cmake.has(('install', project_name)):
+            # 找到build_component()的位置
+            build_pos = cmake.find(('command', 'build_component'))
+            if build_pos is None:
+                # 如果找不到build_component，就添加到文件末尾
+                cmake.append(install_entry)
+            else:
+                # 在build_component之前添加
+                cmake.insert_before(build_pos, install_entry)
         else:
-            # 在build_component之前添加
-            content = content[:build_pos] + install_entry + content[build_pos:]
-    else:
-        print(f"警告: {cmake_file} 中已存在 {project_name} 的 install_sdk 配置!")
-    
-    # 写入更新后的内容
-    with open(cmake_file, 'w', encoding='utf-8') as f:
-        f.write(content)
+            print(f"警告: {cmake_file} 中已存在 {project_name} 的 install_sdk 配置!")
     
-    print(f"已更新 {cmake_file}")
+        # 写入更新后的内容
+        if cmake.save():
+            print(f"已更新 {cmake_file}")
+        else:
+            print(f"{cmake_file} 内容无变化，未写入")
 
-def main():
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    
     # 不输入参数时，默认创建user_project用户代码空间
-    if len(sys.argv) == 1:
+    if len(argv) == 0:
         project_name = "user_project"
         print("未指定项目名，默认创建 'user_project' 用户代码空间")
-    elif len(sys.argv) == 2:
-        project_name = sys.argv[1]
+    elif len(argv) == 1:
+        project_name = argv[0]
     else:
-        print(f"用法: {sys.argv[0]} [项目名]")
+        print("用法: xs make-user-space [项目名]")
         print("若不指定项目名，将默认创建 'user_project' 用户代码空间")
         sys.exit(1)
     
@@ -218,6 +205,10 @@ def main():
         print(f"错误: {samples_dir} 目录不存在!")
         sys.exit(1)
     
+    # 1. 检查配置符号冲突
+    if not check_symbol_conflicts(samples_dir, project_name):
+        sys.exit(1)
+    
     # 2. 创建用户项目目录
     user_project_dir = create_user_project_dir(samples_dir, project_name)
     
@@ -233,6 +224,11 @@ def main():
     # 6. 更新samples目录下的CMakeLists.txt文件
     update_samples_cmakelists(samples_dir, project_name)
     
+    # 刷新项目索引
+    xs_index.refresh_index(samples_dir)
+    
+    xs_fileio.report_touched()
+    
     print(f"\n用户代码空间 '{project_name}' 创建完成!")
     print(f"接下来可以使用 mkpro.py 脚本在 {project_name} 下创建具体项目")
 
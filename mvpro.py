@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""xs move-project: 把项目移动到另一个用户代码空间
+
+项目目录通过 os.rename 整体移动，耗时与项目大小无关；项目在两个用户代码空间的 Kconfig / CMakeLists.txt
+中的配置段从源空间移到目标空间，并改写其中的 depends on ENABLE_<空间>_SAMPLE 和 osource 路径。
+四个文件在同一组文件锁内读取和改写，任何一步失败都会恢复已写入的文件并把目录移回原处。
+"""
+import os
+import sys
+import argparse
+import time
+import contextlib
+
+from xs_common import is_valid_project_name, find_application_dir
+import xs_fileio
+import xs_index
+import xs_parse
+import mkpro
+
+def check_batch(project_names, src_dir, dst_dir):
+    """在修改任何文件前检查整批项目，返回大写项目名列表，有错误时返回 None"""
+    ok = True
+    names = []
+    for project_name in project_names:
+        if not is_valid_project_name(project_name):
+            ok = False
+            continue
+        name = project_name.upper()
+        if name in names:
+            print(f"错误: 项目 '{project_name}' 在本批次中重复!")
+            ok = False
+            continue
+        names.append(name)
+        if not os.path.isdir(os.path.join(src_dir, name)):
+            print(f"错误: 项目 '{project_name}' 在 {src_dir} 中不存在!")
+            ok = False
+        elif os.path.lexists(os.path.join(dst_dir, name)):
+            print(f"错误: 目标用户代码空间中已存在 '{name}'!")
+            ok = False
+    return names if ok else None
+
+def move_kconfig_entry(name, src, dst, src_space, dst_space):
+    """把 src 中项目的配置段改写后追加到 dst"""
+    key = ('config', f'SAMPLE_SUPPORT_{name}')
+    if dst.has(key):
+        print(f"错误: {dst.path} 中已存在 {name} 配置!")
+        return False
+    i = src.find(key)
+    if i is None:
+        print(f"警告: 在 {src.path} 中未找到项目 {name} 相关配置，按默认格式在目标空间中生成")
+        dst.append(mkpro.kconfig_entry(name, dst_space))
+        return True
+
+    text = src.blocks[i].text
+    depends = (f'depends on ENABLE_{src_space.upper()}_SAMPLE', f'depends on ENABLE_{dst_space.upper()}_SAMPLE')
+    osource = (f'"application/samples/{src_space}/{name}/', f'"application/samples/{dst_space}/{name}/')
+    for old, new in (depends, osource):
+        if old not in text:
+            print(f"警告: {src.path} 中项目 {name} 的配置段没有 {old}，请手动检查")
+        text = text.replace(old, new)
+    src.remove(key)
+    dst.append(text)
+    return True
+
+def move_cmake_entry(name, src, dst):
+    """把 src 中项目的配置段原样插入到 dst 的 set(SOURCES ...) 之前"""
+    key = ('config', f'SAMPLE_SUPPORT_{name}')
+    if dst.has(key):
+        print(f"错误: {dst.path} 中已存在 {name} 配置!")
+        return False
+    insert_pos = dst.find(('set', 'SOURCES'))
+    if insert_pos is None:
+        print(f"错误: 未在 {dst.path} 中找到插入位置!")
+        return False
+    i = src.find(key)
+    if i is None:
+        print(f"警告: 在 {src.path} 中未找到项目 {name} 相关配置，按默认格式在目标空间中生成")
+        dst.insert_before(insert_pos, mkpro.cmake_entry(name))
+        return True
+    text = src.blocks[i].text
+    src.remove(key)
+    dst.insert_before(insert_pos, text)
+    return True
+
+def load_files(paths):
+    files = []
+    for path, loader in paths:
+        config = loader(path)
+        if config is None:
+            print(f"错误: {path} 文件不存在!")
+            return None
+        files.append(config)
+    return files
+
+def move_projects(names, src_dir, dst_dir):
+    """在一个事务中移动目录并改写两个用户代码空间的 Kconfig / CMakeLists.txt，返回是否成功"""
+    src_space = os.path.basename(src_dir)
+    dst_space = os.path.basename(dst_dir)
+    paths = [
+        (os.path.join(src_dir, 'Kconfig'), xs_parse.load_kconfig),
+        (os.path.join(dst_dir, 'Kconfig'), xs_parse.load_kconfig),
+        (os.path.join(src_dir, 'CMakeLists.txt'), xs_parse.load_cmakelists),
+        (os.path.join(dst_dir, 'CMakeLists.txt'), xs_parse.load_cmakelists),
+    ]
+
+    with contextlib.ExitStack() as stack:
+        # 按固定顺序加锁，避免与反方向的 move-project 互相等待
+        for path in sorted(os.path.realpath(path) for path, _ in paths):
+            stack.enter_context(xs_fileio.file_lock(path))
+
+        files = load_files(paths)
+        if files is None:
+            return False
+        src_kconfig, dst_kconfig, src_cmake, dst_cmake = files
+        for name in names:
+            if not (move_kconfig_entry(name, src_kconfig, dst_kconfig, src_space, dst_space)
+                    and move_cmake_entry(name, src_cmake, dst_cmake)):
+                return False
+
+        originals = [(config.path, config.original) for config in files]
+        moved = []
+        try:
+            for name in names:
+                os.rename(os.path.join(src_dir, name), os.path.join(dst_dir, name))
+                moved.append(name)
+            for config in files:
+                if config.save():
+                    print(f"已更新 {config.path}")
+        except OSError as e:
+            print(f"错误: 移动项目失败，正在恢复: {e}")
+            for path, content in originals:
+                xs_fileio.write_text(path, content, record=False)
+            for name in reversed(moved):
+                os.rename(os.path.join(dst_dir, name), os.path.join(src_dir, name))
+            return False
+    return True
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='移动项目工具')
+    parser.add_argument('project_names', nargs='+', metavar='project_name', help='项目名称，可一次指定多个')
+    parser.add_argument('--to', required=True, metavar='SPACE', help='目标用户代码空间名称')
+    parser.add_argument('-p', '--parent', help='指定源用户代码空间名称，默认 user_project')
+
+    args = parser.parse_args(argv)
+
+    src_space = args.parent or 'user_project'
+
+    start_time = time.perf_counter()
+
+    # 查找application目录
+    application_dir = find_application_dir()
+    samples_dir = os.path.join(application_dir, 'samples')
+    src_dir = os.path.join(samples_dir, src_space)
+    dst_dir = os.path.join(samples_dir, args.to)
+
+    for directory in (src_dir, dst_dir):
+        if not os.path.isdir(directory):
+            print(f"错误: {directory} 目录不存在!")
+            sys.exit(1)
+    if os.path.realpath(src_dir) == os.path.realpath(dst_dir):
+        print("错误: 源用户代码空间和目标用户代码空间相同!")
+        sys.exit(1)
+
+    # 整批检查，任何一项不通过都不做修改
+    names = check_batch(args.project_names, src_dir, dst_dir)
+    if names is None:
+        sys.exit(1)
+
+    if not move_projects(names, src_dir, dst_dir):
+        sys.exit(1)
+
+    # 刷新项目索引
+    xs_index.refresh_index(samples_dir)
+
+    xs_fileio.report_touched()
+
+    elapsed = time.perf_counter() - start_time
+    print(f"\n已将 {len(names)} 个项目从 '{src_space}' 移动到 '{args.to}'，耗时 {elapsed:.3f} 秒")
+    for name in names:
+        print(f"  - {name}")
+
+if __name__ == "__main__":
+    main()
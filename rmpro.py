@@ -2,103 +2,62 @@
 import os
 import sys
 import stat
-import re
 import argparse
-import shutil
+import fnmatch
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-def is_valid_project_name(name):
-    # 检查是否是有效的变量名
-    if not re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', name):
-        print(f"错误: 项目名 '{name}' 不符合变量名规则")
-        print("项目名必须以字母或下划线开头，后面可以跟字母、数字或下划线")
-        return False
-    return True
+from xs_common import is_valid_project_name, find_application_dir, find_sdk_root
+import xs_daemon
+import xs_fileio
+import xs_index
+import xs_parse
+import xs_symbols
+import xs_trash
+import xs_walk
 
-def find_application_dir():
-    current_dir = os.getcwd()
-    application_dir = os.path.join(current_dir, 'application')
-    
-    if os.path.exists(application_dir) and os.path.isdir(application_dir):
-        return application_dir
-    else:
-        print("错误: 未找到 'application' 目录!")
-        sys.exit(1)
+DEFAULT_JOBS = 8
 
 def check_project_exists(project_name, user_project_dir):
     project_dir = os.path.join(user_project_dir, project_name.upper())
     return os.path.exists(project_dir) and os.path.isdir(project_dir)
 
-def remove_from_cmakelists(project_name, user_project_dir):
+def remove_from_cmakelists(project_names, user_project_dir):
+    # 一次读写移除整批项目的配置
     cmake_file = os.path.join(user_project_dir, 'CMakeLists.txt')
     
-    if not os.path.exists(cmake_file):
-        print(f"错误: {cmake_file} 文件不存在!")
-        return False
-    
-    with open(cmake_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+    with xs_fileio.file_lock(cmake_file):
+        cmake = xs_parse.load_cmakelists(cmake_file)
+        if cmake is None:
+            print(f"错误: {cmake_file} 文件不存在!")
+            return False
     
-    # 构建要删除的内容
-    entry_to_remove = f'''
-if(DEFINED CONFIG_SAMPLE_SUPPORT_{project_name.upper()})
-  add_subdirectory_if_exist({project_name.upper()})
-endif()
-'''
+        # 按配置符号定位并移除相关内容
+        for project_name in project_names:
+            if not cmake.remove(('config', f'SAMPLE_SUPPORT_{project_name.upper()}')):
+                print(f"警告: 在 {cmake_file} 中未找到项目 {project_name.upper()} 相关配置!")
     
-    if entry_to_remove not in content:
-        print(f"警告: 在 {cmake_file} 中未找到项目相关配置!")
+        if cmake.save():
+            print(f"已从 {cmake_file} 中移除项目配置")
         return True
-    
-    # 移除相关内容
-    updated_content = content.replace(entry_to_remove, '')
-    
-    with open(cmake_file, 'w', encoding='utf-8') as f:
-        f.write(updated_content)
-    
-    print(f"已从 {cmake_file} 中移除项目配置")
-    return True
 
-def remove_from_kconfig(project_name, user_project_dir):
+def remove_from_kconfig(project_names, user_project_dir):
     kconfig_file = os.path.join(user_project_dir, 'Kconfig')
     
-    if not os.path.exists(kconfig_file):
-        print(f"错误: {kconfig_file} 文件不存在!")
-        return False
+    with xs_fileio.file_lock(kconfig_file):
+        kconfig = xs_parse.load_kconfig(kconfig_file)
+        if kconfig is None:
+            print(f"错误: {kconfig_file} 文件不存在!")
+            return False
     
-    with open(kconfig_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # 构建要删除的内容
-    config_entry = f'''
-config SAMPLE_SUPPORT_{project_name.upper()}
-  bool
-  prompt "Support {project_name.upper()} Sample."
-  default n
-  depends on ENABLE_{user_project_dir.split('/')[-1].upper()}_SAMPLE
-  help
-    This option means support {project_name.upper()} Sample.
-
-if SAMPLE_SUPPORT_{project_name.upper()}
-
-menu "{project_name.upper()} Sample Configuration"
-  osource "application/samples/{user_project_dir.split('/')[-1]}/{project_name.upper()}/Kconfig"
-endmenu
-
-endif
-'''
+        # 按配置符号定位并移除相关内容
+        for project_name in project_names:
+            if not kconfig.remove(('config', f'SAMPLE_SUPPORT_{project_name.upper()}')):
+                print(f"警告: 在 {kconfig_file} 中未找到项目 {project_name.upper()} 相关配置!")
     
-    if config_entry not in content:
-        print(f"警告: 在 {kconfig_file} 中未找到项目相关配置!")
+        if kconfig.save():
+            print(f"已从 {kconfig_file} 中移除项目配置")
         return True
-    
-    # 移除相关内容
-    updated_content = content.replace(config_entry, '')
-    
-    with open(kconfig_file, 'w', encoding='utf-8') as f:
-        f.write(updated_content)
-    
-    print(f"已从 {kconfig_file} 中移除项目配置")
-    return True
 
 def remove_project_dir(project_name, user_project_dir):
     project_dir = os.path.join(user_project_dir, project_name.upper())
@@ -108,29 +67,83 @@ def remove_project_dir(project_name, user_project_dir):
         return False
     
     try:
-        # 删除项目目录及其所有内容
-        shutil.rmtree(project_dir)
-        print(f"已删除项目目录: {project_dir}")
+        # 移入回收站，由后台进程删除目录内容
+        entry = xs_trash.move_to_trash(project_dir, find_sdk_root(), 'project',
+                                       os.path.basename(user_project_dir), project_name.upper())
+        if entry:
+            print(f"已将项目目录移入回收站: {project_dir} -> {entry}")
+        else:
+            print(f"已删除项目目录: {project_dir}")
         return True
     except Exception as e:
         print(f"错误: 删除项目目录失败: {e}")
         return False
 
-def main():
+def remove_project_dirs(project_names, user_project_dir, jobs=None):
+    """在线程池中并行将项目目录移入回收站，返回删除失败的项目"""
+    if not project_names:
+        return []
+    with ThreadPoolExecutor(max_workers=min(jobs or DEFAULT_JOBS, len(project_names))) as executor:
+        results = executor.map(lambda name: remove_project_dir(name, user_project_dir), project_names)
+        return [name for name, ok in zip(project_names, results) if not ok]
+
+def expand_project_names(patterns, user_project_dir):
+    """展开项目名中的通配符，返回 (项目列表, 是否全部有效)"""
+    existing = None
+    ok = True
+    names = []
+    for pattern in patterns:
+        if any(ch in pattern for ch in '*?['):
+            if existing is None:
+                existing = xs_walk.scan_space(os.path.dirname(user_project_dir),
+                                              os.path.basename(user_project_dir))[1]
+            matched = [name for name in existing if fnmatch.fnmatchcase(name, pattern.upper())]
+            if not matched:
+                print(f"警告: 没有项目匹配 '{pattern}'")
+            names.extend(matched)
+            continue
+        
+        # 验证项目名是否符合变量名规则
+        if not is_valid_project_name(pattern):
+            ok = False
+            continue
+        
+        # 检查项目是否存在
+        if not check_project_exists(pattern, user_project_dir):
+            print(f"错误: 项目 '{pattern}' 不存在!")
+            ok = False
+            continue
+        names.append(pattern.upper())
+    return list(dict.fromkeys(names)), ok
+
+def warn_foreign_symbols(project_names, user_project_dir):
+    """通过全局符号索引提示在其他文件中还有定义、清理后仍会保留的配置符号"""
+    sdk_root = find_sdk_root()
+    index = xs_daemon.query_or_load(sdk_root, 'lookup', names=[
+        symbol for name in project_names for symbol in (f'SAMPLE_SUPPORT_{name}', name)])
+    own = (os.path.relpath(os.path.join(user_project_dir, 'Kconfig'), sdk_root),)
+    for name in project_names:
+        own_project = own + (os.path.relpath(os.path.join(user_project_dir, name, 'Kconfig'), sdk_root),)
+        for symbol in (f'SAMPLE_SUPPORT_{name}', name):
+            others = xs_symbols.foreign_definitions(index, symbol, own_project)
+            if others:
+                print(f"警告: 配置符号 {symbol} 还在 {', '.join(others)} 中定义，清理后仍会保留")
+
+def main(argv=None):
     parser = argparse.ArgumentParser(description='删除项目工具')
-    parser.add_argument('project_name', help='项目名称')
+    parser.add_argument('project_names', nargs='+', metavar='project_name', help='项目名称，可一次指定多个或使用通配符(如 \'T_*\')')
     parser.add_argument('-p', '--parent', help='指定父级用户代码空间名称')
+    parser.add_argument('-y', '--yes', action='store_true', help='不提示确认，直接删除')
+    parser.add_argument('-j', '--jobs', type=int, help='并行删除目录的线程数')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    # 在修改任何文件之前拒绝无效的线程数
+    if args.jobs is not None and args.jobs < 1:
+        parser.error('-j/--jobs 必须大于等于 1')
     
-    project_name = args.project_name
     parent_space = args.parent
     
-    # 验证项目名是否符合变量名规则
-    if not is_valid_project_name(project_name):
-        sys.exit(1)
-    
-    print(f"开始删除项目 '{project_name}'...")
+    start_time = time.perf_counter()
     
     # 查找application目录
     application_dir = find_application_dir()
@@ -145,33 +158,52 @@ def main():
         print(f"错误: {user_project_dir} 目录不存在!")
         sys.exit(1)
     
-    # 检查项目是否存在
-    if not check_project_exists(project_name, user_project_dir):
-        print(f"错误: 项目 '{project_name}' 不存在!")
+    # 整批检查，任何一项不通过都不做修改
+    project_names, ok = expand_project_names(args.project_names, user_project_dir)
+    if not ok:
         sys.exit(1)
-    
-    # 确认用户是否真的要删除
-    confirmation = input(f"确定要删除项目 '{project_name}' 吗？这将删除所有相关文件。(y/N): ")
-    if confirmation.lower() != 'y':
-        print("操作已取消")
+    if not project_names:
+        print("没有需要删除的项目")
         sys.exit(0)
     
+    print(f"开始删除项目: {', '.join(project_names)}")
+    warn_foreign_symbols(project_names, user_project_dir)
+    
+    # 确认用户是否真的要删除(整批只确认一次)
+    if not args.yes:
+        confirmation = input(f"确定要删除以上 {len(project_names)} 个项目吗？这将删除所有相关文件。(y/N): ")
+        if confirmation.lower() != 'y':
+            print("操作已取消")
+            sys.exit(0)
+    
     # 1. 从Kconfig中移除项目配置
-    if not remove_from_kconfig(project_name, user_project_dir):
+    if not remove_from_kconfig(project_names, user_project_dir):
         print("删除过程中出现错误，项目可能未被完全删除!")
         sys.exit(1)
     
     # 2. 从CMakeLists.txt中移除项目配置
-    if not remove_from_cmakelists(project_name, user_project_dir):
+    if not remove_from_cmakelists(project_names, user_project_dir):
         print("删除过程中出现错误，项目可能未被完全删除!")
         sys.exit(1)
     
-    # 3. 删除项目目录
-    if not remove_project_dir(project_name, user_project_dir):
-        print("删除过程中出现错误，项目目录可能未被完全删除!")
-        sys.exit(1)
+    # 3. 并行删除项目目录
+    failed = remove_project_dirs(project_names, user_project_dir, args.jobs)
+    xs_trash.spawn_reaper(find_sdk_root())
+    
+    # 刷新项目索引
+    xs_index.refresh_index(os.path.join(application_dir, 'samples'))
     
-    print(f"\n项目 '{project_name}' 已成功删除!")
+    xs_fileio.report_touched()
+    
+    elapsed = time.perf_counter() - start_time
+    removed = [name for name in project_names if name not in failed]
+    print(f"\n共删除 {len(removed)} 个项目，耗时 {elapsed:.3f} 秒")
+    for name in removed:
+        print(f"  - {name}")
+    
+    if failed:
+        print(f"删除过程中出现错误，以下项目目录可能未被完全删除: {', '.join(failed)}")
+        sys.exit(1)
 
 if __name__ == "__main__":
-    main()    
\ No newline at end of file
+    main()    
@@ -2,27 +2,15 @@
 import os
 import sys
 import stat
-import re
-import shutil
 import argparse
 
-def is_valid_project_name(name):
-    # 检查是否是有效的变量名
-    if not re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', name):
-        print(f"错误: 项目名 '{name}' 不符合变量名规则")
-        print("项目名必须以字母或下划线开头，后面可以跟字母、数字或下划线")
-        return False
-    return True
-
-def find_application_dir():
-    current_dir = os.getcwd()
-    application_dir = os.path.join(current_dir, 'application')
-    
-    if os.path.exists(application_dir) and os.path.isdir(application_dir):
-        return application_dir
-    else:
-        print("错误: 未找到 'application' 目录!")
-        sys.exit(1)
+from xs_common import is_valid_project_name, find_application_dir, find_sdk_root
+import xs_daemon
+import xs_fileio
+import xs_index
+import xs_parse
+import xs_symbols
+import xs_trash
 
 def check_project_exists(samples_dir, project_name):
     project_dir = os.path.join(samples_dir, project_name)
@@ -48,78 +36,47 @@ def check_sub_projects(samples_dir, project_name):
 def remove_from_kconfig(samples_dir, project_name):
     kconfig_file = os.path.join(samples_dir, 'Kconfig')
     
-    if not os.path.exists(kconfig_file):
-        print(f"错误: {kconfig_file} 文件不存在!")
-        return False
+    with xs_fileio.file_lock(kconfig_file):
+        kconfig = xs_parse.load_kconfig(kconfig_file)
+        if kconfig is None:
+            print(f"错误: {kconfig_file} 文件不存在!")
+            return False
     
-    with open(kconfig_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # 构建要删除的内容
-    config_entry = f'''
-config ENABLE_{project_name.upper()}_SAMPLE
-    bool
-    prompt "Enable the Sample of {project_name}."
-    default n
-    depends on SAMPLE_ENABLE
-    help
-        This option means enable the sample of {project_name}.
-
-if ENABLE_{project_name.upper()}_SAMPLE
-osource "application/samples/{project_name}/Kconfig"
-endif
-'''
+        # 按配置符号定位并移除相关内容
+        if not kconfig.remove(('config', f'ENABLE_{project_name.upper()}_SAMPLE')):
+            print(f"警告: 在 {kconfig_file} 中未找到项目相关配置!")
+            return True
     
-    if config_entry not in content:
-        print(f"警告: 在 {kconfig_file} 中未找到项目相关配置!")
-        return True
+        kconfig.save()
     
-    # 移除相关内容
-    updated_content = content.replace(config_entry, '')
-    
-    with open(kconfig_file, 'w', encoding='utf-8') as f:
-        f.write(updated_content)
-    
-    print(f"已从 {kconfig_file} 中移除项目配置")
-    return True
+        print(f"已从 {kconfig_file} 中移除项目配置")
+        return True
 
 def remove_from_cmakelists(samples_dir, project_name):
     cmake_file = os.path.join(samples_dir, 'CMakeLists.txt')
     
-    if not os.path.exists(cmake_file):
-        print(f"错误: {cmake_file} 文件不存在!")
-        return False
-    
-    with open(cmake_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+    with xs_fileio.file_lock(cmake_file):
+        cmake = xs_parse.load_cmakelists(cmake_file)
+        if cmake is None:
+            print(f"错误: {cmake_file} 文件不存在!")
+            return False
     
-    # 移除 add_subdirectory 语句
-    subdir_entry = f'''
-if(DEFINED CONFIG_ENABLE_{project_name.upper()}_SAMPLE)
-    add_subdirectory_if_exist({project_name})
-endif()
-'''
-    
-    if subdir_entry in content:
-        content = content.replace(subdir_entry, '')
-        print(f"已从 {cmake_file} 中移除项目的 add_subdirectory 配置")
-    else:
-        print(f"警告: 在 {cmake_file} 中未找到项目的 add_subdirectory 配置!")
-    
-    # 移除 install_sdk 语句
-    install_entry = f'install_sdk("${{CMAKE_CURRENT_SOURCE_DIR}}/{project_name}" "*")\n'
+        # 移除 add_subdirectory 语句
+        if cmake.remove(('config', f'ENABLE_{project_name.upper()}_SAMPLE')):
+            print(f"已从 {cmake_file} 中移除项目的 add_subdirectory 配置")
+        else:
+            print(f"警告: 在 {cmake_file} 中未找到项目的 add_subdirectory 配置!")
     
-    if install_entry in content:
-        content = content.replace(install_entry, '')
-        print(f"已从 {cmake_file} 中移除项目的 install_sdk 配置")
-    else:
-        print(f"警告: 在 {cmake_file} 中未找到项目的 install_sdk 配置!")
+        # 移除 install_sdk 语句
+        if cmake.remove(('install', project_name)):
+            print(f"已从 {cmake_file} 中移除项目的 install_sdk 配置")
+        else:
+            print(f"警告: 在 {cmake_file} 中未找到项目的 install_sdk 配置!")
     
-    # 写入更新后的内容
-    with open(cmake_file, 'w', encoding='utf-8') as f:
-        f.write(content)
+        # 写入更新后的内容
+        cmake.save()
     
-    return True
+        return True
 
 def remove_project_dir(samples_dir, project_name):
     project_dir = os.path.join(samples_dir, project_name)
@@ -129,20 +86,36 @@ def remove_project_dir(samples_dir, project_name):
         return False
     
     try:
-        # 删除项目目录及其所有内容
-        shutil.rmtree(project_dir)
-        print(f"已删除项目目录: {project_dir}")
+        # 移入回收站，由后台进程删除目录内容
+        entry = xs_trash.move_to_trash(project_dir, find_sdk_root(), 'space', project_name, None)
+        if entry:
+            print(f"已将用户代码空间目录移入回收站: {project_dir} -> {entry}")
+            xs_trash.spawn_reaper(find_sdk_root())
+        else:
+            print(f"已删除项目目录: {project_dir}")
         return True
     except Exception as e:
         print(f"错误: 删除项目目录失败: {e}")
         return False
 
-def main():
+def warn_foreign_symbols(samples_dir, project_name):
+    """通过全局符号索引提示在其他文件中还有定义、清理后仍会保留的配置符号"""
+    sdk_root = find_sdk_root()
+    symbol = f'ENABLE_{project_name.upper()}_SAMPLE'
+    index = xs_daemon.query_or_load(sdk_root, 'lookup', names=[symbol])
+    own = (os.path.relpath(os.path.join(samples_dir, 'Kconfig'), sdk_root),)
+    others = xs_symbols.foreign_definitions(index, symbol, own)
+    if others:
+        print(f"警告: 配置符号 {symbol} 还在 {', '.join(others)} 中定义，清理后仍会保留")
+    if len(index.lookup(symbol)) - len(others) > 1:
+        print(f"警告: 配置符号 {symbol} 在 {own[0]} 中重复定义，只会移除第一处")
+
+def main(argv=None):
     parser = argparse.ArgumentParser(description='删除用户代码空间工具')
     parser.add_argument('project_name', help='用户代码空间名称')
     parser.add_argument('-f', '--force', action='store_true', help='强制删除，不提示确认')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     project_name = args.project_name
     force = args.force
@@ -178,6 +151,8 @@ def main():
         else:
             print("警告: 强制删除将删除用户代码空间及其所有子项目!")
     
+    warn_foreign_symbols(samples_dir, project_name)
+    
     # 确认用户是否真的要删除
     if not force:
         confirmation = input(f"确定要删除用户代码空间 '{project_name}' 吗？这将删除所有相关文件。(y/N): ")
@@ -200,6 +175,11 @@ def main():
         print("删除过程中出现错误，项目目录可能未被完全删除!")
         sys.exit(1)
     
+    # 刷新项目索引
+    xs_index.refresh_index(samples_dir)
+    
+    xs_fileio.report_touched()
+    
     print(f"\n用户代码空间 '{project_name}' 已成功删除!")
 
 if __name__ == "__main__":
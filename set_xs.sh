@@ -12,10 +12,17 @@ else
     # 将tools目录添加到PATH环境变量中
     export PATH="$TOOLS_DIR:$PATH"
 
+    # 加载 bash/zsh 补全，补全从 SDK 根目录下的 .xs_completion 读取空间和项目名
+    export XS_SDK_ROOT="$PWD"
+    COMPLETION_SCRIPT="$PWD/xs_tools/xs_completion.sh"
+    if [ -f "$COMPLETION_SCRIPT" ]; then
+        . "$COMPLETION_SCRIPT"
+    fi
+
     # 验证xs命令是否可用
     if command -v xs &> /dev/null; then
         echo "已成功将 '$TOOLS_DIR' 目录添加到 PATH 环境变量中。"
-        echo "现在你可以在当前终端会话中直接使用 'xs' 命令。"
+        echo "现在你可以在当前终端会话中直接使用 'xs' 命令，按 Tab 可补全子命令、用户代码空间和项目名。"
         echo "以下是 'xs' 命令可执行的相关操作："
         echo "1. 用户代码空间创建与删除："
         echo "   - 创建默认用户代码空间: xs make-user-space"
@@ -42,4 +49,4 @@ else
     fi
 fi
 
-echo "窗口关闭后，'xs' 命令将自动失效。若要长期使用，可将 'export PATH=$TOOLS_DIR:\$PATH' 添加到你的 shell 配置文件（如 ~/.bashrc 或 ~/.zshrc）中。"
\ No newline at end of file
+echo "窗口关闭后，'xs' 命令将自动失效。若要长期使用，可将 'export PATH=$TOOLS_DIR:\$PATH' 和 'source $PWD/xs_tools/xs_completion.sh' 添加到你的 shell 配置文件（如 ~/.bashrc 或 ~/.zshrc）中。"
\ No newline at end of file
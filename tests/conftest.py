@@ -0,0 +1,74 @@
+import os
+import sys
+import textwrap
+
+import pytest
+
+# 各模块以平铺方式互相导入，与 __main__.py 一样把仓库目录加入搜索路径
+TOOLS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if TOOLS_DIR not in sys.path:
+    sys.path.insert(0, TOOLS_DIR)
+
+import xs_common
+
+CONFIG_DIR = os.path.join('build', 'config', 'target_config', 'ws63', 'menuconfig', 'acore')
+
+# 模拟 build.py: 读取目标配置，在 output/ 下生成该目标的镜像
+FAKE_BUILD_PY = textwrap.dedent('''\
+    import os
+    import sys
+    import time
+
+    target = sys.argv[-1]
+    config = os.path.join(%r, target.replace('-', '_') + '.config')
+    with open(config) as f:
+        content = f.read()
+    os.makedirs('output', exist_ok=True)
+    with open(os.path.join('output', 'last_target.txt'), 'w') as f:
+        f.write(target)
+    time.sleep(0.2)
+    image_dir = os.path.join('output', 'ws63', 'fwpkg', target)
+    os.makedirs(image_dir, exist_ok=True)
+    with open(os.path.join(image_dir, target + '_all.fwpkg'), 'w') as f:
+        f.write(target + '\\n' + content)
+    print('done', target)
+''') % CONFIG_DIR
+
+@pytest.fixture
+def sdk(tmp_path, monkeypatch):
+    """最小的 SDK 目录: application/samples、两个目标的配置和模拟的 build.py，并切换到该目录"""
+    os.makedirs(tmp_path / 'application' / 'samples')
+    (tmp_path / 'application' / 'samples' / 'Kconfig').write_text('config SAMPLE_ENABLE\n    bool\n')
+    config_dir = tmp_path / CONFIG_DIR
+    os.makedirs(config_dir)
+    for target in ('ws63-liteos-app', 'ws63-liteos-app-iot'):
+        (config_dir / (target.replace('-', '_') + '.config')).write_text(f'CONFIG_TARGET_NAME="{target}"\n')
+    (tmp_path / 'build.py').write_text(FAKE_BUILD_PY)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('XS_CACHE_DIR', str(tmp_path / 'cache'))
+    # 删除命令启动的后台回收进程立即清空回收站并退出
+    monkeypatch.setenv('XS_TRASH_GRACE', '0')
+    # application 目录在进程内只查找一次，每个测试换了 SDK 目录后需要重新查找
+    xs_common.find_application_dir.cache_clear()
+    yield tmp_path
+    xs_common.find_application_dir.cache_clear()
+
+SAMPLES_CMAKELISTS = textwrap.dedent('''\
+    set(COMPONENT_NAME "samples")
+
+    set(SOURCES)
+    set(PUBLIC_HEADER)
+
+    add_subdirectory_if_exist(custom)
+
+    set(PRIVATE_HEADER)
+    build_component()
+''')
+
+@pytest.fixture
+def space(sdk):
+    """在 sdk 中用 make-user-space 创建用户代码空间 sa，返回其目录"""
+    import mucs
+    (sdk / 'application' / 'samples' / 'CMakeLists.txt').write_text(SAMPLES_CMAKELISTS)
+    mucs.main(['sa'])
+    return sdk / 'application' / 'samples' / 'sa'
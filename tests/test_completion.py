@@ -0,0 +1,40 @@
+import os
+import shlex
+import shutil
+import subprocess
+
+import pytest
+
+import mkpro
+import rmpro
+from conftest import TOOLS_DIR
+
+def complete(sdk, *words):
+    """在 bash 中加载 xs_completion.sh，补全最后一个词并返回候选列表"""
+    script = f'''
+        source "{os.path.join(TOOLS_DIR, 'xs_completion.sh')}"
+        COMP_WORDS=(xs {' '.join(shlex.quote(word) for word in words)}); COMP_CWORD=$((${{#COMP_WORDS[@]}} - 1))
+        _xs; printf '%s\\n' "${{COMPREPLY[@]}}"
+    '''
+    out = subprocess.run(['bash', '-c', script], cwd=sdk, capture_output=True, text=True, check=True).stdout
+    return sorted(out.split())
+
+def read_cache(sdk):
+    with open(os.path.join(sdk, '.xs_completion')) as f:
+        return dict(line.rstrip('\n').split('\t', 1) for line in f)
+
+@pytest.mark.skipif(shutil.which('bash') is None, reason='需要 bash')
+def test_completion_cache_follows_create_and_clean(sdk, space):
+    mkpro.main(['LED', 'KEY', '-p', 'sa'])
+    cache = read_cache(sdk)
+    assert cache[':spaces'] == 'sa'
+    assert sorted(cache['sa'].split()) == ['KEY', 'LED']
+    assert 'SAMPLE_SUPPORT_LED' in cache[':symbols'].split()
+
+    assert complete(sdk, 'clean-project', '-p', 'sa', 'L') == ['LED']
+    assert complete(sdk, 'build', '--only', 'sa/') == ['sa/KEY', 'sa/LED']
+    assert complete(sdk, 'create-project', '-p', 's') == ['sa']
+
+    rmpro.main(['LED', '-p', 'sa', '-y'])
+    assert read_cache(sdk)['sa'] == 'KEY'
+    assert complete(sdk, 'clean-project', '-p', 'sa', '') == ['--parent', '-p', '-y', 'KEY']
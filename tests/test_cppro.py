@@ -0,0 +1,30 @@
+import os
+
+import cppro
+import mkpro
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def test_clone_renames_generated_identifiers_only(space):
+    mkpro.main(['APP', '-p', 'sa'])
+    os.makedirs(os.path.join(space, 'APP', 'inc'))
+    with open(os.path.join(space, 'APP', 'inc', 'app.h'), 'w') as f:
+        f.write('#include "app_init.h"\n#include "soc_osal.h"\nvoid app_helper(void);\n')
+    cppro.main(['APP', 'LED', '-p', 'sa'])
+
+    clone = os.path.join(space, 'LED')
+    assert sorted(os.listdir(clone)) == ['CMakeLists.txt', 'Kconfig', 'LED.c', 'inc']
+    assert os.listdir(os.path.join(clone, 'inc')) == ['led.h']
+    source = read(os.path.join(clone, 'LED.c'))
+    for renamed in ('LED_TASK_PRIO', 'led_test_task', 'led_test_entry', 'CONFIG_LED', '"LEDTask"'):
+        assert renamed in source
+    # 恰好包含项目名的 SDK 头文件和接口不能被改写
+    for kept in ('"app_init.h"', '"soc_osal.h"', 'app_run(led_test_entry)', 'osal_printk'):
+        assert kept in source
+    assert 'APP' not in source.replace('app_init', '').replace('app_run', '')
+    assert read(os.path.join(clone, 'inc', 'led.h')).startswith('#include "app_init.h"\n')
+    assert 'app_helper' in read(os.path.join(clone, 'inc', 'led.h'))
+    assert 'config LED\n' in read(os.path.join(clone, 'Kconfig'))
+    assert 'SAMPLE_SUPPORT_LED' in read(os.path.join(space, 'Kconfig'))
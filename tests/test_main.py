@@ -0,0 +1,19 @@
+import os
+import importlib.util
+
+import pytest
+
+from conftest import TOOLS_DIR
+
+spec = importlib.util.spec_from_file_location('xs_main', os.path.join(TOOLS_DIR, '__main__.py'))
+xs_main = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(xs_main)
+
+@pytest.mark.parametrize('argv, usage', [
+    (['create-project', '-h'], 'usage: xs create-project '),
+    (['trash', '-h'], 'usage: xs trash '),
+    (['build', '-h'], 'usage: xs build '),
+])
+def test_usage_shows_xs_command(sdk, capsys, argv, usage):
+    assert xs_main.dispatch(argv) == 0
+    assert capsys.readouterr().out.startswith(usage)
@@ -0,0 +1,20 @@
+import json
+
+import pytest
+
+import mkpro
+
+@pytest.mark.parametrize('manifest', [
+    {'parent': '../../tools', 'projects': ['A']},
+    [{'name': 'A', 'parent': 'sa/../../x'}],
+])
+def test_manifest_rejects_parent_outside_samples(sdk, manifest):
+    path = sdk / 'manifest.json'
+    path.write_text(json.dumps(manifest))
+    with pytest.raises(SystemExit):
+        mkpro.load_manifest(str(path), 'user_project')
+
+def test_manifest_parent(sdk):
+    path = sdk / 'manifest.json'
+    path.write_text(json.dumps({'parent': 'sa', 'projects': ['A', {'name': 'B', 'parent': 'sb'}]}))
+    assert mkpro.load_manifest(str(path), 'user_project') == [('sa', 'A'), ('sb', 'B')]
@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+import mkpro
+import mucs
+import mvpro
+import xs_fileio
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def snapshot(samples_dir):
+    return {rel: read(os.path.join(samples_dir, rel))
+            for rel in ('sa/Kconfig', 'sa/CMakeLists.txt', 'sb/Kconfig', 'sb/CMakeLists.txt')}
+
+@pytest.fixture
+def spaces(space):
+    mucs.main(['sb'])
+    mkpro.main(['A', 'B', '-p', 'sa'])
+    return os.path.dirname(space)
+
+def test_move_rewrites_both_spaces(spaces):
+    mvpro.main(['A', '--to', 'sb', '-p', 'sa'])
+
+    assert not os.path.exists(os.path.join(spaces, 'sa', 'A'))
+    assert os.path.isfile(os.path.join(spaces, 'sb', 'A', 'A.c'))
+    files = snapshot(spaces)
+    assert 'SAMPLE_SUPPORT_A' not in files['sa/Kconfig'] + files['sa/CMakeLists.txt']
+    assert 'SAMPLE_SUPPORT_B' in files['sa/Kconfig']
+    assert 'depends on ENABLE_SB_SAMPLE' in files['sb/Kconfig']
+    assert 'osource "application/samples/sb/A/Kconfig"' in files['sb/Kconfig']
+    assert 'CONFIG_SAMPLE_SUPPORT_A)' in files['sb/CMakeLists.txt']
+
+def test_failed_write_rolls_back_files_and_directories(spaces, monkeypatch):
+    before = snapshot(spaces)
+    write_text = xs_fileio.write_text
+
+    def failing_write(path, content, mode=None, record=True):
+        # 第三个配置文件写入时失败，前两个已经写入
+        if record and path.endswith(os.path.join('sa', 'CMakeLists.txt')):
+            raise OSError(28, 'No space left on device')
+        return write_text(path, content, mode, record)
+    monkeypatch.setattr(xs_fileio, 'write_text', failing_write)
+
+    assert not mvpro.move_projects(['A', 'B'], os.path.join(spaces, 'sa'), os.path.join(spaces, 'sb'))
+    assert snapshot(spaces) == before
+    assert sorted(os.listdir(os.path.join(spaces, 'sb'))) == ['CMakeLists.txt', 'Kconfig']
+    for name in ('A', 'B'):
+        assert os.path.isdir(os.path.join(spaces, 'sa', name))
@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+import mkpro
+import rmpro
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def test_glob_removes_matching_projects_only(space):
+    mkpro.main(['T_001', 'T_002', 'LED', '-p', 'sa'])
+    rmpro.main(['T_*', '-p', 'sa', '-y', '-j', '2'])
+
+    assert sorted(name for name in os.listdir(space) if os.path.isdir(os.path.join(space, name))) == ['LED']
+    kconfig = read(os.path.join(space, 'Kconfig'))
+    cmake = read(os.path.join(space, 'CMakeLists.txt'))
+    assert 'SAMPLE_SUPPORT_T_00' not in kconfig and 'SAMPLE_SUPPORT_T_00' not in cmake
+    assert 'SAMPLE_SUPPORT_LED' in kconfig and 'SAMPLE_SUPPORT_LED' in cmake
+
+@pytest.mark.parametrize('jobs', ['0', '-1'])
+def test_invalid_jobs_rejected_before_changes(space, jobs):
+    mkpro.main(['T_001', '-p', 'sa'])
+    before = read(os.path.join(space, 'Kconfig')), read(os.path.join(space, 'CMakeLists.txt'))
+
+    with pytest.raises(SystemExit) as e:
+        rmpro.main(['T_001', '-p', 'sa', '-y', '-j', jobs])
+    assert e.value.code == 2
+    assert (read(os.path.join(space, 'Kconfig')), read(os.path.join(space, 'CMakeLists.txt'))) == before
+    assert os.path.isdir(os.path.join(space, 'T_001'))
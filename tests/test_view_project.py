@@ -0,0 +1,20 @@
+import json
+
+import mkpro
+import view_project
+
+def find_json(capsys, *argv):
+    capsys.readouterr()
+    view_project.main(['all', '--json', *argv])
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+def test_walker_filters_and_limits(space, capsys):
+    mkpro.main(['T_001', 'T_002', 'LED', '-p', 'sa'])
+
+    for argv in ((), ('--no-index', '-j', '2')):
+        # 直接遍历目录树与使用索引的结果一致
+        assert find_json(capsys, *argv) == [{'space': 'sa', 'project': name} for name in ('LED', 'T_001', 'T_002')]
+    assert find_json(capsys, '--no-index', '--name', 'T_*') == [
+        {'space': 'sa', 'project': 'T_001'}, {'space': 'sa', 'project': 'T_002'}]
+    assert find_json(capsys, '--no-index', '--limit', '1') == [{'space': 'sa', 'project': 'LED'}]
+    assert find_json(capsys, '--no-index', '--depth', '1') == [{'space': 'sa'}]
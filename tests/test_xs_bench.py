@@ -0,0 +1,12 @@
+import json
+
+import xs_bench
+
+def test_default_output_is_json(tmp_path, capsys):
+    assert xs_bench.main(['--sizes', '3', '--repeat', '1', '--modes', 'inproc', '--ops', 'find',
+                          '--workdir', str(tmp_path)]) == 0
+    captured = capsys.readouterr()
+    # 进度信息在标准错误中，标准输出可以直接按 JSON 解析
+    report = json.loads(captured.out)
+    assert [r['op'] for r in report['results']] == ['find-cold', 'find']
+    assert '已生成 3 个项目' in captured.err
@@ -0,0 +1,79 @@
+import os
+
+import xs_build
+import xs_cache
+
+TARGETS = ['ws63-liteos-app', 'ws63-liteos-app-iot']
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def target_output(sdk, target):
+    return os.path.join(sdk, xs_build.MULTI_OUTPUT_DIR, target, 'output')
+
+def test_build_targets_keeps_outputs_separate(sdk):
+    assert xs_build.build_targets(TARGETS, parallel=2) == 0
+
+    for target in TARGETS:
+        output_dir = target_output(sdk, target)
+        # 同时编译的目标各自写 output/，互不覆盖
+        assert read(os.path.join(output_dir, 'last_target.txt')) == target
+        images = xs_cache.collect_artifacts(output_dir, target)
+        assert images == [os.path.join('ws63', 'fwpkg', target, f'{target}_all.fwpkg')]
+        content = read(os.path.join(output_dir, images[0]))
+        assert content.startswith(target + '\n')
+        assert f'CONFIG_TARGET_NAME="{target}"' in content
+        assert os.path.isfile(os.path.join(sdk, xs_build.MULTI_OUTPUT_DIR, target, 'build.log'))
+
+    # 主 output/ 不被多目标编译改动
+    assert not os.path.exists(os.path.join(sdk, 'output', 'last_target.txt'))
+
+def test_build_targets_rebuilds_target_without_artifacts(sdk, capsys):
+    assert xs_build.build_targets(TARGETS) == 0
+    image = os.path.join(target_output(sdk, TARGETS[1]), 'ws63', 'fwpkg', TARGETS[1], f'{TARGETS[1]}_all.fwpkg')
+    os.remove(image)
+    capsys.readouterr()
+
+    assert xs_build.build_targets(TARGETS) == 0
+    out = capsys.readouterr().out
+    assert f'[{TARGETS[1]}] done {TARGETS[1]}' in out
+    assert f'[{TARGETS[0]}] done' not in out
+    assert os.path.isfile(image)
+
+def test_only_build_is_not_up_to_date_without_artifacts(sdk):
+    os.makedirs(os.path.join(sdk, 'application', 'samples', 'user_project', 'T_001'))
+    only = ('user_project', 'T_001')
+    assert xs_build.build_target(TARGETS[0], only=only, use_cache=False) == 0
+    tree = os.path.join(sdk, 'output', 'xs_only', 'user_project_T_001')
+    images = xs_cache.collect_artifacts(os.path.join(tree, 'output'), TARGETS[0])
+    assert images
+
+    # 影子目录的 output/ 还在但镜像已被删除，不能报告为最新
+    for rel in images:
+        os.remove(os.path.join(tree, 'output', rel))
+    assert xs_build.build_target(TARGETS[0], only=only, use_cache=False) == 0
+    assert xs_cache.collect_artifacts(os.path.join(tree, 'output'), TARGETS[0]) == images
+
+def edit_source(sdk):
+    with open(os.path.join(sdk, 'application', 'samples', 'Kconfig'), 'a') as f:
+        f.write('\nconfig SAMPLE_EDITED\n    bool\n')
+
+def test_single_and_multi_target_builds_are_tracked_separately(sdk, capsys):
+    main_image = os.path.join(sdk, 'output', 'ws63', 'fwpkg', TARGETS[0], f'{TARGETS[0]}_all.fwpkg')
+    assert xs_build.build_target(TARGETS[0], use_cache=False) == 0
+    edit_source(sdk)
+    assert xs_build.build_targets(TARGETS[:1]) == 0
+    capsys.readouterr()
+
+    # --targets 只更新了影子目录，output/ 中仍是修改前的镜像，必须重新编译
+    assert xs_build.build_target(TARGETS[0], use_cache=False) == 0
+    assert '已是最新' not in capsys.readouterr().out
+
+    # 反过来: 直接编译的记录也不能让 --targets 跳过影子目录中的旧镜像
+    edit_source(sdk)
+    assert xs_build.build_target(TARGETS[0], use_cache=False) == 0
+    capsys.readouterr()
+    assert xs_build.build_targets(TARGETS[:1]) == 0
+    assert f'[{TARGETS[0]}] done {TARGETS[0]}' in capsys.readouterr().out
+    assert os.path.isfile(main_image)
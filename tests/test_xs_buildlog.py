@@ -0,0 +1,35 @@
+import pytest
+
+import xs_buildlog
+
+def feed(analyzer, lines):
+    for line in lines:
+        analyzer(line + '\n')
+
+def test_summary_keeps_first_error_with_bounded_memory(capsys):
+    analyzer = xs_buildlog.BuildLogAnalyzer()
+    feed(analyzer, [f'[{i}/9000] Building C object a{i}.o' for i in range(5000)])
+    feed(analyzer, ['\x1b[1msrc/led.c:12:5: warning: unused variable \'x\'\x1b[0m',
+                    'src/led.c:20:1: error: expected \';\' before \'}\' token'])
+    feed(analyzer, [f'src/key.c:{i}:1: error: bad {i}' for i in range(xs_buildlog.MAX_ERRORS + 5)])
+    feed(analyzer, ['led.c.o:(.text+0x10): undefined reference to `osal_foo\'',
+                    'collect2: error: ld returned 1 exit status'])
+
+    assert len(analyzer.ring) == xs_buildlog.RING_SIZE
+    assert len(analyzer.errors) == xs_buildlog.MAX_ERRORS
+    assert analyzer.error_count == xs_buildlog.MAX_ERRORS + 8
+    assert analyzer.warnings_by_file == {'src/led.c': 1}
+
+    analyzer.print_summary(1, 'ws63-liteos-app')
+    out = capsys.readouterr().out
+    assert "首个错误: src/led.c:20: expected ';' before '}' token" in out
+    # 上下文包含首个错误之前的几行，不含 ANSI 颜色
+    assert "    src/led.c:12:5: warning: unused variable 'x'" in out
+    assert '另有 8 个错误未列出' in out
+
+def test_fail_fast_aborts_on_first_error():
+    analyzer = xs_buildlog.BuildLogAnalyzer(fail_fast=True)
+    feed(analyzer, ['src/led.c:12:5: warning: unused variable', 'CMake Warning: x'])
+    with pytest.raises(xs_buildlog.BuildAborted):
+        analyzer('CMake Error at CMakeLists.txt:3 (add_subdirectory):\n')
+    assert analyzer.errors == [('CMakeLists.txt', '3', 'CMake Error (add_subdirectory):')]
@@ -0,0 +1,48 @@
+import os
+import shutil
+
+import xs_build
+import xs_cache
+
+TARGET = 'ws63-liteos-app'
+
+def make_output(root, target, content):
+    image_dir = os.path.join(root, 'ws63', 'fwpkg', target)
+    os.makedirs(image_dir, exist_ok=True)
+    with open(os.path.join(image_dir, f'{target}_all.fwpkg'), 'w') as f:
+        f.write(content)
+
+def test_cache_hit_restores_images_without_building(sdk, capsys):
+    assert xs_build.build_target(TARGET) == 0
+    image = os.path.join(sdk, 'output', 'ws63', 'fwpkg', TARGET, f'{TARGET}_all.fwpkg')
+    with open(image) as f:
+        built = f.read()
+    shutil.rmtree(os.path.join(sdk, 'output'))
+    capsys.readouterr()
+
+    assert xs_build.build_target(TARGET) == 0
+    assert '命中产物缓存，已恢复 1 个镜像文件' in capsys.readouterr().out
+    with open(image) as f:
+        assert f.read() == built
+    # build.py 没有运行
+    assert not os.path.exists(os.path.join(sdk, 'output', 'last_target.txt'))
+    assert xs_cache.ArtifactCache().counters() == {'stores': 1, 'misses': 1, 'hits': 1}
+
+def test_prune_evicts_least_recently_used(sdk):
+    cache = xs_cache.ArtifactCache()
+    output = os.path.join(sdk, 'output')
+    for i, key in enumerate(('old', 'mid', 'new')):
+        make_output(output, TARGET, f'image {key}\n' * 100)
+        assert cache.store(key, output, TARGET) == 1
+        entry = cache._entry_path(key)
+        os.utime(entry, (1000 + i, 1000 + i))
+    # 最旧的条目被恢复过一次，变成最近使用
+    assert cache.restore('old', os.path.join(sdk, 'restored')) == 1
+
+    removed, freed = cache.prune(max_size=2 * 1000)
+    assert (removed, freed) == (1, 1000)
+    assert [key for key, _, _ in cache.entries()] == ['new', 'old']
+    assert cache.restore('mid', os.path.join(sdk, 'restored')) is None
+
+    assert cache.prune(remove_all=True) == (2, 2000)
+    assert cache.entries() == [] and cache.objects() == {}
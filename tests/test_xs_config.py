@@ -0,0 +1,40 @@
+import os
+import sys
+import subprocess
+
+import pytest
+
+import mkpro
+import xs_config
+from conftest import TOOLS_DIR
+
+TARGET = 'ws63-liteos-app'
+
+def test_enable_resolves_dependencies_and_defaults(sdk, space):
+    mkpro.main(['LED', '-p', 'sa'])
+    changes = xs_config.set_symbols(str(sdk), [('SAMPLE_SUPPORT_LED', 'y')])
+    # 依赖链从最外层开始打开，项目 Kconfig 中的 int 符号按字面默认值写入
+    assert [(name, new) for name, _, new, _ in changes] == [
+        ('SAMPLE_ENABLE', 'y'), ('ENABLE_SA_SAMPLE', 'y'), ('SAMPLE_SUPPORT_LED', 'y'), ('LED', '0')]
+    assert xs_config.get_symbols(str(sdk), ['SAMPLE_SUPPORT_*', 'LED']) == {'SAMPLE_SUPPORT_LED': 'y', 'LED': '0'}
+
+    # 关闭用户代码空间时一并关闭依赖它的项目
+    changes = xs_config.set_symbols(str(sdk), [('ENABLE_SA_SAMPLE', 'n')])
+    assert [(name, new, reason) for name, _, new, reason in changes] == [
+        ('ENABLE_SA_SAMPLE', 'n', None), ('SAMPLE_SUPPORT_LED', 'n', '依赖 ENABLE_SA_SAMPLE')]
+
+def test_invalid_values_leave_config_unchanged(sdk, space):
+    mkpro.main(['LED', '-p', 'sa'])
+    path = xs_config.config_path(str(sdk), TARGET)
+    with open(path) as f:
+        before = f.read()
+    for assignment in (('LED', 'abc'), ('SAMPLE_SUPPORT_LED', '3'), ('NO_SUCH_SYMBOL', 'y')):
+        with pytest.raises(xs_config.ConfigError):
+            xs_config.set_symbols(str(sdk), [('SAMPLE_SUPPORT_LED', 'y'), assignment])
+    with open(path) as f:
+        assert f.read() == before
+
+def test_config_does_not_import_build_stack():
+    code = 'import sys, xs_config; print(sorted(m for m in ("xs_build", "xs_cache", "xs_history") if m in sys.modules))'
+    out = subprocess.run([sys.executable, '-c', code], cwd=TOOLS_DIR, capture_output=True, text=True, check=True).stdout
+    assert out.strip() == '[]'
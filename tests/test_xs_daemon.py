@@ -0,0 +1,32 @@
+import os
+
+import xs_daemon
+
+KCONFIG = '''config ENABLE_SA_SAMPLE
+    bool
+
+if ENABLE_SA_SAMPLE
+osource "application/samples/sa/Kconfig"
+endif
+'''
+
+def test_lookup_matches_between_daemon_and_fallback(sdk):
+    samples_dir = os.path.join(sdk, 'application', 'samples')
+    os.makedirs(os.path.join(samples_dir, 'sa'))
+    with open(os.path.join(samples_dir, 'Kconfig'), 'w') as f:
+        f.write(KCONFIG)
+    with open(os.path.join(samples_dir, 'sa', 'Kconfig'), 'w') as f:
+        f.write('config SAMPLE_SUPPORT_LED\n    bool\n')
+
+    names = ['ENABLE_SA_SAMPLE', 'SAMPLE_SUPPORT_LED', 'CONFIG_NOPE']
+    osources = ['application/samples/sa/Kconfig']
+    model = xs_daemon.WorkspaceModel(samples_dir)
+    served = model.handle({'op': 'lookup', 'names': names, 'osources': osources})
+
+    # 服务未运行时 query_or_load 回退到磁盘索引，查询结果一致
+    fallback = xs_daemon.query_or_load(str(sdk), 'lookup', names=names, osources=osources)
+    for name in names:
+        assert served['symbols'][name.replace('CONFIG_', '')] == fallback.lookup(name)
+    assert served['osources'][osources[0]] == fallback.osource_users(osources[0]) == [
+        os.path.join('application', 'samples', 'Kconfig')]
+    assert fallback.lookup('SAMPLE_SUPPORT_LED') == [os.path.join('application', 'samples', 'sa', 'Kconfig')]
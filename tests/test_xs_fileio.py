@@ -0,0 +1,44 @@
+import os
+import sys
+import stat
+import subprocess
+
+import xs_fileio
+from conftest import TOOLS_DIR
+
+def test_write_text_skips_unchanged_content(tmp_path):
+    path = str(tmp_path / 'Kconfig')
+    assert xs_fileio.write_text(path, 'config A\n', mode=0o640, record=False)
+    old = os.stat(path)
+
+    # 内容相同时不写入，mtime 和 inode 都不变，CMake 不会因此重新配置
+    assert not xs_fileio.write_text(path, 'config A\n', record=False)
+    st = os.stat(path)
+    assert (st.st_ino, st.st_mtime_ns) == (old.st_ino, old.st_mtime_ns)
+
+    # 内容变化时通过临时文件整体替换，保留原权限且不留下临时文件
+    assert xs_fileio.write_text(path, 'config B\n', record=False)
+    st = os.stat(path)
+    assert st.st_ino != old.st_ino
+    assert stat.S_IMODE(st.st_mode) == 0o640
+    assert os.listdir(tmp_path) == ['Kconfig']
+    with open(path) as f:
+        assert f.read() == 'config B\n'
+
+def test_concurrent_create_project_keeps_every_entry(space):
+    names = [f'P_{i}' for i in range(6)]
+    procs = [subprocess.Popen([sys.executable, TOOLS_DIR, 'create-project', name, '-p', 'sa'],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+             for name in names]
+    for proc in procs:
+        assert proc.wait(timeout=60) == 0, proc.stderr.read()
+
+    # 各进程在文件锁内读取和改写共享的 Kconfig / CMakeLists.txt，不会互相覆盖
+    with open(os.path.join(space, 'Kconfig')) as f:
+        kconfig = f.read()
+    with open(os.path.join(space, 'CMakeLists.txt')) as f:
+        cmake = f.read()
+    for name in names:
+        assert kconfig.count(f'config SAMPLE_SUPPORT_{name}\n') == 1
+        assert cmake.count(f'CONFIG_SAMPLE_SUPPORT_{name})') == 1
+        assert os.path.isdir(os.path.join(space, name))
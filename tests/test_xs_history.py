@@ -0,0 +1,39 @@
+import xs_history
+
+def phases_of(lines):
+    """逐行喂给 PhaseTracker，返回每行之后所处的阶段"""
+    tracker = xs_history.PhaseTracker()
+    result = []
+    for line in lines:
+        tracker(line + '\n')
+        result.append(tracker.current)
+    return result
+
+def test_phases_follow_build_output():
+    lines = [
+        'Building target ws63-liteos-app, CMakeLists.txt found',
+        '-- The C compiler identification is GNU 7.3.0',
+        '-- Configuring done',
+        '-- Generating done',
+        '[1/120] Building C object application/samples/CMakeFiles/app.dir/led.c.obj',
+        '[60/120] Linking C static library libapp.a',
+        '[120/120] Linking C executable ws63-liteos-app.elf',
+        'Generating ws63-liteos-app_all.fwpkg',
+    ]
+    assert phases_of(lines) == ['setup', 'configure', 'configure', 'configure', 'compile', 'link', 'link',
+                                'package']
+
+def test_compiler_warnings_do_not_switch_phase():
+    lines = [
+        '-- Configuring done',
+        '[1/120] Building C object src/a.c.obj',
+        'src/a.c:10:5: warning: comparison of integer expressions of different signedness [-Wsign-compare]',
+        'src/a.c:12:9: note: Signing key not used, see CMake docs',
+        '[2/120] Building C object src/b.c.obj',
+        '[3/120] Generating image_table.h',
+    ]
+    assert phases_of(lines) == ['configure'] + ['compile'] * 5
+
+def test_cmake_mentions_do_not_start_configure():
+    assert phases_of(['Copying CMakeLists.txt templates', 'cmake version 3.22.1']) == ['setup', 'setup']
+    assert phases_of(['/usr/bin/cmake -G Ninja -S . -B output/build']) == ['configure']
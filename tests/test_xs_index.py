@@ -0,0 +1,37 @@
+import os
+import time
+
+import xs_index
+
+def make_project(space_dir, name):
+    os.makedirs(os.path.join(space_dir, name))
+    with open(os.path.join(space_dir, name, 'Kconfig'), 'w') as f:
+        f.write(f'config {name}\n    int\n')
+
+def age(root, seconds=10):
+    """把目录树的 mtime 调到 seconds 秒之前，使其不在 mtime 竞争窗口内"""
+    old = time.time_ns() - seconds * 1000 * 1000 * 1000
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in dirnames + filenames:
+            os.utime(os.path.join(dirpath, name), ns=(old, old))
+    os.utime(root, ns=(old, old))
+
+def test_index_follows_directory_mtimes(sdk):
+    samples_dir = os.path.join(sdk, 'application', 'samples')
+    space_dir = os.path.join(samples_dir, 'sa')
+    os.makedirs(space_dir)
+    open(os.path.join(space_dir, 'Kconfig'), 'w').close()
+    for name in ('A', 'B'):
+        make_project(space_dir, name)
+    age(samples_dir)
+
+    assert xs_index.get_projects_in_user_space(samples_dir, 'sa') == ['A', 'B']
+    index_mtime = os.stat(xs_index.index_path(samples_dir)).st_mtime_ns
+    # 目录没有变化时复用索引，不重写索引文件
+    assert xs_index.get_user_code_spaces(samples_dir) == ['sa']
+    assert os.stat(xs_index.index_path(samples_dir)).st_mtime_ns == index_mtime
+
+    make_project(space_dir, 'C')
+    os.rename(os.path.join(space_dir, 'A'), os.path.join(samples_dir, 'A_moved'))
+    assert xs_index.get_projects_in_user_space(samples_dir, 'sa') == ['B', 'C']
+    assert xs_index.get_projects_in_user_space(samples_dir, 'missing') is None
@@ -0,0 +1,40 @@
+import mkpro
+import xs_parse
+
+KCONFIG = '''# 用户代码空间 sa
+config ENABLE_SA_EXTRA
+    bool "extra"   # 手写的配置
+''' + mkpro.kconfig_entry('led', 'application/samples/sa') + '''
+menu "手写菜单"
+  osource "application/samples/sa/other/Kconfig"
+endmenu
+'''
+
+CMAKE = '''set(SOURCES)
+''' + mkpro.cmake_entry('led') + '''
+if(DEFINED CONFIG_ENABLE_PERIPHERAL_SAMPLE)
+    add_subdirectory_if_exist(peripheral)
+endif()
+install_sdk("${CMAKE_CURRENT_SOURCE_DIR}/custom" "*")
+build_component()
+'''
+
+def test_round_trip_is_byte_identical():
+    for cls, content in ((xs_parse.KconfigFile, KCONFIG), (xs_parse.CMakeFile, CMAKE),
+                         (xs_parse.KconfigFile, KCONFIG.replace('\n', '\r\n'))):
+        config = cls('unused', content)
+        assert config.serialize() == content
+        assert not config.changed()
+
+def test_keyed_edits_leave_other_blocks_untouched():
+    kconfig = xs_parse.KconfigFile('Kconfig', KCONFIG)
+    assert kconfig.has(('config', 'SAMPLE_SUPPORT_LED'))
+    assert kconfig.has(('osource', 'application/samples/sa/other/Kconfig'))
+    kconfig.remove(('config', 'SAMPLE_SUPPORT_LED'))
+    assert kconfig.serialize() == KCONFIG.replace(mkpro.kconfig_entry('led', 'application/samples/sa'), '')
+
+    cmake = xs_parse.CMakeFile('CMakeLists.txt', CMAKE)
+    assert cmake.has(('subdir', 'peripheral')) and cmake.has(('install', 'custom'))
+    cmake.insert_before(cmake.find(('set', 'SOURCES')), mkpro.cmake_entry('key'))
+    assert cmake.serialize() == mkpro.cmake_entry('key') + CMAKE
+    assert cmake.find(('command', 'build_component')) is not None
@@ -0,0 +1,37 @@
+import os
+import time
+
+import xs_common
+import xs_stats
+
+def write(path, text, age=10):
+    with open(path, 'w') as f:
+        f.write(text)
+    # 调到 mtime 竞争窗口之外，使行数可以被缓存
+    old = time.time_ns() - age * 1000 * 1000 * 1000
+    os.utime(path, ns=(old, old))
+
+def test_stats_reread_only_changed_files(sdk):
+    project = os.path.join(sdk, 'application', 'samples', 'sa', 'LED')
+    os.makedirs(os.path.join(project, 'inc'))
+    write(os.path.join(project, 'LED.c'), 'int a;\nint b;\nint c;')
+    write(os.path.join(project, 'inc', 'led.h'), '#pragma once\n')
+    write(os.path.join(project, 'Kconfig'), 'config LED\n    int\n')
+
+    cache = xs_stats.StatsCache(str(sdk))
+    stats = cache.dir_stats(project)
+    assert (stats['files'], stats['lines'], cache.reread) == (3, 4, 2)
+    cache.save()
+
+    cache = xs_stats.StatsCache(str(sdk))
+    assert cache.dir_stats(project)['lines'] == 4
+    assert cache.reread == 0
+
+    write(os.path.join(project, 'LED.c'), 'int a;\n', age=5)
+    cache = xs_stats.StatsCache(str(sdk))
+    assert cache.dir_stats(project)['lines'] == 2
+    assert cache.reread == 1
+
+def test_format_size():
+    assert [xs_common.format_size(n) for n in (0, 1023, 1536, 5 * 1024 ** 2, 3 * 1024 ** 3)] == [
+        '0B', '1023B', '1.5K', '5.0M', '3.0G']
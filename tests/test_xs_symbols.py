@@ -0,0 +1,35 @@
+import os
+
+import mkpro
+import xs_symbols
+
+def test_refresh_rereads_kconfig_edited_within_racy_window(sdk):
+    kconfig = os.path.join(sdk, 'application', 'samples', 'Kconfig')
+    with open(kconfig, 'w') as f:
+        f.write('config SAMPLE_SUPPORT_AAA\n    bool\n')
+    st = os.stat(kconfig)
+    assert xs_symbols.load(str(sdk)).lookup('SAMPLE_SUPPORT_AAA')
+
+    # 同一时间粒度内改写为相同大小的内容，mtime 和大小都不变
+    with open(kconfig, 'w') as f:
+        f.write('config SAMPLE_SUPPORT_BBB\n    bool\n')
+    os.utime(kconfig, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    index = xs_symbols.load(str(sdk))
+    assert index.lookup('SAMPLE_SUPPORT_BBB')
+    assert not index.lookup('SAMPLE_SUPPORT_AAA')
+
+def test_cross_space_conflicts_block_create_project(sdk, space):
+    samples_dir = os.path.join(sdk, 'application', 'samples')
+    os.makedirs(os.path.join(samples_dir, 'sb'))
+    with open(os.path.join(samples_dir, 'sb', 'Kconfig'), 'w') as f:
+        f.write('config SAMPLE_SUPPORT_LED\n    bool\n')
+    with open(os.path.join(samples_dir, 'Kconfig'), 'a') as f:
+        f.write('osource "application/samples/sb/Kconfig"\n')
+
+    index = xs_symbols.load(str(sdk))
+    assert index.lookup('CONFIG_SAMPLE_SUPPORT_LED') == [os.path.join('application', 'samples', 'sb', 'Kconfig')]
+    assert index.query('SAMPLE_SUPPORT_*') == {'SAMPLE_SUPPORT_LED': index.lookup('SAMPLE_SUPPORT_LED')}
+    # sb 中已经定义了 SAMPLE_SUPPORT_LED，在 sa 中创建 LED 会冲突
+    assert not mkpro.check_symbol_conflicts([('sa', 'LED')], samples_dir)
+    assert mkpro.check_symbol_conflicts([('sa', 'KEY')], samples_dir)
@@ -0,0 +1,28 @@
+import os
+
+import xs_trash
+
+def trash_project(sdk, space, name):
+    path = os.path.join(sdk, 'application', 'samples', space, name)
+    os.makedirs(path)
+    return xs_trash.move_to_trash(path, str(sdk), 'project', space, name)
+
+def test_same_item_trashed_twice_in_one_second(sdk):
+    entries = [trash_project(sdk, 'sa', 'A') for _ in range(2)]
+
+    # 时间戳和进程号相同时条目名仍不重复，两次删除的内容都保留在回收站中
+    assert entries[0] != entries[1]
+    assert sorted(entry for entry, _ in xs_trash.list_entries(str(sdk))) == sorted(entries)
+
+def test_restore_refuses_conflicting_symbol(sdk):
+    entry = trash_project(sdk, 'sa', 'A')
+    # 删除后其他用户代码空间定义了同名配置符号
+    os.makedirs(os.path.join(sdk, 'application', 'samples', 'sb'))
+    with open(os.path.join(sdk, 'application', 'samples', 'Kconfig'), 'a') as f:
+        f.write('\nosource "application/samples/sb/Kconfig"\n')
+    with open(os.path.join(sdk, 'application', 'samples', 'sb', 'Kconfig'), 'w') as f:
+        f.write('config SAMPLE_SUPPORT_A\n    bool\n')
+
+    assert xs_trash.restore(str(sdk), entry) == 1
+    assert not os.path.exists(os.path.join(sdk, 'application', 'samples', 'sa', 'A'))
+    assert [e for e, _ in xs_trash.list_entries(str(sdk))] == [entry]
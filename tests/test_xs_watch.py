@@ -0,0 +1,18 @@
+import os
+import sys
+import errno
+
+import pytest
+
+import xs_watch
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='inotify 仅在 Linux 上可用')
+def test_failed_inotify_falls_back_without_leaking_fd(tmp_path, monkeypatch):
+    def add(self, path, recursive):
+        raise OSError(errno.ENOSPC, '监视数量达到上限')
+    monkeypatch.setattr(xs_watch.InotifyWatcher, '_add', add)
+
+    before = set(os.listdir('/proc/self/fd'))
+    watcher, kind = xs_watch.create_watcher([str(tmp_path)], [])
+    assert isinstance(watcher, xs_watch.PollingWatcher)
+    assert set(os.listdir('/proc/self/fd')) == before
@@ -2,17 +2,16 @@
 import os
 import sys
 import re
+import json
+import fnmatch
+import argparse
 
-def find_application_dir():
-    """查找当前路径下的application目录"""
-    current_dir = os.getcwd()
-    application_dir = os.path.join(current_dir, 'application')
-    
-    if os.path.exists(application_dir) and os.path.isdir(application_dir):
-        return application_dir
-    else:
-        print("错误: 未找到 'application' 目录!")
-        sys.exit(1)
+from xs_common import find_application_dir, find_sdk_root, display_width, format_size, pad
+import xs_daemon
+import xs_index
+import xs_stats
+import xs_symbols
+import xs_walk
 
 def find_samples_dir(application_dir):
     """查找application目录下的samples目录"""
@@ -24,34 +23,16 @@ def find_samples_dir(application_dir):
         print("错误: 未找到 'samples' 目录!")
         sys.exit(1)
 
-def get_user_code_spaces(samples_dir):
+def get_user_code_spaces(samples_dir, root=None):
     """获取所有用户代码空间"""
-    user_code_spaces = []
-    for item in os.listdir(samples_dir):
-        item_path = os.path.join(samples_dir, item)
-        if os.path.isdir(item_path):
-            # 检查是否包含CMakeLists.txt或Kconfig文件
-            if (os.path.exists(os.path.join(item_path, 'CMakeLists.txt')) or 
-                os.path.exists(os.path.join(item_path, 'Kconfig'))):
-                user_code_spaces.append(item)
-    return user_code_spaces
+    return xs_index.get_user_code_spaces(samples_dir, root)
 
-def get_projects_in_user_space(samples_dir, user_space):
+def get_projects_in_user_space(samples_dir, user_space, root=None):
     """获取指定用户代码空间下的所有项目"""
-    user_space_dir = os.path.join(samples_dir, user_space)
-    
-    if not os.path.exists(user_space_dir) or not os.path.isdir(user_space_dir):
+    projects = xs_index.get_projects_in_user_space(samples_dir, user_space, root)
+    if projects is None:
         print(f"错误: 用户代码空间 '{user_space}' 不存在!")
         return []
-    
-    projects = []
-    for item in os.listdir(user_space_dir):
-        item_path = os.path.join(user_space_dir, item)
-        if os.path.isdir(item_path):
-            # 检查是否包含CMakeLists.txt或Kconfig文件
-            if (os.path.exists(os.path.join(item_path, 'CMakeLists.txt')) or 
-                os.path.exists(os.path.join(item_path, 'Kconfig'))):
-                projects.append(item)
     return projects
 
 def print_projects(projects, prefix=""):
@@ -64,38 +45,183 @@ def print_projects(projects, prefix=""):
     for project in projects:
         print(f"{prefix}- {project}")
 
-def main():
+def iter_spaces(samples_dir, target, args):
+    """按名称顺序逐个产出 (用户代码空间, 项目列表)"""
+    pattern = args.name if args.depth > 1 else None
+    spaces = None if target == "all" else [target]
+    
+    if args.no_index:
+        # 直接并行遍历目录树，每个用户代码空间扫描完成后立即产出
+        if spaces and not os.path.isdir(os.path.join(samples_dir, target)):
+            print(f"错误: 用户代码空间 '{target}' 不存在!")
+            return
+        yield from xs_walk.walk_spaces(samples_dir, spaces, args.depth, pattern, args.jobs)
+        return
+    
+    # 常驻服务运行时直接使用其内存中的索引，否则按 mtime 增量刷新磁盘索引
+    root = xs_daemon.query_or_load(find_sdk_root(), 'index')
+    if spaces is None:
+        spaces = get_user_code_spaces(samples_dir, root)
+    for user_space in spaces:
+        projects = get_projects_in_user_space(samples_dir, user_space, root) if args.depth > 1 else []
+        if pattern:
+            projects = [name for name in projects if fnmatch.fnmatchcase(name, pattern)]
+        yield user_space, projects
+
+def find_symbol_conflicts():
+    """从全局符号索引中取出重复定义的配置符号"""
+    symbols = xs_daemon.query_or_load(find_sdk_root(), 'symbols', pattern='*')
+    return {name: files for name, files in symbols.items() if len(files) > 1}
+
+def collect_stats(samples_dir, args):
+    """统计项目和用户代码空间的规模，返回 (项目行, 用户代码空间行, 重新读取的文件数)"""
+    cache = xs_stats.StatsCache(find_sdk_root())
+    project_rows = []
+    space_rows = []
+    for user_space, projects in iter_spaces(samples_dir, args.target, args):
+        if args.depth == 1:
+            if args.name and not fnmatch.fnmatchcase(user_space, args.name):
+                continue
+        elif args.name and not projects:
+            continue
+        
+        space_dir = os.path.join(samples_dir, user_space)
+        total = xs_stats.empty_stats()
+        for project in projects:
+            stats = cache.dir_stats(os.path.join(space_dir, project))
+            project_rows.append((f"{user_space}/{project}", stats))
+            xs_stats.merge(total, stats)
+        # 用户代码空间自身的 Kconfig、CMakeLists.txt 以及未列出的目录
+        xs_stats.merge(total, cache.dir_stats(space_dir, skip=projects))
+        total['projects'] = len(projects)
+        space_rows.append((user_space, total))
+    cache.save()
+    return project_rows, space_rows, cache.reread
+
+def print_stats_table(title, rows):
+    width = max([display_width(title)] + [display_width(name) for name, _ in rows]) + 2
+    print(pad(title, width) + pad('文件数', 8, True) + pad('C 代码行', 10, True) + pad('大小', 10, True) + '  最近修改')
+    for name, stats in rows:
+        print(pad(name, width) + pad(stats['files'], 8, True) + pad(stats['lines'], 10, True) +
+              pad(format_size(stats['bytes']), 10, True) + f"  {xs_stats.format_mtime(stats['mtime'])}")
+
+def show_stats(samples_dir, args):
+    """xs find --stats: 按 --sort 排序输出统计，--limit 限制项目(depth 为 1 时为用户代码空间)的条数"""
+    project_rows, space_rows, reread = collect_stats(samples_dir, args)
+    project_rows = xs_stats.sort_rows(project_rows, args.sort or 'name')
+    space_rows = xs_stats.sort_rows(space_rows, args.sort or 'name')
+    if args.limit is not None:
+        if args.depth == 1:
+            space_rows = space_rows[:args.limit]
+        else:
+            project_rows = project_rows[:args.limit]
+    
+    if args.json:
+        for name, stats in project_rows:
+            space, project = name.split('/', 1)
+            print(json.dumps({'space': space, 'project': project, **stats, 'mtime': stats['mtime'] // 10 ** 9},
+                             ensure_ascii=False))
+        for space, stats in space_rows:
+            print(json.dumps({'space': space, **stats, 'mtime': stats['mtime'] // 10 ** 9}, ensure_ascii=False))
+        return
+    
+    if not space_rows:
+        print("未找到用户代码空间")
+        return
+    if args.depth > 1:
+        if project_rows:
+            print_stats_table('项目', project_rows)
+        else:
+            print("未找到项目")
+        print()
+    print_stats_table('用户代码空间', space_rows)
+    projects = f"，{sum(s['projects'] for _, s in space_rows)} 个项目" if args.depth > 1 else ''
+    print(f"\n共统计 {len(space_rows)} 个用户代码空间{projects}，重新读取 {reread} 个源文件")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='项目查找工具')
+    parser.add_argument('target', metavar='all|<用户代码空间>', help='all 查找所有项目，或指定用户代码空间名称')
+    parser.add_argument('--depth', type=int, choices=(1, 2), default=2, help='1 只列出用户代码空间，2 同时列出项目(默认)')
+    parser.add_argument('--name', help='按名称过滤(glob)，depth 为 1 时匹配用户代码空间名，否则匹配项目名')
+    parser.add_argument('--json', action='store_true', help='以 JSON Lines 格式逐行输出')
+    parser.add_argument('--limit', type=int, help='最多输出的条目数，达到后立即停止遍历')
+    parser.add_argument('--no-index', action='store_true', help='不使用索引，直接并行遍历目录树')
+    parser.add_argument('-j', '--jobs', type=int, help='并行遍历的线程数')
+    parser.add_argument('--stats', action='store_true', help='统计文件数、C 代码行数、大小和最近修改时间')
+    parser.add_argument('--sort', choices=xs_stats.SORT_KEYS, help='--stats 的排序字段，数值从大到小，mtime 从新到旧')
+    
+    args = parser.parse_args(argv)
+    if args.sort and not args.stats:
+        parser.error('--sort 需要与 --stats 一起使用')
+    
     # 查找application目录
     application_dir = find_application_dir()
     
     # 查找samples目录
     samples_dir = find_samples_dir(application_dir)
     
-    # 处理命令行参数
-    if len(sys.argv) == 1:
-        print("用法: python View_project.py [all|<用户代码空间>]")
-        sys.exit(1)
+    if args.stats:
+        show_stats(samples_dir, args)
+        return
     
-    command = sys.argv[1]
+    show_all = args.target == "all"
+    space_count = 0
+    project_count = 0
+    limited = False
     
-    if command == "all":
-        # 查找所有用户代码空间和项目
-        user_code_spaces = get_user_code_spaces(samples_dir)
+    for user_space, projects in iter_spaces(samples_dir, args.target, args):
+        if args.depth == 1:
+            if args.name and not fnmatch.fnmatchcase(user_space, args.name):
+                continue
+        elif args.name and not projects:
+            continue
         
-        if not user_code_spaces:
-            print("未找到用户代码空间")
-            sys.exit(0)
+        if args.limit is not None:
+            remaining = args.limit - (space_count if args.depth == 1 else project_count)
+            if remaining <= 0:
+                limited = True
+                break
+            if len(projects) > remaining:
+                projects = projects[:remaining]
+                limited = True
+        
+        space_count += 1
+        project_count += len(projects)
         
-        print(f"找到 {len(user_code_spaces)} 个用户代码空间:")
-        for user_space in user_code_spaces:
+        if args.json:
+            if args.depth == 1:
+                print(json.dumps({'space': user_space}, ensure_ascii=False))
+            for project in projects:
+                print(json.dumps({'space': user_space, 'project': project}, ensure_ascii=False))
+        elif show_all:
             print(f"- {user_space}")
-            projects = get_projects_in_user_space(samples_dir, user_space)
-            print_projects(projects, "  ")
-    else:
-        # 查找指定用户代码空间下的项目
-        user_space = command
-        projects = get_projects_in_user_space(samples_dir, user_space)
-        print_projects(projects)
+            if args.depth > 1:
+                print_projects(projects, "  ")
+        else:
+            print_projects(projects)
+        sys.stdout.flush()
+        
+        if limited:
+            break
+    
+    if args.json:
+        return
+    
+    if limited:
+        print(f"已达到 --limit 上限 ({args.limit})，遍历提前结束")
+    if show_all:
+        if space_count == 0:
+            print("未找到用户代码空间")
+        elif args.depth == 1:
+            print(f"共找到 {space_count} 个用户代码空间")
+        else:
+            print(f"共找到 {space_count} 个用户代码空间，{project_count} 个项目")
+        
+        # 列出全部项目时顺带检查配置符号冲突
+        if not args.no_index and not limited:
+            conflicts = find_symbol_conflicts()
+            if conflicts:
+                xs_symbols.print_conflicts(conflicts)
 
 if __name__ == "__main__":
-    main()    
\ No newline at end of file
+    main()
\ No newline at end of file
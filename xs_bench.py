@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""创建/清理/查找命令的性能基准
+
+在临时目录中生成不依赖真实 SDK 和工具链的 application/samples 目录树，按不同规模
+(默认 10、1000、10000 个项目)分别以进程内调用(inproc)和完整命令行(e2e)两种方式计时，
+结果写成 JSON，便于在不同提交之间比较:
+
+    python xs_tools/xs_bench.py --sizes 10,1000 --repeat 5 -o bench.json
+    python xs_tools/xs_bench.py --compare old.json new.json
+"""
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import contextlib
+import tempfile
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+if TOOLS_DIR not in sys.path:
+    sys.path.insert(0, TOOLS_DIR)
+
+import mkpro
+import xs_common
+
+DEFAULT_SIZES = (10, 1000, 10000)
+PROJECTS_PER_SPACE = 100
+
+# 模拟 SDK 自带示例的配置段数量，使顶层 Kconfig/CMakeLists.txt 接近真实大小
+FILLER_SAMPLES = 40
+
+# 参与计时的操作: 名称 -> (计时前的准备, 计时的 xs 子命令参数, 计时后的还原)
+MAKE_SPACE = ['make-user-space', 'BENCH_SPACE_{i}']
+CLEAN_SPACE = ['clean-user-space', 'BENCH_SPACE_{i}', '-f']
+CREATE_PROJECT = ['create-project', 'bench_new_{i}', '-p', 'space_0']
+CLEAN_PROJECT = ['clean-project', 'bench_new_{i}', '-p', 'space_0', '-y']
+OPERATIONS = {
+    'make-user-space': (None, MAKE_SPACE, CLEAN_SPACE),
+    'clean-user-space': (MAKE_SPACE, CLEAN_SPACE, None),
+    'create-project': (None, CREATE_PROJECT, CLEAN_PROJECT),
+    'clean-project': (CREATE_PROJECT, CLEAN_PROJECT, None),
+    'find': (None, ['find', 'all'], None),
+    'find-no-index': (None, ['find', 'all', '--no-index'], None),
+    'find-stats': (None, ['find', 'all', '--stats', '--sort', 'lines'], None),
+}
+
+def generate_tree(root, projects, per_space=PROJECTS_PER_SPACE, filler=FILLER_SAMPLES):
+    """生成包含 projects 个项目的模拟 SDK，返回用户代码空间数"""
+    samples_dir = os.path.join(root, 'application', 'samples')
+    os.makedirs(samples_dir)
+    spaces = max(1, (projects + per_space - 1) // per_space)
+
+    kconfig = ['config SAMPLE_ENABLE\n    bool\n    prompt "Enable samples"\n    default y\n']
+    cmake = ['set(COMPONENT_NAME "samples")\n\nset(SOURCES)\nset(PUBLIC_HEADER)\n']
+    installs = []
+    for i in range(filler):
+        kconfig.append(f'config SAMPLE_FILLER_{i}\n    bool\n    prompt "Filler sample {i}"\n    default n\n'
+                       f'    depends on SAMPLE_ENABLE\n    help\n        Synthetic sample used by benchmarks.\n')
+        cmake.append(f'if(DEFINED CONFIG_SAMPLE_FILLER_{i})\n    add_subdirectory_if_exist(filler_{i})\nendif()\n')
+
+    remaining = projects
+    for s in range(spaces):
+        space = f'space_{s}'
+        space_dir = os.path.join(samples_dir, space)
+        os.makedirs(space_dir)
+        kconfig.append(f'config ENABLE_{space.upper()}_SAMPLE\n    bool\n    prompt "Enable the Sample of {space}."\n'
+                       f'    default n\n    depends on SAMPLE_ENABLE\n\nif ENABLE_{space.upper()}_SAMPLE\n'
+                       f'osource "application/samples/{space}/Kconfig"\nendif\n')
+        cmake.append(f'if(DEFINED CONFIG_ENABLE_{space.upper()}_SAMPLE)\n    add_subdirectory_if_exist({space})\nendif()\n')
+        installs.append(f'install_sdk("${{CMAKE_CURRENT_SOURCE_DIR}}/{space}" "*")\n')
+
+        names = [f'p{s}_{j}' for j in range(min(per_space, remaining))]
+        remaining -= len(names)
+        space_kconfig = f'# User project Kconfig for {space}\n' + ''.join(
+            mkpro.kconfig_entry(name, space_dir) for name in names)
+        space_cmake = f'# User project CMakeLists.txt for {space}\n' + ''.join(
+            mkpro.cmake_entry(name) for name in names) + \
+            'set(SOURCES "${SOURCES}" PARENT_SCOPE)\nset(PUBLIC_HEADER "${PUBLIC_HEADER}" PARENT_SCOPE)\n'
+        _write(os.path.join(space_dir, 'Kconfig'), space_kconfig)
+        _write(os.path.join(space_dir, 'CMakeLists.txt'), space_cmake)
+
+        # 项目文件内容对命令的耗时影响很小，直接写入而不经过 mkpro 的 fsync 路径
+        for name in names:
+            project_dir = os.path.join(space_dir, name.upper())
+            os.makedirs(project_dir)
+            _write(os.path.join(project_dir, 'Kconfig'), f'config {name.upper()}\n    int\n    default 0\n')
+            _write(os.path.join(project_dir, 'CMakeLists.txt'),
+                   f'set(SOURCES "${{SOURCES}}" "${{CMAKE_CURRENT_SOURCE_DIR}}/{name}.c" PARENT_SCOPE)\n')
+            _write(os.path.join(project_dir, f'{name}.c'), f'void {name}_entry(void) {{}}\n')
+
+    _write(os.path.join(samples_dir, 'Kconfig'), '\n'.join(kconfig))
+    _write(os.path.join(samples_dir, 'CMakeLists.txt'),
+           '\n'.join(cmake) + '\nset(PRIVATE_HEADER)\n' + ''.join(installs) + 'build_component()\n')
+    return spaces
+
+def _write(path, content):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+class BenchError(Exception):
+    """被计时(或准备/还原)的命令失败，计时结果不可信"""
+
+    def __init__(self, argv, code, output):
+        super().__init__(f"xs {' '.join(argv)} 失败 (退出码 {code})")
+        self.output = output
+
+_entry = None
+
+def run_inproc(argv):
+    """在当前进程中执行一条 xs 子命令，输出被捕获；退出码非 0 时抛出 BenchError"""
+    global _entry
+    if _entry is None:
+        # 以普通模块加载 __main__.py，复用其中的子命令分发
+        import importlib.util
+        spec = importlib.util.spec_from_file_location('xs_entry', os.path.join(TOOLS_DIR, '__main__.py'))
+        _entry = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_entry)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+        try:
+            code = _entry.dispatch(argv)
+        except SystemExit as e:
+            code = e.code
+    if code not in (0, None):
+        raise BenchError(argv, code, output.getvalue())
+
+def run_e2e(argv):
+    """以完整命令行执行一条 xs 子命令；退出码非 0 时抛出 BenchError"""
+    proc = subprocess.run([sys.executable, os.path.join(TOOLS_DIR, '__main__.py')] + argv,
+                          capture_output=True, text=True, errors='replace', stdin=subprocess.DEVNULL)
+    if proc.returncode != 0:
+        raise BenchError(argv, proc.returncode, proc.stdout + proc.stderr)
+
+def _fill(argv, i):
+    return [arg.format(i=i) for arg in argv]
+
+def bench_size(root, projects, repeat, modes, operations):
+    """对一个规模执行所有操作，返回结果列表"""
+    results = []
+    start = time.perf_counter()
+    spaces = generate_tree(root, projects)
+    # 进度信息写到标准错误，标准输出只留给 JSON 结果
+    print(f"已生成 {projects} 个项目 / {spaces} 个用户代码空间，耗时 {time.perf_counter() - start:.2f} 秒",
+          file=sys.stderr, flush=True)
+
+    cwd = os.getcwd()
+    os.chdir(root)
+    xs_common.find_application_dir.cache_clear()
+    try:
+        for mode in modes:
+            runner = run_inproc if mode == 'inproc' else run_e2e
+            # 第一次 find 需要建立索引，单独记为冷启动
+            for name in ('.xs_index.json', '.xs_symbols.json'):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(os.path.join(root, name))
+            t0 = time.perf_counter()
+            runner(['find', 'all'])
+            results.append(_result(projects, spaces, 'find-cold', mode, [time.perf_counter() - t0]))
+
+            for op in operations:
+                setup, argv, teardown = OPERATIONS[op]
+                runs = []
+                for i in range(repeat):
+                    if setup:
+                        runner(_fill(setup, i))
+                    t0 = time.perf_counter()
+                    runner(_fill(argv, i))
+                    runs.append(time.perf_counter() - t0)
+                    if teardown:
+                        runner(_fill(teardown, i))
+                results.append(_result(projects, spaces, op, mode, runs))
+                print(f"  {mode:<7}{op:<18}中位数 {results[-1]['median'] * 1000:9.1f} ms",
+                      file=sys.stderr, flush=True)
+    finally:
+        os.chdir(cwd)
+        xs_common.find_application_dir.cache_clear()
+    return results
+
+def _result(projects, spaces, op, mode, runs):
+    return {
+        'projects': projects,
+        'spaces': spaces,
+        'op': op,
+        'mode': mode,
+        'runs': [round(r, 6) for r in runs],
+        'median': round(statistics.median(runs), 6),
+        'min': round(min(runs), 6),
+    }
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=TOOLS_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(old_path, new_path):
+    """按 (规模, 操作, 方式) 对比两次结果的中位数"""
+    with open(old_path, 'r', encoding='utf-8') as f:
+        old = {(r['projects'], r['op'], r['mode']): r for r in json.load(f)['results']}
+    with open(new_path, 'r', encoding='utf-8') as f:
+        new = json.load(f)['results']
+    pad = xs_common.pad
+    print(pad('项目数', 10, True) + '  ' + pad('操作', 18) + pad('方式', 8) +
+          pad('旧(ms)', 12, True) + pad('新(ms)', 12, True) + pad('变化', 10, True))
+    for r in new:
+        before = old.get((r['projects'], r['op'], r['mode']))
+        if not before:
+            continue
+        change = (r['median'] - before['median']) / before['median'] * 100 if before['median'] else 0.0
+        print(pad(r['projects'], 10, True) + '  ' + pad(r['op'], 18) + pad(r['mode'], 8) +
+              pad(f"{before['median'] * 1000:.1f}", 12, True) + pad(f"{r['median'] * 1000:.1f}", 12, True) +
+              pad(f"{change:+.1f}%", 10, True))
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='xs 命令性能基准')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help='逗号分隔的项目数规模')
+    parser.add_argument('--repeat', type=int, default=3, help='每个操作的重复次数')
+    parser.add_argument('--modes', default='inproc,e2e', help='计时方式: inproc(进程内) / e2e(完整命令行)')
+    parser.add_argument('--ops', default=','.join(OPERATIONS), help='参与计时的操作')
+    parser.add_argument('-o', '--output', help='结果 JSON 文件，默认输出到标准输出')
+    parser.add_argument('--workdir', help='生成目录树的位置，默认使用临时目录')
+    parser.add_argument('--keep', action='store_true', help='保留生成的目录树')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='对比两次基准结果')
+
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        return compare(*args.compare)
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    modes = [m for m in args.modes.split(',') if m in ('inproc', 'e2e')]
+    operations = [op for op in args.ops.split(',') if op in OPERATIONS]
+
+    # 后台回收进程立即清理回收站，避免删除操作的残留影响后续计时
+    os.environ['XS_TRASH_GRACE'] = '0'
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='xs-bench-')
+    results = []
+    try:
+        for projects in sizes:
+            root = os.path.join(workdir, f'sdk_{projects}')
+            shutil.rmtree(root, ignore_errors=True)
+            try:
+                results += bench_size(root, projects, args.repeat, modes, operations)
+            except BenchError as e:
+                # 失败的命令往往立即返回，计入结果会被误认为是很快的成功
+                print(f"错误: {e}，基准已中止。命令输出:", file=sys.stderr)
+                print(e.output.rstrip(), file=sys.stderr)
+                return 1
+            if not args.keep:
+                shutil.rmtree(root, ignore_errors=True)
+    finally:
+        if not args.keep and not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'revision': git_revision(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        print(f"结果已写入 {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
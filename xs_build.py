@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import hashlib
+import time
+import argparse
+import threading
+import signal
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from xs_common import DEFAULT_TARGET, display_width, format_size, pad
+import xs_buildlog
+import xs_cache
+import xs_fileio
+import xs_history
+import xs_manifest
+import xs_only
+
+# 多目标并行编译时每个目标独立的影子目录(相对 SDK 根目录)，编译日志也写在其中
+MULTI_OUTPUT_DIR = os.path.join('output', 'xs_multi')
+
+_print_lock = threading.Lock()
+
+def find_build_script():
+    build_script = os.path.join(os.getcwd(), 'build.py')
+
+    if os.path.exists(build_script):
+        return build_script
+    else:
+        print("错误: 未找到 'build.py'，请在 SDK 根目录下执行!")
+        sys.exit(1)
+
+def run_build_py(build_args, line_handlers=(), prefix=None, env=None, cwd=None, new_session=False):
+    """执行 build.py；提供 line_handlers 或 prefix 时逐行转发输出并交给各处理函数
+
+    cwd 指定时在该目录下执行其中的 build.py(用于 --only 的影子目录)。
+    处理函数抛出 BuildAborted 时终止编译；new_session 为 True 时 build.py 在独立的进程组中运行，
+    终止时连同 cmake/ninja 等子进程一起结束。
+    """
+    build_script = os.path.join(cwd, 'build.py') if cwd else find_build_script()
+    cmd = [sys.executable, build_script] + build_args
+    if not line_handlers and prefix is None:
+        return subprocess.call(cmd, env=env, cwd=cwd)
+
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            text=True, errors='replace', bufsize=1, env=env, cwd=cwd,
+                            start_new_session=new_session)
+    try:
+        for line in proc.stdout:
+            with _print_lock:
+                sys.stdout.write(line if prefix is None else f"[{prefix}] {line}")
+                sys.stdout.flush()
+            for handler in line_handlers:
+                handler(line)
+    except KeyboardInterrupt:
+        _terminate(proc, new_session)
+        raise
+    except xs_buildlog.BuildAborted:
+        _terminate(proc, new_session)
+        with _print_lock:
+            print(f"\n{'[' + prefix + '] ' if prefix else ''}检测到编译错误，已中止编译 (--fail-fast)")
+    finally:
+        proc.stdout.close()
+    return proc.wait()
+
+def _terminate(proc, group):
+    try:
+        if group:
+            os.killpg(proc.pid, signal.SIGTERM)
+        else:
+            proc.terminate()
+    except OSError:
+        pass
+
+def has_artifacts(output_dir, target):
+    """output_dir 下是否有该目标的镜像，用于判断上一次编译的产物是否还在"""
+    return bool(xs_cache.collect_artifacts(output_dir, target))
+
+def prepare_target_tree(sdk_root, target):
+    """为多目标并行编译建立该目标独立的影子目录并写入主配置的副本，返回影子目录
+
+    各目标在自己的影子目录中执行 build.py，output/ 和生成的配置互不覆盖。
+    """
+    tree = os.path.join(sdk_root, MULTI_OUTPUT_DIR, target)
+    config_rel = xs_only.prepare_shadow(sdk_root, target, tree)
+    if config_rel is None:
+        return None
+    with open(os.path.join(sdk_root, config_rel), 'r', encoding='utf-8') as f:
+        xs_fileio.write_text(os.path.join(tree, config_rel), f.read(), record=False)
+    return tree
+
+def record_build(target, clean, status, exit_code, wall, files=None, phases=None):
+    """向编译历史追加一条记录"""
+    record = {
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'target': target,
+        'mode': 'clean' if clean else 'incremental',
+        'status': status,
+        'exit_code': exit_code,
+        'wall': round(wall, 3),
+        'kconfig': xs_history.kconfig_hash(files) if files else None,
+    }
+    if phases:
+        record['phases'] = phases
+    xs_history.append_record(os.getcwd(), record)
+
+def build_target(target, clean=False, force=False, profile=False, only=None, analyze=True, fail_fast=False,
+                 use_cache=True):
+    """编译指定目标，编译输入未变化时直接返回
+
+    only 为 (用户代码空间, 项目) 时在影子目录中按最小配置只编译该项目。
+    analyze 时逐行分析编译输出，失败后输出摘要；fail_fast 时遇到第一个错误即中止。
+    use_cache 时先按编译输入查找产物缓存，命中则恢复镜像而不编译，编译成功后存入缓存。
+    """
+    sdk_root = os.getcwd()
+    start_time = time.perf_counter()
+
+    build_dir = None
+    key = target
+    if only:
+        build_dir = xs_only.prepare_tree(sdk_root, target, *only)
+        if build_dir is None:
+            return 1
+        key = f'{target}@{only[0]}/{only[1]}'
+        print(f"只编译项目 {only[0]}/{only[1]}，影子目录: {os.path.relpath(build_dir, sdk_root)}")
+
+    manifest = xs_manifest.BuildManifest(sdk_root)
+    digest, files, rehashed = manifest.snapshot()
+
+    output_dir = os.path.join(build_dir or sdk_root, 'output')
+    # 全量编译和 --force 总是执行；镜像被删除(或影子目录刚建立)时也需要重新编译
+    if (not clean and not force and manifest.is_up_to_date(key, digest)
+            and has_artifacts(output_dir, target)):
+        elapsed = time.perf_counter() - start_time
+        print(f"目标 {key} 已是最新 (up to date)，跳过编译 "
+              f"(检查 {len(files)} 个文件，重新哈希 {rehashed} 个，耗时 {elapsed:.3f} 秒)")
+        record_build(key, clean, 'up-to-date', 0, elapsed, files)
+        return 0
+
+    cache = xs_cache.ArtifactCache() if use_cache else None
+    cache_key = xs_cache.cache_key(key, digest, sdk_root) if cache else None
+    # 全量编译和 --force 表示要求真正编译，只存入不查找
+    if cache and not clean and not force:
+        restored = cache.restore(cache_key, output_dir)
+        if restored is not None:
+            manifest.record(key, digest, files)
+            elapsed = time.perf_counter() - start_time
+            print(f"目标 {key} 命中产物缓存，已恢复 {restored} 个镜像文件，跳过编译 (耗时 {elapsed:.3f} 秒)")
+            record_build(key, clean, 'cached', 0, elapsed, files)
+            return 0
+
+    # 编译失败时不能保留上一次的成功记录
+    manifest.invalidate(key)
+
+    build_args = ['-c', target] if clean else [target]
+    tracker = xs_history.PhaseTracker() if profile else None
+    analyzer = xs_buildlog.BuildLogAnalyzer(fail_fast) if analyze or fail_fast else None
+    handlers = [h for h in (analyzer, tracker) if h]
+    returncode = run_build_py(build_args, handlers, cwd=build_dir, new_session=fail_fast)
+    if returncode == 0:
+        manifest.record(key, digest, files)
+        if cache:
+            stored = cache.store(cache_key, output_dir, target)
+            if stored:
+                print(f"已将 {stored} 个镜像文件存入产物缓存")
+
+    elapsed = time.perf_counter() - start_time
+    phases = tracker.finish() if tracker else None
+    record_build(key, clean, 'built', returncode, elapsed, files, phases)
+    if analyzer:
+        analyzer.print_summary(returncode, key)
+    if phases:
+        print_phases(key, elapsed, phases)
+    return returncode
+
+def print_phases(target, elapsed, phases):
+    print(f"\n目标 {target} 编译耗时 {elapsed:.1f} 秒:")
+    for name, seconds in phases.items():
+        print(f"  {name:<10}{seconds:>8.1f} 秒  {seconds / elapsed * 100 if elapsed else 0:>5.1f}%")
+
+def _build_one(target, clean, slots, profile, fail_fast, cwd, label=None):
+    """在线程池中编译一个目标，输出加前缀
+
+    cwd 为该目标(或矩阵变体)的影子目录，build.py 在其中执行，日志写入 cwd/build.log。
+    """
+
+    env = dict(os.environ)
+    env['CMAKE_BUILD_PARALLEL_LEVEL'] = str(slots)
+    env['MAKEFLAGS'] = f'-j{slots}'
+
+    tracker = xs_history.PhaseTracker() if profile else None
+    analyzer = xs_buildlog.BuildLogAnalyzer(fail_fast)
+    start_time = time.perf_counter()
+    with open(os.path.join(cwd, 'build.log'), 'w', encoding='utf-8') as log:
+        # 日志先于分析器写入，中止时触发错误的那一行也会留在日志中
+        handlers = [log.write, analyzer] + ([tracker] if tracker else [])
+        build_args = [f'-j{slots}'] + (['-c', target] if clean else [target])
+        returncode = run_build_py(build_args, handlers, prefix=label or target, env=env, cwd=cwd,
+                                  new_session=fail_fast)
+    return returncode, time.perf_counter() - start_time, tracker.finish() if tracker else None, analyzer
+
+def multi_key(target):
+    """--targets 的产物在影子目录中，与直接编译 output/ 的同名目标分开记录"""
+    return f'{target}@multi'
+
+def build_targets(targets, clean=False, force=False, jobs=None, parallel=None, profile=False, fail_fast=False):
+    """并行编译多个目标，按作业槽位在各目标之间分配 CPU，每个目标在自己的影子目录中编译"""
+    sdk_root = os.getcwd()
+    start_time = time.perf_counter()
+
+    manifest = xs_manifest.BuildManifest(sdk_root)
+    digest, files, _ = manifest.snapshot()
+
+    results = {}
+    analyzers = {}
+    trees = {}
+    pending = []
+    for target in targets:
+        tree = prepare_target_tree(sdk_root, target)
+        if tree is None:
+            results[target] = ('no-config', 1, 0.0)
+            continue
+        trees[target] = tree
+        if (not clean and not force and manifest.is_up_to_date(multi_key(target), digest)
+                and has_artifacts(os.path.join(tree, 'output'), target)):
+            results[target] = ('up-to-date', 0, 0.0)
+            record_build(multi_key(target), clean, 'up-to-date', 0, 0.0, files)
+        else:
+            manifest.targets.pop(multi_key(target), None)
+            pending.append(target)
+
+    if pending:
+        manifest.save()
+        total_slots = jobs or os.cpu_count() or 1
+        concurrency = max(1, min(parallel or len(pending), len(pending), total_slots))
+        slots = max(1, total_slots // concurrency)
+        print(f"并行编译 {len(pending)} 个目标: 同时运行 {concurrency} 个，每个目标 {slots} 个作业槽位")
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {target: executor.submit(_build_one, target, clean, slots, profile, fail_fast,
+                                               trees[target])
+                       for target in pending}
+            for target, future in futures.items():
+                try:
+                    returncode, elapsed, phases, analyzers[target] = future.result()
+                except OSError as e:
+                    print(f"错误: 编译目标 {target} 失败: {e}")
+                    returncode, elapsed, phases = 1, 0.0, None
+                results[target] = ('built', returncode, elapsed)
+                record_build(multi_key(target), clean, 'built', returncode, elapsed, files, phases)
+                if returncode == 0:
+                    manifest.targets[multi_key(target)] = digest
+
+        manifest.files = files
+        manifest.save()
+
+    print_results_table(targets, results, time.perf_counter() - start_time)
+    for target in targets:
+        if target in analyzers and results[target][1] != 0:
+            analyzers[target].print_summary(results[target][1], target)
+    return 0 if all(results[t][1] == 0 for t in targets) else 1
+
+def print_results_table(targets, results, total_elapsed):
+    width = max(8, *(display_width(t) for t in targets)) + 2
+    print("\n" + "=" * (width + 32))
+    print(pad('目标', width) + pad('结果', 10) + pad('耗时(s)', 10, True) + '  日志')
+    for target in targets:
+        status, returncode, elapsed = results[target]
+        if status == 'up-to-date':
+            result = '最新'
+        elif status == 'no-config':
+            result = '缺少配置'
+        else:
+            result = '成功' if returncode == 0 else f'失败({returncode})'
+        log_path = os.path.join(MULTI_OUTPUT_DIR, target, 'build.log') if status == 'built' else '-'
+        print(pad(target, width) + pad(result, 10) + pad(f'{elapsed:.1f}', 10, True) + f'  {log_path}')
+    passed = sum(1 for t in targets if results[t][1] == 0)
+    print("=" * (width + 32))
+    print(f"共 {len(targets)} 个目标，成功 {passed} 个，失败 {len(targets) - passed} 个，总耗时 {total_elapsed:.1f} 秒")
+
+def build_matrix(matrix_path, target, clean=False, force=False, jobs=None, parallel=None, profile=False,
+                 fail_fast=False):
+    """按矩阵文件中的每个变体在各自的影子目录中并行编译，最后输出结果表"""
+    import xs_config
+    import xs_matrix
+    import xs_symbols
+    sdk_root = os.getcwd()
+    start_time = time.perf_counter()
+
+    matrix = xs_matrix.load_matrix(matrix_path)
+    target = matrix['target'] or target
+    names = [name for name, _ in matrix['variants']]
+    index = xs_symbols.load(sdk_root)
+    manifest = xs_manifest.BuildManifest(sdk_root)
+    digest, files, _ = manifest.snapshot()
+
+    results = {}
+    analyzers = {}
+    trees = {}
+    pending = []
+    for name, overrides in matrix['variants']:
+        try:
+            tree, config_hash = xs_matrix.prepare_variant(sdk_root, target, matrix['only'],
+                                                          matrix['base'] + overrides, name, index)
+        except xs_config.ConfigError as e:
+            print(f"错误: 变体 {name} 的配置无效: {e}")
+            results[name] = ('invalid', 1, 0.0)
+            continue
+        if tree is None:
+            return 1
+        trees[name] = tree
+        key = f'{target}#{name}'
+        # 变体的编译输入 = 主清单摘要 + 变体配置
+        variant_digest = hashlib.sha1(f'{digest}\0{config_hash}'.encode('utf-8')).hexdigest()
+        if (not clean and not force and manifest.is_up_to_date(key, variant_digest)
+                and has_artifacts(os.path.join(tree, 'output'), target)):
+            results[name] = ('up-to-date', 0, 0.0)
+            record_build(key, clean, 'up-to-date', 0, 0.0, files)
+        else:
+            manifest.targets.pop(key, None)
+            pending.append((name, key, variant_digest))
+
+    if pending:
+        manifest.save()
+        total_slots = jobs or os.cpu_count() or 1
+        concurrency = max(1, min(parallel or len(pending), len(pending), total_slots))
+        slots = max(1, total_slots // concurrency)
+        print(f"编译 {len(pending)} 个变体: 同时运行 {concurrency} 个，每个变体 {slots} 个作业槽位")
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {name: executor.submit(_build_one, target, clean, slots, profile, fail_fast, trees[name], name)
+                       for name, _, _ in pending}
+            for name, key, variant_digest in pending:
+                try:
+                    returncode, elapsed, phases, analyzers[name] = futures[name].result()
+                except OSError as e:
+                    print(f"错误: 编译变体 {name} 失败: {e}")
+                    returncode, elapsed, phases = 1, 0.0, None
+                results[name] = ('built', returncode, elapsed)
+                record_build(key, clean, 'built', returncode, elapsed, files, phases)
+                if returncode == 0:
+                    manifest.targets[key] = variant_digest
+
+        manifest.files = files
+        manifest.save()
+
+    sizes = {name: xs_matrix.image_size(os.path.join(tree, 'output'), target) for name, tree in trees.items()}
+    print_matrix_table(names, results, sizes, time.perf_counter() - start_time)
+    for name in names:
+        if name in analyzers and results[name][1] != 0:
+            analyzers[name].print_summary(results[name][1], name)
+    return 0 if all(results[name][1] == 0 for name in names) else 1
+
+def print_matrix_table(names, results, sizes, total_elapsed):
+    import xs_matrix
+    width = max(8, *(display_width(name) for name in names)) + 2
+    print("\n" + "=" * (width + 44))
+    print(pad('变体', width) + pad('结果', 10) + pad('耗时(s)', 10, True) + pad('镜像大小', 12, True) + '  日志')
+    for name in names:
+        status, returncode, elapsed = results[name]
+        if status == 'invalid':
+            result = '配置无效'
+        elif status == 'up-to-date':
+            result = '最新'
+        else:
+            result = '成功' if returncode == 0 else f'失败({returncode})'
+        size = format_size(sizes[name]) if sizes.get(name) else '-'
+        log_path = os.path.join(xs_matrix.MATRIX_OUTPUT_DIR, name, 'build.log') if status == 'built' else '-'
+        print(pad(name, width) + pad(result, 10) + pad(f'{elapsed:.1f}', 10, True) + pad(size, 12, True) +
+              f'  {log_path}')
+    passed = sum(1 for name in names if results[name][1] == 0)
+    print("=" * (width + 44))
+    print(f"共 {len(names)} 个变体，成功 {passed} 个，失败 {len(names) - passed} 个，总耗时 {total_elapsed:.1f} 秒")
+
+def show_stats(target=None, last=None, as_json=False):
+    records = xs_history.load_records(os.getcwd(), target)
+    if last:
+        records = records[-last:]
+    summary = xs_history.summarize(records)
+    if as_json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    else:
+        xs_history.print_summary(summary)
+    return 0
+
+def check_only_project(space, project):
+    """--only 指定的项目必须存在并已在 Kconfig 中注册"""
+    import xs_daemon
+    sdk_root = os.getcwd()
+    if not os.path.isdir(os.path.join(sdk_root, 'application', 'samples', space, project)):
+        print(f"错误: 项目 {space}/{project} 不存在!")
+        return False
+    symbol = f'SAMPLE_SUPPORT_{project}'
+    if not xs_daemon.query_or_load(sdk_root, 'lookup', names=[symbol]).lookup(symbol):
+        print(f"错误: 项目 {space}/{project} 未在 Kconfig 中注册 (缺少 SAMPLE_SUPPORT_{project})!")
+        return False
+    return True
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='编译工具')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    b_parser = subparsers.add_parser('b', help='可选择式编译')
+    b_parser.add_argument('target', nargs='?', help='编译目标，不指定时由 build.py 交互选择')
+    b_parser.add_argument('-c', '--clean', action='store_true', help='全量编译')
+    b_parser.add_argument('--force', action='store_true', help='忽略清单，强制编译')
+    b_parser.add_argument('--profile', action='store_true', help='按 build.py 输出划分阶段并统计耗时')
+    b_parser.add_argument('--targets', help='逗号分隔的多个编译目标，并行编译')
+    b_parser.add_argument('-j', '--jobs', type=int, help='所有目标共用的作业槽位总数，默认为 CPU 数')
+    b_parser.add_argument('--parallel', type=int, help='同时编译的目标数上限，默认同时编译全部目标')
+    b_parser.add_argument('--only', metavar='SPACE/PROJECT', help='按最小配置只编译指定项目，不改动主配置')
+    b_parser.add_argument('--fail-fast', action='store_true', help='遇到第一个编译错误即中止编译')
+    b_parser.add_argument('--raw', action='store_true', help='直接输出 build.py 的原始输出，不做分析')
+    b_parser.add_argument('--no-cache', action='store_true', help='不使用产物缓存')
+    b_parser.add_argument('--matrix', metavar='FILE', help='按矩阵文件(YAML/JSON)中的各个配置变体并行编译')
+
+    build_parser = subparsers.add_parser('build', help=f'编译 {DEFAULT_TARGET} 目标')
+    build_parser.add_argument('-c', '--clean', action='store_true', help='全量编译')
+    build_parser.add_argument('--force', action='store_true', help='忽略清单，强制编译')
+    build_parser.add_argument('--profile', action='store_true', help='按 build.py 输出划分阶段并统计耗时')
+    build_parser.add_argument('--only', metavar='SPACE/PROJECT', help='按最小配置只编译指定项目，不改动主配置')
+    build_parser.add_argument('--fail-fast', action='store_true', help='遇到第一个编译错误即中止编译')
+    build_parser.add_argument('--raw', action='store_true', help='直接输出 build.py 的原始输出，不做分析')
+    build_parser.add_argument('--no-cache', action='store_true', help='不使用产物缓存')
+    build_parser.add_argument('--matrix', metavar='FILE', help='按矩阵文件(YAML/JSON)中的各个配置变体并行编译')
+
+    stats_parser = subparsers.add_parser('stats', help='查看编译耗时统计')
+    stats_parser.add_argument('target', nargs='?', help='只统计指定目标')
+    stats_parser.add_argument('--last', type=int, help='只统计最近 N 条记录')
+    stats_parser.add_argument('--json', action='store_true', help='以 JSON 格式输出')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'stats':
+        sys.exit(show_stats(args.target, args.last, args.json))
+
+    only = None
+    if args.only:
+        only = xs_only.parse_only(args.only)
+        if not check_only_project(*only):
+            sys.exit(1)
+
+    if args.matrix:
+        if only or getattr(args, 'targets', None):
+            parser.error('--matrix 不能与 --only 或 --targets 同时使用，请在矩阵文件中指定 only')
+        target = args.target if args.command == 'b' else None
+        sys.exit(build_matrix(args.matrix, target or DEFAULT_TARGET, args.clean, args.force,
+                              getattr(args, 'jobs', None), getattr(args, 'parallel', None), args.profile,
+                              args.fail_fast))
+
+    if args.command == 'b' and args.targets:
+        if args.target:
+            parser.error('不能同时指定目标和 --targets')
+        if only:
+            parser.error('--only 不能与 --targets 同时使用')
+        targets = list(dict.fromkeys(t.strip() for t in args.targets.split(',') if t.strip()))
+        if not targets:
+            parser.error('--targets 至少需要一个目标')
+        sys.exit(build_targets(targets, args.clean, args.force, args.jobs, args.parallel, args.profile,
+                               args.fail_fast))
+
+    if args.command == 'b' and not args.target and not only:
+        # 交互式选择目标时无法提前知道编译目标，直接交给 build.py
+        start_time = time.perf_counter()
+        returncode = run_build_py(['-c'] if args.clean else [])
+        record_build(None, args.clean, 'built', returncode, time.perf_counter() - start_time)
+        sys.exit(returncode)
+
+    target = args.target if args.command == 'b' else DEFAULT_TARGET
+    sys.exit(build_target(target or DEFAULT_TARGET, args.clean, args.force, args.profile, only,
+                          not args.raw, args.fail_fast, not args.no_cache))
+
+if __name__ == "__main__":
+    main()
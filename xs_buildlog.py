@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""编译输出的流式分析
+
+BuildLogAnalyzer 作为 run_build_py 的逐行处理函数，边编译边识别编译器错误、警告和链接失败。
+内存占用固定: 只保留最近 RING_SIZE 行的环形缓冲、首个错误的上下文、前 MAX_ERRORS 条错误
+和按文件统计的警告数。编译失败时输出带 file:line 的摘要；fail_fast 时遇到第一个错误即中止编译。
+"""
+import re
+import collections
+
+RING_SIZE = 200
+CONTEXT_BEFORE = 8
+CONTEXT_AFTER = 4
+MAX_ERRORS = 20
+TAIL_LINES = 20
+TOP_WARNING_FILES = 5
+
+ANSI_ESCAPE = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+
+# gcc/clang: file:line[:col]: error|warning: message
+COMPILER_DIAG = re.compile(r'^(?P<file>[^\s:][^:]*):(?P<line>\d+):(?:\d+:)?\s*(?P<kind>fatal error|error|warning):\s*(?P<msg>.*)$')
+# ld: file.o:(.text+0x10): undefined reference to `foo'
+LINKER_REF = re.compile(r'^(?P<file>[^\s:][^:]*):(?:(?P<line>\d+)|\([^)]*\)):\s*(?P<msg>(undefined reference|multiple definition) .*)$')
+LINKER_ERROR = re.compile(r"(^|\s)(collect2: error|\S*\bld(\.\w+)?: (error|cannot find)|region `?\S+'? overflowed)")
+CMAKE_ERROR = re.compile(r'^CMake Error at (?P<file>[^:]+):(?P<line>\d+)\s*(?P<msg>.*)$')
+
+class BuildAborted(Exception):
+    """fail_fast 时由分析器抛出，run_build_py 据此终止编译进程"""
+
+class BuildLogAnalyzer:
+
+    def __init__(self, fail_fast=False):
+        self.fail_fast = fail_fast
+        self.ring = collections.deque(maxlen=RING_SIZE)
+        self.errors = []
+        self.error_count = 0
+        self.warning_count = 0
+        self.warnings_by_file = collections.Counter()
+        self.context = None
+        self._after = 0
+
+    def __call__(self, line):
+        line = ANSI_ESCAPE.sub('', line.rstrip('\r\n'))
+        self.ring.append(line)
+        if self._after:
+            self.context.append(line)
+            self._after -= 1
+
+        match = COMPILER_DIAG.match(line)
+        if match:
+            if match.group('kind') == 'warning':
+                self.warning_count += 1
+                self.warnings_by_file[match.group('file')] += 1
+                return
+            self._error(match.group('file'), match.group('line'), match.group('msg'))
+            return
+        match = LINKER_REF.match(line)
+        if match:
+            self._error(match.group('file'), match.group('line'), match.group('msg'))
+            return
+        match = CMAKE_ERROR.match(line)
+        if match:
+            self._error(match.group('file'), match.group('line'), f"CMake Error {match.group('msg')}")
+        elif LINKER_ERROR.search(line):
+            self._error(None, None, line.strip())
+
+    def _error(self, path, lineno, msg):
+        self.error_count += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append((path, lineno, msg.strip()))
+        if self.context is None:
+            self.context = list(self.ring)[-CONTEXT_BEFORE - 1:]
+            self._after = CONTEXT_AFTER
+        if self.fail_fast:
+            raise BuildAborted(msg)
+
+    def print_summary(self, returncode, title=None):
+        """编译失败时输出摘要；成功时只在有警告时输出一行统计"""
+        if returncode == 0:
+            if self.warning_count:
+                top = ', '.join(f'{path}({n})' for path, n in self.warnings_by_file.most_common(3))
+                print(f"编译完成，共 {self.warning_count} 个警告，最多的文件: {top}")
+            return
+
+        print("\n" + "=" * 20 + f" {title or '编译'}失败摘要 " + "=" * 20)
+        print(f"错误 {self.error_count} 个，警告 {self.warning_count} 个"
+              f"(分布在 {len(self.warnings_by_file)} 个文件中)")
+        if self.errors:
+            path, lineno, msg = self.errors[0]
+            print(f"首个错误: {_location(path, lineno)}{msg}")
+            print("  上下文:")
+            for line in self.context:
+                print(f"    {line}")
+            print("错误列表:")
+            for path, lineno, msg in self.errors:
+                print(f"  {_location(path, lineno)}{msg}")
+            if self.error_count > len(self.errors):
+                print(f"  ... 另有 {self.error_count - len(self.errors)} 个错误未列出")
+        else:
+            # 没有识别出具体错误时给出最后几行输出
+            print(f"未识别出具体错误，最后 {TAIL_LINES} 行输出:")
+            for line in list(self.ring)[-TAIL_LINES:]:
+                print(f"    {line}")
+        if self.warnings_by_file:
+            print("警告最多的文件:")
+            for path, n in self.warnings_by_file.most_common(TOP_WARNING_FILES):
+                print(f"  {path}  {n}")
+
+def _location(path, lineno):
+    if not path:
+        return ''
+    return f"{path}:{lineno}: " if lineno else f"{path}: "
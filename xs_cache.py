@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""固件产物的本地缓存
+
+xs build 成功后把 output/ 下该目标的镜像文件按内容哈希存入缓存，键由目标名、编译清单摘要
+(覆盖 .config、application/samples 和编译脚本)以及工具链版本共同决定。之后同样的输入再次编译时
+直接从缓存恢复镜像，不再调用 build.py。
+
+缓存目录结构(默认 ~/.cache/xs_tools/artifacts，可通过环境变量 XS_CACHE_DIR 修改):
+    objects/<哈希前两位>/<哈希其余部分>   按内容寻址的镜像文件，多个条目共享相同的内容
+    entries/<键>.json                   一次编译的产物清单，文件 mtime 作为最近使用时间
+    stats.json                          命中/未命中/存入/淘汰次数
+
+总大小超过上限(默认 2G，环境变量 XS_CACHE_MAX_SIZE)时按最近使用时间淘汰最旧的条目。
+"""
+import os
+import sys
+import json
+import time
+import glob
+import fcntl
+import shutil
+import hashlib
+import argparse
+import contextlib
+
+from xs_common import SIZE_UNITS, format_size, pad
+
+DEFAULT_MAX_SIZE = 2 * 1024 ** 3
+
+# 视为编译产物的镜像文件
+IMAGE_EXTS = ('.fwpkg', '.bin', '.elf', '.hex')
+
+# output/ 下由 xs 自己管理的目录，不属于主编译的产物
+SKIP_OUTPUT_DIRS = ('xs_multi', 'xs_only', 'xs_matrix')
+
+# 用于识别工具链版本的编译器位置(相对 SDK 根目录)
+TOOLCHAIN_GLOBS = (
+    'tools/bin/compiler/*/*/bin/*gcc',
+    'tools/bin/compiler/*/bin/*gcc',
+)
+
+def parse_size(text):
+    text = str(text).strip().upper().rstrip('B')
+    if text and text[-1] in SIZE_UNITS:
+        return int(float(text[:-1]) * SIZE_UNITS[text[-1]])
+    return int(text)
+
+def default_cache_dir():
+    if os.environ.get('XS_CACHE_DIR'):
+        return os.environ['XS_CACHE_DIR']
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'xs_tools', 'artifacts')
+
+def max_cache_size():
+    try:
+        return parse_size(os.environ.get('XS_CACHE_MAX_SIZE', DEFAULT_MAX_SIZE))
+    except ValueError:
+        return DEFAULT_MAX_SIZE
+
+def toolchain_id(sdk_root):
+    """以编译器可执行文件的路径、大小和 mtime 标识工具链版本"""
+    h = hashlib.sha1()
+    for pattern in TOOLCHAIN_GLOBS:
+        for path in sorted(glob.glob(os.path.join(sdk_root, pattern))):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            h.update(f'{os.path.relpath(path, sdk_root)}\0{st.st_size}\0{st.st_mtime_ns}\n'.encode('utf-8'))
+    return h.hexdigest()[:12]
+
+def cache_key(target, digest, sdk_root):
+    return hashlib.sha1(f'{target}\0{digest}\0{toolchain_id(sdk_root)}'.encode('utf-8')).hexdigest()
+
+def collect_artifacts(output_dir, target):
+    """返回 output_dir 下属于该目标的镜像文件(相对路径)"""
+    files = []
+    for dirpath, dirnames, filenames in os.walk(output_dir):
+        if dirpath == output_dir:
+            dirnames[:] = [d for d in dirnames if d not in SKIP_OUTPUT_DIRS]
+        rel_dir = os.path.relpath(dirpath, output_dir)
+        in_target = target in rel_dir.split(os.sep)
+        for name in filenames:
+            if name.endswith(IMAGE_EXTS) and (in_target or name.startswith(target)):
+                files.append(os.path.normpath(os.path.join(rel_dir, name)))
+    return sorted(files)
+
+class ArtifactCache:
+
+    def __init__(self, root=None):
+        self.root = root or default_cache_dir()
+        self.objects_dir = os.path.join(self.root, 'objects')
+        self.entries_dir = os.path.join(self.root, 'entries')
+
+    def _entry_path(self, key):
+        return os.path.join(self.entries_dir, key + '.json')
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """存入和淘汰互斥，查找和恢复不加锁(对象缺失时按未命中处理)"""
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, '.lock'), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def _count(self, field, n=1):
+        path = os.path.join(self.root, 'stats.json')
+        with self._locked():
+            stats = self.counters()
+            stats[field] = stats.get(field, 0) + n
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(stats, f)
+            os.replace(path + '.tmp', path)
+
+    def counters(self):
+        try:
+            with open(os.path.join(self.root, 'stats.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def restore(self, key, output_dir):
+        """命中时把镜像复制到 output_dir，返回恢复的文件数；未命中返回 None"""
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self._count('misses')
+            return None
+
+        objects = {rel: self._object_path(digest) for rel, (digest, _, _) in entry['files'].items()}
+        if not all(os.path.isfile(path) for path in objects.values()):
+            # 对象已被淘汰，条目失效
+            with contextlib.suppress(OSError):
+                os.remove(entry_path)
+            self._count('misses')
+            return None
+
+        for rel, path in objects.items():
+            dst = os.path.join(output_dir, rel)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            # 必须复制而不是硬链接，build.py 之后原地改写镜像时不能破坏缓存
+            tmp = dst + '.xs_tmp'
+            shutil.copyfile(path, tmp)
+            os.chmod(tmp, entry['files'][rel][2])
+            os.replace(tmp, dst)
+        os.utime(entry_path)
+        self._count('hits')
+        return len(objects)
+
+    def store(self, key, output_dir, target):
+        """存入该目标的镜像文件，返回存入的文件数"""
+        files = {}
+        for rel in collect_artifacts(output_dir, target):
+            path = os.path.join(output_dir, rel)
+            h = hashlib.sha1()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    h.update(chunk)
+            st = os.stat(path)
+            files[rel] = (h.hexdigest(), st.st_size, st.st_mode & 0o777)
+        if not files:
+            return 0
+
+        with self._locked():
+            for rel, (digest, _, _) in files.items():
+                obj = self._object_path(digest)
+                if os.path.exists(obj):
+                    continue
+                os.makedirs(os.path.dirname(obj), exist_ok=True)
+                shutil.copyfile(os.path.join(output_dir, rel), obj + '.tmp')
+                os.replace(obj + '.tmp', obj)
+            os.makedirs(self.entries_dir, exist_ok=True)
+            entry = {'target': target, 'created': time.time(), 'files': files}
+            with open(self._entry_path(key) + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(self._entry_path(key) + '.tmp', self._entry_path(key))
+        self._count('stores')
+        self.prune(max_cache_size())
+        return len(files)
+
+    def entries(self):
+        """返回 [(键, 最近使用时间, 条目)]，按最近使用时间从旧到新排序"""
+        result = []
+        try:
+            names = os.listdir(self.entries_dir)
+        except FileNotFoundError:
+            return []
+        for name in names:
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.entries_dir, name)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+                used = os.stat(path).st_mtime
+            except (OSError, ValueError):
+                continue
+            result.append((name[:-len('.json')], used, entry))
+        result.sort(key=lambda item: item[1])
+        return result
+
+    def objects(self):
+        """返回 {对象哈希: 大小}"""
+        result = {}
+        for path in glob.glob(os.path.join(self.objects_dir, '??', '*')):
+            if path.endswith('.tmp'):
+                continue
+            with contextlib.suppress(OSError):
+                result[os.path.basename(os.path.dirname(path)) + os.path.basename(path)] = os.path.getsize(path)
+        return result
+
+    def prune(self, max_size=None, remove_all=False):
+        """按 LRU 淘汰条目直到总大小不超过 max_size，并删除不再被引用的对象，返回 (淘汰条目数, 释放字节数)"""
+        with self._locked():
+            entries = self.entries()
+            objects = self.objects()
+            total = sum(objects.values())
+            removed = 0
+            while entries and (remove_all or (max_size is not None and total > max_size)):
+                key, _, _ = entries.pop(0)
+                with contextlib.suppress(OSError):
+                    os.remove(self._entry_path(key))
+                removed += 1
+                # 重新计算仍被引用的对象大小
+                live = {digest for _, _, entry in entries for digest, _, _ in entry['files'].values()}
+                total = sum(size for digest, size in objects.items() if digest in live)
+
+            live = {digest for _, _, entry in entries for digest, _, _ in entry['files'].values()}
+            freed = 0
+            for digest, size in objects.items():
+                if digest not in live:
+                    with contextlib.suppress(OSError):
+                        os.remove(self._object_path(digest))
+                        freed += size
+        if removed:
+            self._count('evictions', removed)
+        return removed, freed
+
+def show_stats(cache):
+    entries = cache.entries()
+    objects = cache.objects()
+    counters = cache.counters()
+    hits, misses = counters.get('hits', 0), counters.get('misses', 0)
+    print(f"缓存目录: {cache.root}")
+    print(f"条目数:   {len(entries)}，对象数: {len(objects)}")
+    print(f"总大小:   {format_size(sum(objects.values()))} / 上限 {format_size(max_cache_size())}")
+    rate = f"{hits / (hits + misses) * 100:.1f}%" if hits + misses else '-'
+    print(f"命中 {hits} 次，未命中 {misses} 次，命中率 {rate}；存入 {counters.get('stores', 0)} 次，"
+          f"淘汰 {counters.get('evictions', 0)} 个条目")
+    if entries:
+        print("\n" + pad('最近使用', 21) + pad('目标', 32) + pad('文件数', 8, True) + pad('大小', 10, True))
+        for key, used, entry in reversed(entries):
+            size = sum(size for _, size, _ in entry['files'].values())
+            print(pad(time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(used)), 21) +
+                  pad(entry.get('target', '?'), 32) + pad(len(entry['files']), 8, True) +
+                  pad(format_size(size), 10, True))
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='固件产物缓存管理')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('stats', help='查看缓存使用情况')
+    prune_parser = subparsers.add_parser('prune', help='按 LRU 淘汰缓存')
+    prune_parser.add_argument('--max-size', help='淘汰到不超过该大小(如 500M)，默认使用缓存上限')
+    prune_parser.add_argument('--all', action='store_true', help='清空缓存')
+
+    args = parser.parse_args(argv)
+    cache = ArtifactCache()
+
+    if args.command == 'stats':
+        return show_stats(cache)
+
+    try:
+        max_size = parse_size(args.max_size) if args.max_size else max_cache_size()
+    except ValueError:
+        parser.error(f'无效的大小: {args.max_size}')
+    removed, freed = cache.prune(max_size, remove_all=args.all)
+    print(f"已淘汰 {removed} 个条目，释放 {format_size(freed)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
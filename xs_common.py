@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""各子命令共用的校验、SDK 目录定位和终端表格输出"""
+import os
+import sys
+import re
+import functools
+import unicodedata
+
+# build / config / watch 共用的默认编译目标，放在这里以免只读写配置的命令导入整个编译模块
+DEFAULT_TARGET = 'ws63-liteos-app'
+
+def is_valid_project_name(name):
+    # 检查是否是有效的变量名
+    if not re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', name):
+        print(f"错误: 项目名 '{name}' 不符合变量名规则")
+        print("项目名必须以字母或下划线开头，后面可以跟字母、数字或下划线")
+        return False
+    return True
+
+@functools.lru_cache(maxsize=None)
+def find_application_dir():
+    """查找当前路径下的application目录，同一进程内只查找一次"""
+    current_dir = os.getcwd()
+    application_dir = os.path.join(current_dir, 'application')
+
+    if os.path.exists(application_dir) and os.path.isdir(application_dir):
+        return application_dir
+    else:
+        print("错误: 未找到 'application' 目录!")
+        sys.exit(1)
+
+def find_sdk_root():
+    return os.path.dirname(find_application_dir())
+
+SIZE_UNITS = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+def format_size(size):
+    for unit in ('G', 'M', 'K'):
+        if size >= SIZE_UNITS[unit]:
+            return f'{size / SIZE_UNITS[unit]:.1f}{unit}'
+    return f'{size}B'
+
+def display_width(text):
+    return sum(2 if unicodedata.east_asian_width(ch) in ('W', 'F') else 1 for ch in text)
+
+def pad(text, width, right=False):
+    """按终端显示宽度对齐(中文字符占两列)"""
+    text = str(text)
+    fill = ' ' * max(0, width - display_width(text))
+    return fill + text if right else text + fill
@@ -0,0 +1,131 @@
+# xs 命令的 bash/zsh 补全，由 set_xs.sh 加载
+#
+# 用户代码空间、项目名和示例开关来自 SDK 根目录下的 .xs_completion，该文件由
+# create-project / clone-project / move-project / clean-project / make-user-space / clean-user-space / find 在刷新索引时维护。
+# 补全时只读取这个小文件，不启动 Python，也不遍历 application/samples。
+
+_XS_COMMANDS="make-user-space create-project clone-project move-project clean-user-space clean-project find symbols cache config watch b build stats daemon trash menu menuconfig"
+
+# 读取补全缓存中键为 $1 的一行，结果放在 _xs_value 中
+_xs_lookup() {
+    local file="${XS_SDK_ROOT:-$PWD}/.xs_completion" key value
+    _xs_value=""
+    [ -r "$file" ] || return 1
+    while IFS=$'\t' read -r key value; do
+        if [ "$key" = "$1" ]; then
+            _xs_value="$value"
+            return 0
+        fi
+    done < "$file"
+    return 1
+}
+
+# 补全 <空间>/<项目>: 先补全空间名，输入 / 之后再补全该空间下的项目
+_xs_pairs() {
+    local cur="$1" name
+    words=""
+    if [[ "$cur" == */* ]]; then
+        _xs_lookup "${cur%%/*}"
+        for name in $_xs_value; do
+            words="$words ${cur%%/*}/$name"
+        done
+    else
+        _xs_lookup ":spaces"
+        for name in $_xs_value; do
+            words="$words $name/"
+        done
+        type compopt > /dev/null 2>&1 && compopt -o nospace 2> /dev/null
+    fi
+}
+
+_xs() {
+    if [ -n "${ZSH_VERSION-}" ]; then
+        setopt localoptions ksharrays shwordsplit
+    fi
+    local cur="${COMP_WORDS[COMP_CWORD]}" prev="${COMP_WORDS[COMP_CWORD-1]}"
+    local cmd="${COMP_WORDS[1]}" space="" words="" i
+    COMPREPLY=()
+
+    if [ "$COMP_CWORD" -eq 1 ]; then
+        COMPREPLY=($(compgen -W "$_XS_COMMANDS -h --help" -- "$cur"))
+        return 0
+    fi
+
+    # 已经输入的 -p <用户代码空间>
+    for ((i = 2; i < COMP_CWORD; i++)); do
+        case "${COMP_WORDS[i]}" in
+            -p|--parent) space="${COMP_WORDS[i+1]}" ;;
+        esac
+    done
+
+    case "$prev" in
+        -p|--parent|--to)
+            _xs_lookup ":spaces"
+            COMPREPLY=($(compgen -W "$_xs_value" -- "$cur"))
+            return 0 ;;
+        --only)
+            _xs_pairs "$cur"
+            COMPREPLY=($(compgen -W "$words" -- "$cur"))
+            return 0 ;;
+        -m|--manifest|--matrix)
+            COMPREPLY=($(compgen -f -- "$cur"))
+            return 0 ;;
+    esac
+
+    case "$cmd" in
+        create-project)
+            words="-p --parent -m --manifest --enable" ;;
+        clean-project)
+            _xs_lookup "${space:-user_project}"
+            words="$_xs_value -p --parent -y" ;;
+        clone-project)
+            _xs_lookup "${space:-user_project}"
+            words="$_xs_value -p --parent" ;;
+        move-project)
+            _xs_lookup "${space:-user_project}"
+            words="$_xs_value -p --parent --to" ;;
+        make-user-space)
+            words="" ;;
+        clean-user-space)
+            _xs_lookup ":spaces"
+            words="$_xs_value -f" ;;
+        find)
+            _xs_lookup ":spaces"
+            words="all $_xs_value --depth --name --json --limit --no-index -j --stats --sort" ;;
+        b|build)
+            words="-c --clean --force --profile --only --fail-fast --raw --no-cache --matrix"
+            [ "$cmd" = "b" ] && words="$words --targets -j --jobs --parallel" ;;
+        watch)
+            _xs_pairs "$cur"
+            words="$words -t --target --only --queue --debounce --poll --fail-fast" ;;
+        config)
+            if [ "$COMP_CWORD" -eq 2 ]; then
+                words="get set"
+            else
+                _xs_lookup ":symbols"
+                words="$_xs_value -t --target --json --dry-run"
+            fi ;;
+        symbols)
+            _xs_lookup ":symbols"
+            words="$_xs_value --conflicts --json" ;;
+        cache)
+            [ "$COMP_CWORD" -eq 2 ] && words="stats prune" || words="--max-size --all" ;;
+        stats)
+            words="--last --json" ;;
+        daemon)
+            words="start stop status" ;;
+        trash)
+            words="--purge --restore" ;;
+    esac
+    COMPREPLY=($(compgen -W "$words" -- "$cur"))
+    return 0
+}
+
+if [ -n "${ZSH_VERSION-}" ]; then
+    # zsh 通过 bashcompinit 复用同一个补全函数
+    if ! type compdef > /dev/null 2>&1; then
+        autoload -Uz compinit && compinit -u
+    fi
+    autoload -U +X bashcompinit && bashcompinit
+fi
+complete -F _xs xs
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""不打开 menuconfig 直接读取和修改目标配置文件
+
+配置文件与 xs build --only 使用的相同(build/config/target_config/*/menuconfig/*/<目标>.config，
+找不到时使用 SDK 根目录下的 .config)。符号的类型、依赖、select 和默认值来自 xs symbols 的
+增量索引(.xs_symbols.json)，不需要每次重新解析 Kconfig:
+
+- 打开符号时先递归满足 depends on 中的符号(只支持由 && 连接的符号，其他表达式不满足时报错)，
+  再打开 select 的符号
+- 关闭符号时一并关闭依赖它的符号
+- 修改后新出现的可见符号按 Kconfig 中的字面默认值写入，后续编译无需再打开配置界面
+"""
+import os
+import re
+import sys
+import json
+import fnmatch
+import argparse
+
+from xs_common import DEFAULT_TARGET, find_application_dir
+import xs_fileio
+import xs_only
+import xs_symbols
+
+# 未指定符号时 xs config get 列出的示例开关
+DEFAULT_PATTERNS = ('SAMPLE_ENABLE', 'ENABLE_*_SAMPLE', 'SAMPLE_SUPPORT_*')
+
+CONFIG_LINE = re.compile(r'^CONFIG_(\w+)=(.*)$')
+UNSET_LINE = re.compile(r'^# CONFIG_(\w+) is not set$')
+EXPR_TOKEN = re.compile(r'\s*(&&|\|\||!=|[!()=]|"[^"]*"|[A-Za-z0-9_]+)')
+LITERAL_DEFAULT = re.compile(r'^(?:[ynm]|-?\d+|0[xX][0-9a-fA-F]+|"[^"]*")$')
+TRISTATE = {'n': 0, 'm': 1, 'y': 2}
+
+class ConfigError(Exception):
+    """无法按要求修改配置时抛出，main 中统一输出错误"""
+
+class DotConfig:
+    """.config 的逐行模型，未修改的行原样保留"""
+
+    def __init__(self, path, content=None):
+        self.path = path
+        if content is None:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        self.lines = content.splitlines()
+        self.where = {}
+        for i, line in enumerate(self.lines):
+            match = CONFIG_LINE.match(line) or UNSET_LINE.match(line)
+            if match:
+                self.where[match.group(1)] = i
+
+    def get(self, name):
+        """返回符号的值，未设置(is not set)时为 'n'，配置中没有该符号时为 None"""
+        i = self.where.get(name)
+        if i is None:
+            return None
+        match = CONFIG_LINE.match(self.lines[i])
+        return match.group(2) if match else 'n'
+
+    def set(self, name, value):
+        line = f'# CONFIG_{name} is not set' if value == 'n' else f'CONFIG_{name}={value}'
+        i = self.where.get(name)
+        if i is None:
+            self.where[name] = len(self.lines)
+            self.lines.append(line)
+        else:
+            self.lines[i] = line
+
+    def names(self):
+        return list(self.where)
+
+    def serialize(self):
+        return '\n'.join(self.lines) + '\n'
+
+def tokenize(expr):
+    tokens = []
+    pos = 0
+    expr = expr.strip()
+    while pos < len(expr):
+        match = EXPR_TOKEN.match(expr, pos)
+        if not match:
+            raise ConfigError(f"无法解析依赖表达式: {expr}")
+        tokens.append(match.group(1))
+        pos = match.end()
+    return tokens
+
+def evaluate(expr, value_of):
+    """按 Kconfig 三态语义计算表达式，返回 0(n)/1(m)/2(y)"""
+    tokens = tokenize(expr)
+    pos = 0
+
+    def peek():
+        return tokens[pos] if pos < len(tokens) else None
+
+    def take():
+        nonlocal pos
+        pos += 1
+        return tokens[pos - 1]
+
+    def atom_text(token):
+        if token.startswith('"'):
+            return token[1:-1]
+        if token in TRISTATE or token.isdigit():
+            return token
+        return value_of(token) or 'n'
+
+    def primary():
+        token = take()
+        if token == '(':
+            value = or_expr()
+            take()
+            return value
+        if peek() in ('=', '!='):
+            op = take()
+            equal = atom_text(token).strip('"') == atom_text(take()).strip('"')
+            return 2 if equal == (op == '=') else 0
+        return TRISTATE.get(atom_text(token), 0)
+
+    def unary():
+        if peek() == '!':
+            take()
+            return 2 - unary()
+        return primary()
+
+    def and_expr():
+        value = unary()
+        while peek() == '&&':
+            take()
+            value = min(value, unary())
+        return value
+
+    def or_expr():
+        value = and_expr()
+        while peek() == '||':
+            take()
+            value = max(value, and_expr())
+        return value
+
+    try:
+        return or_expr()
+    except IndexError:
+        raise ConfigError(f"无法解析依赖表达式: {expr}") from None
+
+def conjunction_symbols(expr):
+    """表达式只由 && 连接的符号组成时返回这些符号，否则返回 None"""
+    parts = [part.strip().strip('()').strip() for part in expr.split('&&')]
+    if all(re.fullmatch(r'[A-Za-z0-9_]+', part) and part not in TRISTATE for part in parts):
+        return parts
+    return None
+
+class ConfigEditor:
+
+    def __init__(self, config, index):
+        self.config = config
+        self.index = index
+        self.changes = []
+        self._dependents = None
+
+    def value(self, name):
+        return self.config.get(name)
+
+    def _set(self, name, value, reason):
+        old = self.value(name)
+        if old == value:
+            return
+        self.config.set(name, value)
+        self.changes.append((name, old, value, reason))
+
+    def _attributes(self, name):
+        attrs = self.index.attributes(name)
+        # samples 之外的 SDK 符号不在索引中，只能修改配置中已经存在的
+        if attrs is None and self.value(name) is None:
+            raise ConfigError(f"未找到配置符号 {name}，请确认符号名或先执行一次 xs menuconfig")
+        return attrs
+
+    def _satisfy(self, name, attrs, stack):
+        for expr in attrs['depends']:
+            if evaluate(expr, self.value):
+                continue
+            symbols = conjunction_symbols(expr)
+            if symbols is None:
+                raise ConfigError(f"{name} 依赖 {expr}，无法自动满足，请使用 xs menuconfig 手动配置")
+            for symbol in symbols:
+                self.enable(symbol, f'{name} 的依赖', stack + (name,))
+
+    def enable(self, name, reason=None, stack=()):
+        if name in stack:
+            return
+        attrs = self._attributes(name)
+        if attrs is None:
+            self._set(name, 'y', reason)
+            return
+        if attrs['type'] not in ('bool', 'tristate', None):
+            raise ConfigError(f"{name} 的类型是 {attrs['type']}，不能设为 y")
+        self._satisfy(name, attrs, stack)
+        self._set(name, 'y', reason)
+        for symbol in attrs['selects']:
+            self.enable(symbol, f'被 {name} select', stack + (name,))
+
+    def disable(self, name, reason=None):
+        self._attributes(name)
+        if self.value(name) in (None, 'n'):
+            return
+        self._set(name, 'n', reason)
+        for dependent in self.dependents().get(name, ()):
+            attrs = self.index.attributes(dependent)
+            if attrs and self.value(dependent) in ('y', 'm') and any(not evaluate(e, self.value) for e in attrs['depends']):
+                self.disable(dependent, f'依赖 {name}')
+
+    def dependents(self):
+        """返回 {符号: 依赖它的符号}"""
+        if self._dependents is None:
+            self._dependents = {}
+            for symbol in self.index.symbols:
+                attrs = self.index.attributes(symbol)
+                for expr in attrs['depends'] if attrs else ():
+                    for token in tokenize(expr):
+                        if token not in TRISTATE and re.fullmatch(r'\w+', token):
+                            self._dependents.setdefault(token, set()).add(symbol)
+        return self._dependents
+
+    def assign(self, name, value):
+        """处理一条 SYMBOL=VALUE"""
+        if value == 'y':
+            self.enable(name)
+            return
+        if value == 'm':
+            attrs = self._attributes(name)
+            if attrs and attrs['type'] != 'tristate':
+                raise ConfigError(f"{name} 不是 tristate 类型，不能设为 m")
+            if attrs:
+                self._satisfy(name, attrs, ())
+            self._set(name, 'm', None)
+            return
+        if value == 'n':
+            self.disable(name)
+            return
+
+        attrs = self._attributes(name)
+        kind = attrs['type'] if attrs else None
+        if kind in ('bool', 'tristate'):
+            raise ConfigError(f"{name} 是 {kind} 类型，只能设为 y/n{'/m' if kind == 'tristate' else ''}")
+        if kind == 'int' and not re.fullmatch(r'-?\d+', value):
+            raise ConfigError(f"{name} 是 int 类型，{value} 不是整数")
+        if kind == 'hex' and not re.fullmatch(r'0[xX][0-9a-fA-F]+', value):
+            raise ConfigError(f"{name} 是 hex 类型，{value} 不是十六进制数")
+        if kind == 'string' and not (value.startswith('"') and value.endswith('"')):
+            value = '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+        if attrs:
+            self._satisfy(name, attrs, ())
+        self._set(name, value, None)
+
+    def fill_defaults(self):
+        """为依赖已满足但配置中还没有的符号写入字面默认值"""
+        changed = True
+        while changed:
+            changed = False
+            for symbol in self.index.symbols:
+                if self.value(symbol) is not None:
+                    continue
+                attrs = self.index.attributes(symbol)
+                if not attrs or attrs['type'] is None or attrs['default'] is None:
+                    continue
+                default = attrs['default']
+                if not LITERAL_DEFAULT.match(default):
+                    continue
+                if all(evaluate(expr, self.value) for expr in attrs['depends']):
+                    self._set(symbol, default, '默认值')
+                    changed = True
+
+def parse_assignment(text):
+    name, sep, value = text.partition('=')
+    if not sep or not name:
+        raise ConfigError(f"无效的赋值 {text}，格式应为 SYMBOL=VALUE")
+    return xs_symbols.normalize_symbol(name.strip()), value.strip()
+
+def config_path(sdk_root, target):
+    rel = xs_only.find_target_config(sdk_root, target)
+    if rel is None:
+        raise ConfigError(f"未找到目标 {target} 的配置文件，请先执行一次 xs menuconfig 生成配置")
+    return os.path.join(sdk_root, rel)
+
+def set_symbols(sdk_root, assignments, target=DEFAULT_TARGET, dry_run=False):
+    """按 [(符号, 值)] 修改目标配置，返回修改列表 [(符号, 原值, 新值, 原因)]"""
+    path = config_path(sdk_root, target)
+    index = xs_symbols.load(sdk_root)
+    with xs_fileio.file_lock(path):
+        editor = ConfigEditor(DotConfig(path), index)
+        for name, value in assignments:
+            editor.assign(name, value)
+        editor.fill_defaults()
+        if not dry_run:
+            xs_fileio.write_text(path, editor.config.serialize())
+    return editor.changes
+
+def print_changes(changes, path, dry_run=False):
+    if not changes:
+        print("配置无变化")
+        return
+    print(f"{'将要修改' if dry_run else '已修改'} {path}:")
+    for name, old, new, reason in changes:
+        note = f"  ({reason})" if reason else ''
+        print(f"  CONFIG_{name}: {old if old is not None else '(无)'} -> {new}{note}")
+
+def enable_projects(sdk_root, project_names, target=DEFAULT_TARGET):
+    """create-project --enable: 打开新项目及其用户代码空间的开关"""
+    assignments = [(f'SAMPLE_SUPPORT_{name.upper()}', 'y') for name in project_names]
+    try:
+        changes = set_symbols(sdk_root, assignments, target)
+        print_changes(changes, os.path.relpath(config_path(sdk_root, target), sdk_root))
+    except ConfigError as e:
+        print(f"警告: 未能在配置中打开新项目: {e}")
+        return False
+    return True
+
+def get_symbols(sdk_root, patterns, target=DEFAULT_TARGET):
+    """返回 {符号: 值}，值为 None 表示配置中没有该符号"""
+    config = DotConfig(config_path(sdk_root, target))
+    index = xs_symbols.load(sdk_root)
+    names = dict.fromkeys(config.names() + list(index.symbols))
+    result = {}
+    for pattern in patterns:
+        pattern = xs_symbols.normalize_symbol(pattern)
+        if any(ch in pattern for ch in '*?['):
+            for name in sorted(n for n in names if fnmatch.fnmatchcase(n, pattern)):
+                result[name] = config.get(name)
+        elif pattern in names:
+            result[pattern] = config.get(pattern)
+        else:
+            raise ConfigError(f"未找到配置符号 {pattern}")
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='目标配置读写工具')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    get_parser = subparsers.add_parser('get', help='查看配置符号的值')
+    get_parser.add_argument('symbols', nargs='*', help='符号名或通配符，可带 CONFIG_ 前缀，默认列出示例开关')
+    get_parser.add_argument('--json', action='store_true', help='以 JSON 格式输出')
+
+    set_parser = subparsers.add_parser('set', help='修改配置符号并解析依赖')
+    set_parser.add_argument('assignments', nargs='+', metavar='SYMBOL=VALUE', help='如 SAMPLE_SUPPORT_FOO=y')
+    set_parser.add_argument('--dry-run', action='store_true', help='只显示将要进行的修改')
+
+    for sub in (get_parser, set_parser):
+        sub.add_argument('-t', '--target', default=DEFAULT_TARGET, help=f'编译目标，默认 {DEFAULT_TARGET}')
+
+    args = parser.parse_args(argv)
+    sdk_root = os.path.dirname(find_application_dir())
+
+    try:
+        if args.command == 'get':
+            result = get_symbols(sdk_root, args.symbols or DEFAULT_PATTERNS, args.target)
+            if args.json:
+                print(json.dumps(result, ensure_ascii=False, indent=2))
+                return 0
+            for name, value in result.items():
+                if value is None:
+                    print(f"# CONFIG_{name} 不在配置中")
+                elif value == 'n':
+                    print(f"# CONFIG_{name} is not set")
+                else:
+                    print(f"CONFIG_{name}={value}")
+            return 0
+
+        assignments = [parse_assignment(text) for text in args.assignments]
+        changes = set_symbols(sdk_root, assignments, args.target, args.dry_run)
+        print_changes(changes, os.path.relpath(config_path(sdk_root, args.target), sdk_root), args.dry_run)
+        return 0
+    except ConfigError as e:
+        print(f"错误: {e}")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""xs 常驻服务
+
+在内存中保存 application/samples 的目录索引和各级 Kconfig 中声明的配置符号，
+通过 Unix 域套接字以一行一个 JSON 的协议对外提供查询:
+
+    请求: {"op": "index"}                     返回目录索引树(与 xs_index 相同的结构)
+          {"op": "symbols", "pattern": "*"}   返回匹配的配置符号及其所在文件
+          {"op": "lookup", "names": [...], "osources": [...]}
+                                              返回指定符号的定义位置和 osource 路径的引用位置
+          {"op": "ping"} / {"op": "stop"}
+    响应: {"ok": true, "result": ...} 或 {"ok": false, "error": "..."}
+
+后台线程按固定间隔检查目录和 Kconfig 的 mtime，只重新扫描发生变化的部分。
+服务没有运行时，客户端请求返回 None；各命令通过 query_or_load 查询，服务未运行时回退到直接读取文件系统。
+"""
+import os
+import sys
+import json
+import time
+import socket
+import hashlib
+import argparse
+import tempfile
+import threading
+import subprocess
+import socketserver
+
+from xs_common import find_application_dir
+import xs_index
+import xs_symbols
+
+SOCKET_NAME = '.xs_daemon.sock'
+LOG_NAME = '.xs_daemon.log'
+POLL_INTERVAL = 1.0
+CLIENT_TIMEOUT = 2.0
+
+# AF_UNIX 路径长度有限，SDK 路径过长时改放到临时目录
+MAX_SOCKET_PATH = 100
+
+def socket_path(sdk_root):
+    path = os.path.join(sdk_root, SOCKET_NAME)
+    if len(path) <= MAX_SOCKET_PATH:
+        return path
+    digest = hashlib.sha1(os.path.abspath(sdk_root).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(tempfile.gettempdir(), f'xs-{digest}.sock')
+
+class WorkspaceModel:
+    """常驻内存的工作区模型: 目录索引 + Kconfig 配置符号"""
+
+    def __init__(self, samples_dir):
+        self.samples_dir = samples_dir
+        self.root = None
+        self.symbols = xs_symbols.SymbolIndex(os.path.dirname(os.path.dirname(samples_dir)))
+        self.lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self):
+        """按 mtime 增量刷新目录索引和 Kconfig 符号表"""
+        root = xs_index.scan_tree(self.samples_dir, self.root)
+
+        with self.lock:
+            self.root = root
+            self.symbols.refresh(root)
+
+    def handle(self, request):
+        op = request.get('op')
+        if op == 'ping':
+            return 'pong'
+        if op in ('index', 'symbols', 'lookup'):
+            # 只需 stat 变化检查，保证刚创建或删除的项目立即可见
+            self.refresh()
+        if op == 'index':
+            with self.lock:
+                return self.root
+        if op == 'symbols':
+            with self.lock:
+                return self.symbols.query(request.get('pattern') or '*')
+        if op == 'lookup':
+            with self.lock:
+                return self.symbols.subset(request.get('names') or [], request.get('osources') or [])
+        if op == 'refresh':
+            self.refresh()
+            return True
+        raise ValueError(f"未知的请求: {op}")
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if request.get('op') == 'stop':
+                    response = {'ok': True, 'result': 'stopping'}
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                else:
+                    response = {'ok': True, 'result': self.server.model.handle(request)}
+            except Exception as e:
+                response = {'ok': False, 'error': str(e)}
+            self.wfile.write((json.dumps(response, ensure_ascii=False) + '\n').encode('utf-8'))
+            self.wfile.flush()
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def serve(sdk_root):
+    """在前台运行服务，直到收到 stop 请求"""
+    samples_dir = os.path.join(sdk_root, 'application', 'samples')
+    path = socket_path(sdk_root)
+    if request(sdk_root, 'ping') is not None:
+        print("xs daemon 已在运行")
+        return 1
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+    model = WorkspaceModel(samples_dir)
+    server = _Server(path, _Handler)
+    server.model = model
+    os.chmod(path, 0o600)
+
+    stop = threading.Event()
+
+    def poll():
+        while not stop.wait(POLL_INTERVAL):
+            try:
+                model.refresh()
+            except Exception as e:
+                print(f"刷新工作区模型失败: {e}", file=sys.stderr)
+
+    threading.Thread(target=poll, daemon=True).start()
+    print(f"xs daemon 已启动，监听 {path}", flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        stop.set()
+        server.server_close()
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    return 0
+
+def request(sdk_root, op, timeout=CLIENT_TIMEOUT, **params):
+    """向服务发送请求；服务未运行或出错时返回 None"""
+    path = socket_path(sdk_root)
+    if not os.path.exists(path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(path)
+            sock.sendall((json.dumps(dict(params, op=op)) + '\n').encode('utf-8'))
+            with sock.makefile('rb') as f:
+                line = f.readline()
+    except OSError:
+        return None
+    try:
+        response = json.loads(line)
+    except ValueError:
+        return None
+    return response.get('result') if response.get('ok') else None
+
+def query_or_load(sdk_root, op, **params):
+    """优先向常驻服务查询，服务未运行时直接读取文件系统(按 mtime 增量刷新磁盘上的索引)
+
+    op 为 'index' 时返回目录索引树；'symbols' 时返回匹配 pattern 的 {符号: [文件]}；
+    'lookup' 时返回只包含 names / osources 的符号表，回退时返回完整的 SymbolIndex，二者接口相同。
+    """
+    result = request(sdk_root, op, **params)
+    if op == 'index':
+        return result if result is not None else xs_index.refresh_index(
+            os.path.join(sdk_root, 'application', 'samples'))
+    if op == 'symbols':
+        return result if result is not None else xs_symbols.load(sdk_root).query(params.get('pattern') or '*')
+    if op == 'lookup':
+        if result is not None:
+            return xs_symbols.SymbolTable(result['symbols'], result['osources'])
+        return xs_symbols.load(sdk_root)
+    raise ValueError(f"未知的请求: {op}")
+
+def start(sdk_root):
+    if request(sdk_root, 'ping') is not None:
+        print("xs daemon 已在运行")
+        return 0
+    tools_dir = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(sdk_root, LOG_NAME), 'a', encoding='utf-8') as log:
+        subprocess.Popen([sys.executable, os.path.join(tools_dir, 'xs_daemon.py'), 'start', '--foreground'],
+                         cwd=sdk_root, stdin=subprocess.DEVNULL, stdout=log, stderr=log,
+                         start_new_session=True)
+    for _ in range(50):
+        if request(sdk_root, 'ping') is not None:
+            print(f"xs daemon 已启动 ({socket_path(sdk_root)})")
+            return 0
+        time.sleep(0.1)
+    print(f"错误: xs daemon 启动失败，请查看 {os.path.join(sdk_root, LOG_NAME)}")
+    return 1
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='xs 常驻服务')
+    parser.add_argument('action', choices=('start', 'stop', 'status'), help='启动/停止/查看服务')
+    parser.add_argument('--foreground', action='store_true', help='在前台运行(不脱离终端)')
+
+    args = parser.parse_args(argv)
+
+    sdk_root = os.path.dirname(find_application_dir())
+
+    if args.action == 'start':
+        return serve(sdk_root) if args.foreground else start(sdk_root)
+
+    if args.action == 'stop':
+        if request(sdk_root, 'stop') is None:
+            print("xs daemon 未运行")
+            return 0
+        print("xs daemon 已停止")
+        return 0
+
+    if request(sdk_root, 'ping') is None:
+        print("xs daemon 未运行")
+        return 1
+    print(f"xs daemon 正在运行 ({socket_path(sdk_root)})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
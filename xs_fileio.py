@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""脚手架脚本共用的文件写入层
+
+- 新内容与磁盘上的内容相同时不写入，避免无意义地更新 mtime 导致 build.py 重新配置
+- 先写入同目录下的临时文件再 os.replace，中途崩溃不会留下写了一半的文件
+- 记录本进程真正修改过的文件，供脚本结束时汇总输出
+- 对共享配置文件的读-改-写加跨进程的 fcntl 排他锁，并记录等待时间
+- 复制文件时优先使用 reflink(写时复制)，不支持时退回硬链接或普通复制
+"""
+import os
+import sys
+import stat
+import time
+import fcntl
+import shutil
+import hashlib
+import tempfile
+import contextlib
+
+LOCK_DIR = '.xs_locks'
+
+# linux/fs.h: _IOW(0x94, 9, int)，让目标文件与源文件共享数据块(btrfs/xfs 等支持)
+FICLONE = 0x40049409
+
+# 等待文件锁的超时(秒)，可通过环境变量 XS_LOCK_TIMEOUT 调整
+DEFAULT_LOCK_TIMEOUT = 60
+# 等待超过该时间时提示正在等待哪个进程
+LOCK_WAIT_NOTICE = 0.2
+
+_touched = []
+_lock_waits = []
+_held_locks = {}
+
+def read_bytes(path):
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+def write_text(path, content, mode=None, record=True):
+    """原子地写入文本文件，内容未变化时跳过，返回是否真正写入
+
+    mode 为 None 时沿用原文件的权限位，新文件使用默认权限。
+    """
+    data = content.encode('utf-8')
+    if read_bytes(path) == data:
+        if mode is not None and stat.S_IMODE(os.stat(path).st_mode) != mode:
+            os.chmod(path, mode)
+        return False
+
+    if mode is None:
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.{os.path.basename(path)}.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    if record:
+        _touched.append(os.path.abspath(path))
+    return True
+
+def clone_file(src, dst, allow_link=False):
+    """复制单个文件，返回实际使用的方式: 'reflink'、'hardlink' 或 'copy'
+
+    依次尝试 FICLONE 写时复制、硬链接(仅在 allow_link 时)和普通复制，dst 必须不存在。
+    硬链接与源文件共用同一份数据，原地修改会同时影响两边，只适合只读文件。
+    """
+    with open(src, 'rb') as fsrc:
+        fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            fcntl.ioctl(fd, FICLONE, fsrc.fileno())
+            cloned = True
+        except OSError:
+            cloned = False
+        finally:
+            os.close(fd)
+    if cloned:
+        shutil.copystat(src, dst)
+        return 'reflink'
+
+    os.remove(dst)
+    if allow_link:
+        try:
+            os.link(src, dst)
+            return 'hardlink'
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+    return 'copy'
+
+def touched_files():
+    """返回本进程写入过的文件(按首次写入顺序去重)"""
+    return list(dict.fromkeys(_touched))
+
+def report_touched():
+    files = touched_files()
+    if not files:
+        print("没有文件被修改")
+        return
+    print(f"本次共修改 {len(files)} 个文件:")
+    for path in files:
+        print(f"  - {path}")
+
+def lock_timeout():
+    try:
+        return max(0.0, float(os.environ.get('XS_LOCK_TIMEOUT', DEFAULT_LOCK_TIMEOUT)))
+    except ValueError:
+        return DEFAULT_LOCK_TIMEOUT
+
+@contextlib.contextmanager
+def file_lock(path, timeout=None):
+    """在读取共享配置文件之前加排他锁，写入之后释放
+
+    锁文件按配置文件的真实路径放在 SDK 根目录下的 .xs_locks/ 中，不同文件互不影响；
+    同一进程内对同一文件重复加锁直接复用。超时后输出错误并退出。
+    """
+    key = os.path.realpath(path)
+    if key in _held_locks:
+        yield
+        return
+
+    from xs_common import find_sdk_root
+    lock_dir = os.path.join(find_sdk_root(), LOCK_DIR)
+    os.makedirs(lock_dir, exist_ok=True)
+    lock_path = os.path.join(lock_dir, hashlib.sha1(key.encode('utf-8')).hexdigest()[:16] + '.lock')
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o666)
+    try:
+        waited = _acquire(fd, path, lock_timeout() if timeout is None else timeout)
+        _lock_waits.append((key, waited))
+        # 记录持有者，方便其他进程等待时提示
+        os.ftruncate(fd, 0)
+        os.pwrite(fd, f'{os.getpid()}\n'.encode('ascii'), 0)
+        _held_locks[key] = fd
+        try:
+            yield
+        finally:
+            del _held_locks[key]
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+def _acquire(fd, path, timeout):
+    """轮询获取锁，返回等待的秒数"""
+    start = time.perf_counter()
+    delay = 0.005
+    noticed = False
+    while True:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return time.perf_counter() - start
+        except BlockingIOError:
+            pass
+        waited = time.perf_counter() - start
+        if waited >= timeout:
+            print(f"错误: 等待 {path} 的文件锁超时 ({timeout:g} 秒)，可能有其他 xs 命令正在修改该文件!")
+            sys.exit(1)
+        if not noticed and waited >= LOCK_WAIT_NOTICE:
+            holder = os.pread(fd, 32, 0).decode('ascii', 'replace').strip() or '?'
+            print(f"正在等待进程 {holder} 释放 {path} 的文件锁...")
+            noticed = True
+        time.sleep(min(delay, max(0.0, timeout - waited)))
+        delay = min(delay * 2, 0.1)
+
+def lock_waits():
+    """返回本进程每次加锁的 (文件, 等待秒数)"""
+    return list(_lock_waits)
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""xs 命令的帮助信息"""
+
+BRIEF_HELP = '''\
+=====================================================================
+xs 命令索引
+=====================================================================
+xs -h                                         【帮助】
+xs --help                                     【详细帮助】
+xs b                                          【可选择式增量编译指令】
+xs b -c                                       【可选择式全量编译指令】
+xs menu                                       【可选择式启动目标的menuconfig图形配置界面】
+xs build                                      【启动 ws63-liteos-app 目标的增量编译指令】
+xs build -c                                   【启动 ws63-liteos-app 目标的全量编译指令】
+xs build --force                              【忽略编译清单，强制编译 ws63-liteos-app】
+xs b <目标> [-c] [--force]                    【编译指定目标，输入未变化时跳过】
+xs build --profile                            【编译并按阶段统计耗时】
+xs b --targets t1,t2,... [-j N] [--parallel N]【并行编译多个目标】
+xs build --only <空间>/<项目>                 【按最小配置只编译指定项目】
+xs b --matrix <矩阵文件>                      【按多组配置变体并行编译并比较镜像大小】
+xs build --fail-fast                          【遇到第一个编译错误即中止并输出摘要】
+xs watch [<空间>/<项目>] [--only] [--queue]   【监视源码修改并自动增量编译】
+xs stats [目标] [--last N] [--json]           【查看编译耗时统计】
+xs cache stats|prune                          【查看/淘汰固件产物缓存】
+xs menuconfig                                 【启动 ws63-liteos-app 目标的menuconfig图形配置界面】
+xs config get|set [<符号>[=<值>] ...]          【不打开 menuconfig 直接读写配置】
+xs make-user-space                            【创建默认用户代码空间】
+xs make-user-space <用户代码空间名>           【创建自定义名称用户代码空间】
+xs create-project <项目名>                    【在默认用户代码空间创建项目】
+xs create-project <项目名> -p <用户代码空间名>【在指定用户代码空间创建项目】
+xs create-project <项目名1> <项目名2> ...     【批量创建项目】
+xs create-project -m <清单文件>               【按 JSON/YAML 清单批量创建项目】
+xs create-project <项目名> --enable           【创建项目并在配置中直接打开】
+xs clone-project <源项目> <新项目> [-p 空间]  【以已有项目为模板复制新项目】
+xs move-project <项目名> ... --to <空间>      【把项目移动到另一个用户代码空间】
+xs clean-user-space <用户代码空间名>          【删除指定用户代码空间】
+xs clean-user-space <用户代码空间名> -f       【强制删除指定用户代码空间】
+xs clean-project <项目名>                     【删除默认用户代码空间的项目】
+xs clean-project <项目名> -p <用户代码空间名> 【删除指定用户代码空间的项目】
+xs clean-project <项目名/通配符> ... [-y]     【批量删除项目】
+xs trash [--purge [条目...] | --restore <条目>]【查看/清空/恢复回收站】
+xs find all                                   【查找所有项目】
+xs find <代码空间>                            【查找指定代码空间的项目】
+xs daemon start|stop|status                   【启动/停止/查看常驻服务】
+xs symbols [<符号/通配符>] [--conflicts]      【查询 Kconfig 配置符号及重复定义】
+xs find all [--depth 1|2] [--name <通配符>] [--json] [--limit N] [--no-index]  【按条件查找项目】
+xs find all --stats [--sort lines|bytes|mtime|...]  【统计项目文件数、代码行数和大小】
+=====================================================================
+'''
+
+DETAILED_HELP = '''\
+=====================================================================
+ xs 命令帮助文档
+=====================================================================
+xs 是一个便捷的命令行工具，用于简化开发过程中的常见操作，如用户代码空间管理、项目创建与删除、编译和配置等。
+
+使用方法:
+  xs [子命令] [选项]
+
+子命令列表:
+  make-user-space    创建用户代码空间
+  create-project     创建项目
+  clean-user-space   删除用户代码空间
+  clean-project      删除项目
+  b                  可选择式编译
+  build              启动 ws63-liteos-app 目标编译
+  menu               可选择式启动目标的 menuconfig 图形配置界面
+  menuconfig         启动 ws63-liteos-app 目标的 menuconfig 图形配置界面
+  -h                 显示简要帮助信息
+  --help             显示此详细帮助信息
+
+子命令详细说明及示例:
+
+### 用户代码空间管理
+#### 创建默认用户代码空间
+  描述: 创建名为 user_project 的默认用户代码空间。
+  命令: xs make-user-space
+  示例: xs make-user-space
+
+#### 创建自定义名称用户代码空间
+  描述: 创建一个指定名称的用户代码空间。
+  命令: xs make-user-space <用户代码空间名>
+  示例: xs make-user-space TEST001
+
+#### 删除指定用户代码空间
+  描述: 删除指定名称的用户代码空间。
+  命令: xs clean-user-space <用户代码空间名>
+  示例: xs clean-user-space TEST001
+
+#### 强制删除指定用户代码空间
+  描述: 强制删除指定名称的用户代码空间，忽略可能的错误提示。
+  命令: xs clean-user-space <用户代码空间名> -f
+  示例: xs clean-user-space TEST001 -f
+
+### 项目管理
+#### 在默认用户代码空间创建项目
+  描述: 在默认的 user_project 代码空间中创建一个项目。
+  命令: xs create-project <项目名>
+  示例: xs create-project T_001
+
+#### 在指定用户代码空间创建项目
+  描述: 在指定名称的用户代码空间中创建一个项目。
+  命令: xs create-project <项目名> -p <用户代码空间名>
+  示例: xs create-project T_001 -p TEST001
+
+#### 批量创建项目
+  描述: 一次创建多个项目，所有检查在修改任何文件前完成，共享的 CMakeLists.txt 和 Kconfig 只写入一次。
+  命令: xs create-project <项目名1> <项目名2> ... [-p <用户代码空间名>]
+  示例: xs create-project T_001 T_002 T_003 -p TEST001
+
+#### 按清单批量创建项目
+  描述: 从 JSON/YAML 清单读取项目列表，可为每个项目单独指定用户代码空间。
+  命令: xs create-project -m <清单文件>
+  示例: xs create-project -m projects.json
+
+#### 复制项目
+  描述: 以已有项目为模板创建新项目。文件优先用 reflink(写时复制)复制，文件系统不支持时只读文件使用硬链接、
+        其余文件普通复制，大体积资源不会逐字节复制。源码、Kconfig 和 CMakeLists.txt 中的项目名标识符
+        (CONFIG_<项目>、<项目>_TASK_PRIO、<项目小写>_test_task 等)和文件名中的项目名替换为新项目名，
+        新项目登记到用户代码空间的 Kconfig 和 CMakeLists.txt。
+  命令: xs clone-project <源项目名> <新项目名> [-p <用户代码空间名>]
+  示例: xs clone-project T_001 T_002 -p TEST001
+
+#### 移动项目
+  描述: 把项目移动到另一个用户代码空间。项目目录通过一次重命名整体移动，耗时与项目大小无关；
+        项目在两个用户代码空间 Kconfig / CMakeLists.txt 中的配置段随之移动，并改写其中的
+        depends on ENABLE_<空间>_SAMPLE 和 osource 路径。四个文件在文件锁内一起修改，任何一步失败都会全部恢复。
+        配置符号名不变，目标配置中已打开的项目保持打开。
+  命令: xs move-project <项目名> ... --to <目标用户代码空间名> [-p <源用户代码空间名>]
+  示例: xs move-project T_001 T_002 --to TEST002 -p TEST001
+
+#### 删除默认用户代码空间的项目
+  描述: 删除默认的 user_project 代码空间中的指定项目。
+  命令: xs clean-project <项目名>
+  示例: xs clean-project T_001
+
+#### 删除指定用户代码空间的项目
+  描述: 删除指定名称的用户代码空间中的指定项目。
+  命令: xs clean-project <项目名> -p <用户代码空间名>
+  示例: xs clean-project T_001 -p TEST001
+
+#### 批量删除项目
+  描述: 一次删除多个项目或匹配通配符的项目，只确认一次(-y 跳过确认)，
+        Kconfig 和 CMakeLists.txt 各只重写一次，项目目录在线程池中并行删除。
+  命令: xs clean-project <项目名/通配符> ... [-p <用户代码空间名>] [-y] [-j 线程数]
+  示例: xs clean-project 'T_*' -p TEST001 -y
+
+#### 回收站
+  描述: clean-project / clean-user-space 只把目录原子地移入 SDK 根目录下的 .xs_trash/ 并立即返回，
+        后台进程在保留期(默认 600 秒，可用环境变量 XS_TRASH_GRACE 调整)后删除，同时最多删除 2 个条目。
+        保留期内可以恢复误删的项目或用户代码空间，恢复时会重新注册到 Kconfig 和 CMakeLists.txt。
+  命令: xs trash / xs trash --purge [条目...] / xs trash --restore <条目>
+  示例: xs trash --restore 20250101-120000-1234-project-user_project-T_001
+
+#### 并发执行
+  描述: 创建/删除命令在读写 samples 和各用户代码空间的 Kconfig、CMakeLists.txt 前对该文件加 fcntl 排他锁
+        (锁文件位于 SDK 根目录下的 .xs_locks/)，多个 xs 命令可以在同一个 SDK 中同时执行而不会互相覆盖；
+        操作不同用户代码空间的项目时互不等待。等待超过 0.2 秒时提示持有锁的进程，
+        超过 XS_LOCK_TIMEOUT 秒(默认 60)后报错退出。XS_TIMINGS=1 时输出加锁次数和等待时间。
+  示例: XS_LOCK_TIMEOUT=10 xs create-project T_001 -p TEST001
+
+### 编译与配置
+#### 可选择式增量编译
+  描述: 进行可选择式的增量编译。
+  命令: xs b
+  示例: xs b
+
+#### 可选择式全量编译
+  描述: 进行可选择式的全量编译。
+  命令: xs b -c
+  示例: xs b -c
+
+#### 启动 ws63-liteos-app 目标的增量编译
+  描述: 启动 ws63-liteos-app 目标的增量编译。
+  命令: xs build
+  示例: xs build
+
+#### 启动 ws63-liteos-app 目标的全量编译
+  描述: 启动 ws63-liteos-app 目标的全量编译。
+  命令: xs build -c
+  示例: xs build -c
+
+#### 跳过无变化的编译
+  描述: xs build 和 xs b <目标> 会对 application/samples、.config 和编译脚本计算内容哈希，
+        与上一次成功编译时一致则直接提示已是最新。清单只对 mtime 或大小变化的文件重新哈希。
+  命令: xs build --force 或 xs b <目标> --force 跳过检查强制编译
+  示例: xs b ws63-liteos-app --force
+
+#### 编译耗时记录与统计
+  描述: 每次 xs b / xs build 都会记录耗时、退出码、目标、全量/增量模式和 Kconfig 哈希。
+        加 --profile 时按 build.py 输出划分 configure/compile/link/package 阶段。
+        xs stats 按目标输出 p50/p90/p95、趋势和性能退化提示。
+  命令: xs build --profile / xs stats [目标] [--last N] [--json]
+  示例: xs stats ws63-liteos-app --last 50
+
+#### 并行编译多个目标
+  描述: 同时编译多个目标，按作业槽位在各目标之间平分 CPU，输出按目标加前缀，
+        每个目标在 output/xs_multi/<目标>/ 下独立的影子目录(与 --only 相同)中编译，镜像在其中的 output/ 下，
+        日志为其中的 build.log，各目标的 output/ 和配置互不覆盖。最后输出成功/失败和耗时汇总表。
+  命令: xs b --targets <目标1>,<目标2>,... [-c] [-j 总槽位数] [--parallel 同时编译数]
+  示例: xs b --targets ws63-liteos-app,ws63-liteos-app-iot -j 32
+
+#### 只编译单个项目
+  描述: 在 output/xs_only/<空间>_<项目>/ 下建立 SDK 的影子目录(顶层条目为符号链接)，
+        由主配置派生只打开该项目的 ENABLE_<空间>_SAMPLE 和 SAMPLE_SUPPORT_<项目> 的配置，
+        在影子目录中编译，只编译正在开发的项目。主配置和主 output/ 不会被改动。
+  命令: xs build --only <空间>/<项目> / xs b <目标> --only <空间>/<项目> [-c] [--force]
+  示例: xs build --only user_project/T_001
+
+#### 按配置矩阵编译
+  描述: 按 YAML/JSON 矩阵文件中的每个配置变体各编译一次，变体之间并行，最后输出结果、耗时和镜像大小表。
+        每个变体在 output/xs_matrix/<变体>/ 下拥有独立的影子目录，配置由主配置依次应用 only、base 和变体自身的
+        符号覆盖得到(按 xs config set 的规则补全依赖)，主配置和主 output/ 不会被改动。变体输入未变化时跳过。
+  命令: xs build --matrix <矩阵文件> [-c] [--force] [--fail-fast] / xs b <目标> --matrix <矩阵文件> [-j N] [--parallel N]
+  示例: xs b --matrix matrix.yaml -j 32
+        matrix.yaml:
+          only: user_project/T_001
+          variants:
+            default: {}
+            big: {T_001: 100}
+            disabled: {SAMPLE_SUPPORT_T_001: n}
+
+#### 编译输出分析
+  描述: xs build / xs b <目标> 逐行分析 build.py 的输出，识别编译器错误、警告、链接失败和 CMake 错误。
+        只保留固定大小的环形缓冲和按文件的警告计数，编译失败时输出首个错误的上下文和带 file:line 的错误列表。
+        --fail-fast 在第一个错误出现时立即中止编译(连同 cmake/ninja 子进程)，--raw 关闭分析直接输出。
+  命令: xs build [--fail-fast | --raw] / xs b <目标> [--fail-fast | --raw] / xs b --targets ... [--fail-fast]
+  示例: xs build -c --fail-fast
+
+#### 修改后自动编译
+  描述: 监视示例目录和目标配置文件，保存后自动执行 xs b <目标>。优先使用 inotify，不可用时按 mtime 轮询(--poll 强制轮询)。
+        一连串保存在静默 0.3 秒(--debounce)后合并为一次增量编译；编译期间又有修改时取消当前编译并重新开始，
+        --queue 时等当前编译结束后再编译一次。指定 <空间>/<项目> 时只监视该项目，加 --only 按最小配置只编译该项目。
+  命令: xs watch [<空间>/<项目>] [-t <目标>] [--only] [--queue] [--debounce 秒] [--poll] [--fail-fast]
+  示例: xs watch user_project/T_001 --only
+
+#### 产物缓存
+  描述: xs build / xs b <目标> 编译成功后把 output/ 下该目标的镜像(.fwpkg/.bin/.elf/.hex)按内容哈希存入本地缓存，
+        键由编译输入(application/samples、.config、编译脚本)和工具链版本决定。相同输入再次编译时直接恢复镜像。
+        缓存默认位于 ~/.cache/xs_tools/artifacts(XS_CACHE_DIR)，超过上限(XS_CACHE_MAX_SIZE，默认 2G)时按最近使用淘汰。
+        -c 和 --force 不查找缓存，--no-cache 完全不使用缓存。
+  命令: xs cache stats / xs cache prune [--max-size <大小>] [--all] / xs build --no-cache
+  示例: xs cache prune --max-size 500M
+
+#### 可选择式启动目标的 menuconfig 图形配置界面
+  描述: 启动可选择式目标的 menuconfig 图形配置界面。
+  命令: xs menu
+  示例: xs menu
+
+#### 启动 ws63-liteos-app 目标的 menuconfig 图形配置界面
+  描述: 启动 ws63-liteos-app 目标的 menuconfig 图形配置界面。
+  命令: xs menuconfig
+  示例: xs menuconfig
+
+#### 命令行修改配置
+  描述: 不打开 menuconfig 直接读取/修改目标配置文件(build/config/target_config/.../<目标>.config)。
+        符号的类型、依赖和默认值来自 xs symbols 的增量索引；打开符号时自动打开 depends on 中的符号，
+        关闭时一并关闭依赖它的符号，新出现的符号按默认值写入。create-project --enable 创建后直接打开新项目。
+  命令: xs config get [<符号/通配符> ...] [--json] / xs config set <符号>=<值> ... [--dry-run] [-t <目标>]
+  示例: xs config set SAMPLE_SUPPORT_LED=y / xs create-project LED --enable
+
+### 项目查找
+#### 查找所有项目
+  描述: 查找所有存在的项目。
+  命令: xs find all
+  示例: xs find all
+
+#### 查找指定代码空间的项目
+  描述: 查找指定代码空间中的项目。
+  命令: xs find <代码空间>
+  示例: xs find TEST001
+
+#### 查找选项
+  --depth 1|2       1 只列出用户代码空间，2 同时列出项目(默认)
+  --name <通配符>   按名称过滤，例如 --name 'T_*'
+  --json            以 JSON Lines 格式逐行输出
+  --limit N         最多输出 N 条，达到后立即停止遍历
+  --no-index        不使用索引，直接并行遍历目录树
+  示例: xs find all --name 'T_*' --json --limit 20
+
+#### 项目规模统计
+  描述: --stats 输出每个项目和用户代码空间的文件数、C 代码行数(.c/.h)、大小和最近修改时间。
+        每个源文件的行数按 (路径, mtime, size) 缓存在 SDK 根目录下的 .xs_stats.json 中，只重新读取变化的文件。
+        --sort 按 files/lines/bytes/mtime 从大到小(从新到旧)排序，--limit N 只输出前 N 个项目，--json 逐行输出。
+  命令: xs find all|<代码空间> --stats [--sort name|files|lines|bytes|mtime] [--limit N] [--json] [--depth 1]
+  示例: xs find all --stats --sort lines --limit 10
+
+#### 配置符号查询
+  描述: 全局索引 application/samples 下各级 Kconfig(沿 osource 引用)中定义的配置符号，
+        按 mtime 增量更新并缓存到 SDK 根目录下的 .xs_symbols.json。符号名可带 CONFIG_ 前缀，支持通配符。
+        create-project / make-user-space 在写入前用它检查符号冲突，clean-* 提示清理后仍保留的定义，
+        xs find all 在列表末尾报告重复定义的符号。
+  命令: xs symbols [<符号/通配符>] [--conflicts] [--json]
+  示例: xs symbols 'SAMPLE_SUPPORT_*' --conflicts
+
+### 常驻服务
+#### 启动/停止常驻服务
+  描述: 常驻服务在内存中保存用户代码空间、项目和 Kconfig 配置符号，通过 Unix 域套接字提供查询，
+        按 mtime 轮询感知文件变化。服务运行时 xs find / symbols 以及 create-project、clean-project、
+        make-user-space、clean-user-space、build --only 的符号检查直接使用其结果，未运行时自动回退到直接扫描。
+  命令: xs daemon start|stop|status
+  示例: xs daemon start
+
+=====================================================================
+'''
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""编译耗时历史记录与统计
+
+每次编译向 SDK 根目录下的 .xs_build_history.jsonl 追加一行记录，
+xs stats 读取该文件按目标输出分位数、趋势和性能退化提示。
+"""
+import os
+import re
+import json
+import time
+import hashlib
+import statistics
+
+from xs_common import pad
+
+HISTORY_FILE = '.xs_build_history.jsonl'
+
+# build.py 输出中用于划分编译阶段的标记，按出现顺序切换阶段。
+# 标记只匹配 CMake 状态行、ninja 进度行和打包步骤的行首，编译器诊断(如 -Wsign-compare)
+# 或提到 CMake 的普通输出不会让阶段提前切换
+PHASE_MARKERS = (
+    ('configure', re.compile(r'^-- (The C compiler identification|Configuring|Generating done|Detecting|'
+                             r'Build files have been written)|^\s*(\S*/)?cmake\s+-')),
+    ('compile', re.compile(r'^\[\d+/\d+\] (Building|Compiling)|^\s*Building C(XX)? object')),
+    ('link', re.compile(r'^\[\d+/\d+\] Linking|^\s*Linking C(XX)? (executable|static library)')),
+    ('package', re.compile(r'^\s*(\[\d+/\d+\] )?(Generat(e|ing)|Pack(ing|aging)|Creat(e|ing)|Sign(ing)?)\b.*'
+                           r'(\.fwpkg\b|\bimages?\b|\bpacket\b)|\b(fwpkg|packet)\w*\.py\b', re.I)),
+)
+
+# 最近一段记录的中位数比之前高出该比例时视为退化
+REGRESSION_RATIO = 1.2
+TREND_WINDOW = 5
+
+class PhaseTracker:
+    """按输出中的标记记录各阶段耗时，供 run_build_py 逐行调用"""
+
+    def __init__(self):
+        self.phases = {}
+        self.current = 'setup'
+        self.started = time.perf_counter()
+
+    def __call__(self, line):
+        for name, pattern in PHASE_MARKERS:
+            if name != self.current and pattern.search(line):
+                # 阶段只允许向后切换，避免编译过程中的零散输出来回跳转
+                order = [p for p, _ in PHASE_MARKERS]
+                if self.current in order and order.index(name) < order.index(self.current):
+                    continue
+                self._switch(name)
+                break
+
+    def _switch(self, name):
+        now = time.perf_counter()
+        self.phases[self.current] = self.phases.get(self.current, 0.0) + now - self.started
+        self.current = name
+        self.started = now
+
+    def finish(self):
+        self._switch(self.current)
+        return {name: round(seconds, 3) for name, seconds in self.phases.items() if seconds > 0}
+
+def history_path(sdk_root):
+    return os.path.join(sdk_root, HISTORY_FILE)
+
+def kconfig_hash(files):
+    """根据编译清单的文件表计算 Kconfig/.config 的整体哈希"""
+    h = hashlib.sha1()
+    for rel in sorted(files):
+        name = os.path.basename(rel)
+        if name == 'Kconfig' or name.endswith('.config'):
+            h.update(f'{rel}\0{files[rel][2]}\n'.encode('utf-8'))
+    return h.hexdigest()[:12]
+
+def append_record(sdk_root, record):
+    try:
+        with open(history_path(sdk_root), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    except OSError:
+        pass
+
+def load_records(sdk_root, target=None):
+    records = []
+    try:
+        with open(history_path(sdk_root), 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if target is None or record.get('target') == target:
+                    records.append(record)
+    except OSError:
+        pass
+    return records
+
+def percentile(values, pct):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    k = (len(values) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+def summarize(records):
+    """按 (目标, 模式) 汇总成功编译的耗时"""
+    groups = {}
+    for record in records:
+        key = (record.get('target') or '(交互选择)', record.get('mode', 'incremental'))
+        groups.setdefault(key, []).append(record)
+
+    summary = []
+    for (target, mode), items in sorted(groups.items()):
+        ok = [r['wall'] for r in items if r.get('exit_code') == 0 and r.get('status', 'built') == 'built']
+        entry = {
+            'target': target,
+            'mode': mode,
+            'runs': len(items),
+            'failures': sum(1 for r in items if r.get('exit_code') != 0),
+            'skipped': sum(1 for r in items if r.get('status') in ('up-to-date', 'cached')),
+            'p50': round(percentile(ok, 50), 3),
+            'p90': round(percentile(ok, 90), 3),
+            'p95': round(percentile(ok, 95), 3),
+            'last': ok[-1] if ok else None,
+            'trend': None,
+            'regression': False,
+        }
+        if len(ok) >= TREND_WINDOW * 2:
+            recent = statistics.median(ok[-TREND_WINDOW:])
+            before = statistics.median(ok[-TREND_WINDOW * 2:-TREND_WINDOW])
+            entry['trend'] = round((recent - before) / before * 100, 1) if before else None
+            entry['regression'] = before > 0 and recent > before * REGRESSION_RATIO
+
+        phases = {}
+        for r in items:
+            for name, seconds in (r.get('phases') or {}).items():
+                phases.setdefault(name, []).append(seconds)
+        entry['phases'] = {name: round(statistics.median(v), 3) for name, v in phases.items()}
+        summary.append(entry)
+    return summary
+
+def print_summary(summary):
+    if not summary:
+        print("没有编译记录")
+        return
+    print(pad('目标', 24) + pad('模式', 13) + ''.join(pad(h, 10, True) for h in
+          ('次数', '失败', '跳过', 'p50(s)', 'p90(s)', 'p95(s)', '趋势')))
+    for e in summary:
+        trend = f"{e['trend']:+.1f}%" if e['trend'] is not None else '-'
+        print(pad(e['target'], 24) + pad(e['mode'], 13) + ''.join(pad(v, 10, True) for v in
+              (e['runs'], e['failures'], e['skipped'], f"{e['p50']:.1f}", f"{e['p90']:.1f}", f"{e['p95']:.1f}", trend)))
+        if e['phases']:
+            print("    阶段中位数: " + ', '.join(f"{name} {seconds:.1f}s" for name, seconds in e['phases'].items()))
+        if e['regression']:
+            print(f"    警告: 最近 {TREND_WINDOW} 次编译的中位耗时比之前高出 {e['trend']:.1f}%，可能存在性能退化!")
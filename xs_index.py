@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""application/samples 的持久化索引
+
+索引保存在 SDK 根目录下的 .xs_index.json 中，记录每个用户代码空间和项目目录
+以及扫描时看到的目录 mtime。再次查询时只重新列出 mtime 发生变化的目录，
+其余目录直接复用上次的结果。
+"""
+import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import xs_fileio
+import xs_walk
+
+INDEX_FILE = '.xs_index.json'
+INDEX_VERSION = 1
+
+# 供 shell 补全读取的纯文本缓存，每行 "键<TAB>以空格分隔的名称":
+#   :spaces   所有用户代码空间
+#   <空间>    该用户代码空间下的项目
+#   :symbols  ENABLE_<空间>_SAMPLE 和 SAMPLE_SUPPORT_<项目>(最长的一行放在最后)
+COMPLETION_FILE = '.xs_completion'
+
+# mtime 距扫描时刻太近时，同一时间粒度内的后续修改可能无法被察觉，
+# 这类目录不记录 mtime，下次查询时强制重新扫描
+RACY_WINDOW_NS = 2 * 1000 * 1000 * 1000
+
+# 目录深度: 0 = samples, 1 = 用户代码空间, 2 = 项目
+SCAN_DEPTH = 2
+
+def index_path(samples_dir):
+    sdk_root = os.path.dirname(os.path.dirname(os.path.abspath(samples_dir)))
+    return os.path.join(sdk_root, INDEX_FILE)
+
+def completion_path(samples_dir):
+    return os.path.join(os.path.dirname(index_path(samples_dir)), COMPLETION_FILE)
+
+def load_index(samples_dir):
+    """读取索引文件，文件不存在或已损坏时返回空索引"""
+    try:
+        with open(index_path(samples_dir), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('version') != INDEX_VERSION:
+        return None
+    return data.get('root')
+
+def save_index(samples_dir, root):
+    content = json.dumps({'version': INDEX_VERSION, 'root': root}, separators=(',', ':'))
+    try:
+        xs_fileio.write_text(index_path(samples_dir), content, record=False)
+    except OSError:
+        # 索引只是缓存，SDK 目录不可写时直接放弃
+        pass
+
+def save_completion(samples_dir, root):
+    """由索引树生成补全缓存，内容未变化时不写入"""
+    spaces = {name: [p for p, child in node.get('children', {}).items() if child['ok']]
+              for name, node in root['children'].items() if node['ok']}
+    symbols = ['SAMPLE_ENABLE'] + [f'ENABLE_{space.upper()}_SAMPLE' for space in spaces]
+    symbols += [f'SAMPLE_SUPPORT_{project.upper()}' for projects in spaces.values() for project in projects]
+    lines = [f":spaces\t{' '.join(spaces)}"]
+    lines += [f"{space}\t{' '.join(projects)}" for space, projects in spaces.items()]
+    lines.append(f":symbols\t{' '.join(symbols)}")
+    try:
+        xs_fileio.write_text(completion_path(samples_dir), '\n'.join(lines) + '\n', record=False)
+    except OSError:
+        pass
+
+def _scan_node(path, cached, depth, scan_start_ns, stats, executor=None):
+    """扫描一个目录节点，mtime 未变化时复用缓存的子目录列表"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+
+    if cached is not None and cached.get('mtime') == st.st_mtime_ns:
+        is_project = cached['ok']
+        subdirs = cached.get('children', {}).keys() if depth > 0 else ()
+        cached_children = cached.get('children', {})
+    else:
+        stats['rescanned'] += 1
+        try:
+            is_project, subdirs = xs_walk.scan_dir(path, want_subdirs=depth > 0)
+        except OSError:
+            return None
+        cached_children = (cached or {}).get('children', {})
+
+    node = {
+        'mtime': st.st_mtime_ns if st.st_mtime_ns < scan_start_ns - RACY_WINDOW_NS else None,
+        'ok': is_project,
+    }
+    if depth > 0:
+        names = sorted(subdirs)
+
+        def scan_child(name):
+            return _scan_node(os.path.join(path, name), cached_children.get(name),
+                              depth - 1, scan_start_ns, stats)
+
+        # 各用户代码空间之间相互独立，交给线程池并行重新验证
+        if executor is not None and depth == SCAN_DEPTH and len(names) > 1:
+            results = executor.map(scan_child, names)
+        else:
+            results = map(scan_child, names)
+        node['children'] = {name: child for name, child in zip(names, results) if child is not None}
+    return node
+
+def scan_tree(samples_dir, cached=None):
+    """以 cached 为基础按 mtime 增量扫描 samples 目录，返回新的索引树"""
+    stats = {'rescanned': 0}
+    with ThreadPoolExecutor(max_workers=xs_walk.default_jobs()) as executor:
+        root = _scan_node(samples_dir, cached, SCAN_DEPTH, time.time_ns(), stats, executor)
+    if root is None:
+        return {'ok': False, 'children': {}}
+    return root
+
+def refresh_index(samples_dir):
+    """按 mtime 增量刷新索引并写回磁盘，返回最新的索引树"""
+    cached = load_index(samples_dir)
+    root = scan_tree(samples_dir, cached)
+    if root != cached:
+        save_index(samples_dir, root)
+        save_completion(samples_dir, root)
+    elif not os.path.exists(completion_path(samples_dir)):
+        save_completion(samples_dir, root)
+    return root
+
+def get_user_code_spaces(samples_dir, root=None):
+    """从索引获取所有用户代码空间"""
+    if root is None:
+        root = refresh_index(samples_dir)
+    return [name for name, node in root['children'].items() if node['ok']]
+
+def get_projects_in_user_space(samples_dir, user_space, root=None):
+    """从索引获取指定用户代码空间下的所有项目，用户代码空间不存在时返回 None"""
+    if root is None:
+        root = refresh_index(samples_dir)
+    space = root['children'].get(user_space)
+    if space is None:
+        return None
+    return [name for name, node in space['children'].items() if node['ok']]
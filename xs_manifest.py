@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""编译输入的内容哈希清单
+
+清单保存在 SDK 根目录下的 .xs_build_manifest.json 中，记录每个输入文件的
+(mtime, size, hash) 以及每个编译目标上一次成功编译时的整体摘要。
+重新计算摘要时只对 mtime 或大小发生变化的文件重新读取内容。
+"""
+import os
+import json
+import hashlib
+
+import xs_fileio
+
+MANIFEST_FILE = '.xs_build_manifest.json'
+MANIFEST_VERSION = 1
+
+# 参与比较的编译输入(相对 SDK 根目录)，不存在的路径会被忽略
+DEFAULT_INPUTS = (
+    'application/samples',
+    'build.py',
+    'build/config',
+    'build/script',
+    '.config',
+)
+
+SKIP_DIRS = {'__pycache__', '.git'}
+
+def iter_input_files(sdk_root, inputs=DEFAULT_INPUTS):
+    """按路径顺序产出 (相对路径, stat 结果)"""
+    for rel in inputs:
+        path = os.path.join(sdk_root, rel)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        if os.path.isdir(path):
+            yield from _walk(sdk_root, path)
+        else:
+            yield rel, st
+
+def _walk(sdk_root, path):
+    try:
+        with os.scandir(path) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+        return
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name not in SKIP_DIRS:
+                yield from _walk(sdk_root, entry.path)
+        elif entry.is_file():
+            yield os.path.relpath(entry.path, sdk_root), entry.stat()
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+class BuildManifest:
+
+    def __init__(self, sdk_root):
+        self.sdk_root = sdk_root
+        self.path = os.path.join(sdk_root, MANIFEST_FILE)
+        self.files = {}
+        self.targets = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                self.files = data.get('files', {})
+                self.targets = data.get('targets', {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def snapshot(self, inputs=DEFAULT_INPUTS):
+        """计算当前编译输入的摘要，返回 (摘要, 文件表, 重新哈希的文件数)"""
+        files = {}
+        rehashed = 0
+        digest = hashlib.sha1()
+        for rel, st in iter_input_files(self.sdk_root, inputs):
+            cached = self.files.get(rel)
+            if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                h = cached[2]
+            else:
+                try:
+                    h = file_hash(os.path.join(self.sdk_root, rel))
+                except OSError:
+                    continue
+                rehashed += 1
+            files[rel] = [st.st_mtime_ns, st.st_size, h]
+            digest.update(f'{rel}\0{h}\n'.encode('utf-8'))
+        return digest.hexdigest(), files, rehashed
+
+    def is_up_to_date(self, key, digest):
+        return self.targets.get(key) == digest
+
+    def record(self, key, digest, files):
+        """记录一次成功编译并写回清单"""
+        self.files = files
+        self.targets[key] = digest
+        self.save()
+
+    def invalidate(self, key):
+        if self.targets.pop(key, None) is not None:
+            self.save()
+
+    def save(self):
+        content = json.dumps({'version': MANIFEST_VERSION, 'files': self.files, 'targets': self.targets},
+                             separators=(',', ':'))
+        try:
+            xs_fileio.write_text(self.path, content, record=False)
+        except OSError:
+            pass
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""xs build --matrix: 按多组配置变体编译
+
+矩阵文件(YAML/JSON)示例:
+
+    target: ws63-liteos-app          # 可选，默认使用命令行中的目标
+    only: user_project/T_001         # 可选，先按 xs build --only 派生最小配置
+    base:                            # 可选，所有变体共用的符号覆盖
+      SAMPLE_SUPPORT_T_001: y
+    variants:
+      default: {}
+      big: {T_001: 100}
+      off: {SAMPLE_SUPPORT_T_001: n}
+
+每个变体在 output/xs_matrix/<变体>/ 下拥有独立的影子目录(与 --only 相同的符号链接结构)和 output/，
+配置由主配置依次应用 only、base 和变体自身的覆盖得到，覆盖按 xs config set 的规则解析依赖。
+"""
+import os
+import re
+import sys
+import json
+import hashlib
+
+import xs_config
+import xs_cache
+import xs_fileio
+import xs_only
+import xs_symbols
+
+MATRIX_OUTPUT_DIR = os.path.join('output', 'xs_matrix')
+
+VARIANT_NAME = re.compile(r'^[A-Za-z0-9_.-]+$')
+
+def _value(value):
+    """YAML/JSON 中的 true/false/数字转换为 .config 中的写法"""
+    if value is True:
+        return 'y'
+    if value is False:
+        return 'n'
+    return str(value)
+
+def _overrides(data, where):
+    if data is None:
+        return []
+    if not isinstance(data, dict):
+        print(f"错误: {where} 必须是 符号: 值 的映射!")
+        sys.exit(1)
+    return [(xs_symbols.normalize_symbol(str(name)), _value(value)) for name, value in data.items()]
+
+def _name(name):
+    if isinstance(name, bool):
+        return 'on' if name else 'off'
+    return str(name)
+
+def load_matrix(path):
+    """读取矩阵文件，返回 {'target', 'only', 'base', 'variants': [(名称, 覆盖列表)]}"""
+    if not os.path.exists(path):
+        print(f"错误: 矩阵文件 {path} 不存在!")
+        sys.exit(1)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    if path.endswith(('.yaml', '.yml')):
+        try:
+            import yaml
+        except ImportError:
+            print("错误: 读取 YAML 矩阵文件需要安装 PyYAML (pip install pyyaml)")
+            sys.exit(1)
+        data = yaml.safe_load(text)
+    else:
+        try:
+            data = json.loads(text)
+        except ValueError as e:
+            print(f"错误: 矩阵文件 {path} 解析失败: {e}")
+            sys.exit(1)
+
+    if not isinstance(data, dict) or not data.get('variants'):
+        print(f"错误: 矩阵文件 {path} 中没有 variants!")
+        sys.exit(1)
+
+    # variants 支持两种写法:
+    #   {"big": {"T_001": 100}, ...}
+    #   [{"name": "big", "set": {"T_001": 100}}, ...]
+    variants = data['variants']
+    # YAML 1.1 会把 on/off/yes/no 解析为布尔值，变体名按原意还原
+    variants = {_name(k): v for k, v in variants.items()} if isinstance(variants, dict) else variants
+    if isinstance(variants, list):
+        items = []
+        for item in variants:
+            if not isinstance(item, dict) or 'name' not in item:
+                print(f"错误: 变体条目缺少 name 字段: {item}")
+                sys.exit(1)
+            items.append((_name(item['name']), item.get('set')))
+    elif isinstance(variants, dict):
+        items = list(variants.items())
+    else:
+        print(f"错误: 矩阵文件 {path} 的 variants 格式不正确!")
+        sys.exit(1)
+
+    result = []
+    for name, overrides in items:
+        if not VARIANT_NAME.match(name):
+            print(f"错误: 变体名 '{name}' 只能包含字母、数字、下划线、点和减号")
+            sys.exit(1)
+        if name in (n for n, _ in result):
+            print(f"错误: 变体 '{name}' 重复定义")
+            sys.exit(1)
+        result.append((name, _overrides(overrides, f"变体 {name}")))
+
+    return {
+        'target': data.get('target'),
+        'only': xs_only.parse_only(data['only']) if data.get('only') else None,
+        'base': _overrides(data.get('base'), 'base'),
+        'variants': result,
+    }
+
+def prepare_variant(sdk_root, target, only, overrides, name, index):
+    """建立变体的影子目录并写入变体配置，返回 (影子目录, 变体配置的哈希)
+
+    覆盖无法应用时抛出 xs_config.ConfigError；找不到目标配置时返回 (None, None)。
+    """
+    tree = os.path.join(sdk_root, MATRIX_OUTPUT_DIR, name)
+    config_rel = xs_only.prepare_shadow(sdk_root, target, tree)
+    if config_rel is None:
+        return None, None
+
+    with open(os.path.join(sdk_root, config_rel), 'r', encoding='utf-8') as f:
+        text = f.read()
+    if only:
+        text = xs_only.derive_config(text, *only)
+    path = os.path.join(tree, config_rel)
+    editor = xs_config.ConfigEditor(xs_config.DotConfig(path, text), index)
+    for symbol, value in overrides:
+        editor.assign(symbol, value)
+    editor.fill_defaults()
+    content = editor.config.serialize()
+    # 变体配置未变化时不会改写，影子目录中的增量编译保持有效
+    xs_fileio.write_text(path, content, record=False)
+    return tree, hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+def image_size(output_dir, target):
+    """返回目标镜像的总大小: 有 .fwpkg 时只统计 .fwpkg，否则统计全部镜像文件"""
+    files = xs_cache.collect_artifacts(output_dir, target)
+    packages = [rel for rel in files if rel.endswith('.fwpkg')]
+    total = 0
+    for rel in packages or files:
+        try:
+            total += os.path.getsize(os.path.join(output_dir, rel))
+        except OSError:
+            pass
+    return total
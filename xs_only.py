@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""xs build --only: 只打开一个项目的最小配置编译
+
+在 output/xs_only/<空间>_<项目>/ 下建立 SDK 的影子目录: 顶层条目都是指向 SDK 的符号链接，
+只有 output/、build.py 和目标配置文件所在的路径是真实的目录/文件。影子目录中的配置文件由
+主配置派生，所有 ENABLE_*_SAMPLE / SAMPLE_SUPPORT_* 符号只保留指定项目的那一组，
+因此编译只包含正在开发的项目，主配置和主 output/ 都不会被改动。
+"""
+import os
+import re
+import glob
+
+import xs_fileio
+
+ONLY_OUTPUT_DIR = os.path.join('output', 'xs_only')
+
+# 控制示例项目是否参与编译的配置符号
+SAMPLE_SYMBOL = re.compile(r'^(?:# )?(CONFIG_(?:ENABLE_\w+_SAMPLE|SAMPLE_SUPPORT_\w+))(?:=.*| is not set)$')
+
+def parse_only(value, default_space='user_project'):
+    """解析 SPACE/PROJECT，省略空间时使用默认用户代码空间"""
+    space, _, project = value.rpartition('/')
+    return space or default_space, project.upper()
+
+def find_target_config(sdk_root, target):
+    """返回目标主配置文件相对 SDK 根目录的路径，找不到时返回 None"""
+    name = target.replace('-', '_') + '.config'
+    matches = sorted(glob.glob(os.path.join(sdk_root, 'build', 'config', 'target_config', '*', 'menuconfig', '*', name)))
+    if matches:
+        return os.path.relpath(matches[0], sdk_root)
+    if os.path.isfile(os.path.join(sdk_root, '.config')):
+        return '.config'
+    return None
+
+def derive_config(text, space, project):
+    """由主配置派生只打开指定项目的配置"""
+    keep = ['CONFIG_SAMPLE_ENABLE', f'CONFIG_ENABLE_{space.upper()}_SAMPLE', f'CONFIG_SAMPLE_SUPPORT_{project}']
+    lines = []
+    seen = set()
+    for line in text.splitlines():
+        match = SAMPLE_SYMBOL.match(line)
+        if match:
+            name = match.group(1)
+            seen.add(name)
+            line = f'{name}=y' if name in keep else f'# {name} is not set'
+        elif line.startswith('CONFIG_SAMPLE_ENABLE=') or line == '# CONFIG_SAMPLE_ENABLE is not set':
+            seen.add('CONFIG_SAMPLE_ENABLE')
+            line = 'CONFIG_SAMPLE_ENABLE=y'
+        lines.append(line)
+    lines += [f'{name}=y' for name in keep if name not in seen]
+    return '\n'.join(lines) + '\n'
+
+def _mirror(src_dir, dst_dir, real_parts, top=False):
+    """在 dst_dir 中为 src_dir 的条目建立符号链接，real_parts 指向的路径建成真实目录"""
+    os.makedirs(dst_dir, exist_ok=True)
+    for name in os.listdir(src_dir):
+        if top and (name == 'output' or name.startswith('.xs_')):
+            continue
+        dst = os.path.join(dst_dir, name)
+        if real_parts and name == real_parts[0]:
+            if len(real_parts) > 1:
+                if os.path.islink(dst):
+                    os.remove(dst)
+                _mirror(os.path.join(src_dir, name), dst, real_parts[1:])
+            continue
+        if not os.path.lexists(dst):
+            os.symlink(os.path.join(src_dir, name), dst)
+
+def prepare_shadow(sdk_root, target, tree):
+    """在 tree 建立或更新 SDK 的影子目录，返回目标配置文件相对路径；找不到配置时返回 None
+
+    影子目录中的配置文件是真实文件，由调用方写入内容。
+    """
+    config_rel = find_target_config(sdk_root, target)
+    if config_rel is None:
+        print(f"错误: 未找到目标 {target} 的配置文件，请先执行 xs menuconfig 生成配置!")
+        return None
+
+    config_parts = config_rel.split(os.sep)
+    _mirror(sdk_root, tree, config_parts, top=True)
+    os.makedirs(os.path.join(tree, 'output'), exist_ok=True)
+
+    # build.py 可能按自身的真实路径定位 SDK 根目录，必须复制而不是链接
+    build_py = os.path.join(tree, 'build.py')
+    if os.path.islink(build_py):
+        os.remove(build_py)
+    with open(os.path.join(sdk_root, 'build.py'), 'r', encoding='utf-8') as f:
+        xs_fileio.write_text(build_py, f.read(), record=False)
+    return config_rel
+
+def prepare_tree(sdk_root, target, space, project):
+    """建立或更新影子目录并写入派生配置，返回影子目录路径"""
+    tree = os.path.join(sdk_root, ONLY_OUTPUT_DIR, f'{space}_{project}')
+    config_rel = prepare_shadow(sdk_root, target, tree)
+    if config_rel is None:
+        return None
+
+    with open(os.path.join(sdk_root, config_rel), 'r', encoding='utf-8') as f:
+        derived = derive_config(f.read(), space, project)
+    # 派生配置未变化时不会改写，影子目录中的增量编译保持有效
+    xs_fileio.write_text(os.path.join(tree, config_rel), derived, record=False)
+    return tree
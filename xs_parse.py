@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""samples 层和用户代码空间层 Kconfig / CMakeLists.txt 的块模型解析
+
+文件被切分为一系列块，每个块保留原始文本，未修改的部分序列化后与原文完全一致。
+脚本生成的配置段会被识别为带键的块并建立索引:
+
+    Kconfig:
+        ('config', 'SAMPLE_SUPPORT_X')   config 条目及紧随其后的 if X ... endif
+        ('osource', 'application/...')   osource 语句所在的块
+    CMakeLists.txt:
+        ('config', 'ENABLE_X_SAMPLE')    if(DEFINED CONFIG_ENABLE_X_SAMPLE) ... endif()
+        ('subdir', 'x')                  add_subdirectory_if_exist(x) 所在的块
+        ('install', 'x')                 install_sdk("${CMAKE_CURRENT_SOURCE_DIR}/x" "*")
+        ('set', 'SOURCES')               第一条 set(SOURCES ...)
+        ('command', 'build_component')   每种命令第一次出现的位置
+
+查找、删除和插入都是按键的 O(1) 操作，所有修改在 serialize() 时一次性生成新内容。
+"""
+import os
+import re
+
+import xs_fileio
+
+KCONFIG_KEYWORDS = {
+    'config', 'menuconfig', 'choice', 'endchoice', 'comment', 'menu', 'endmenu',
+    'if', 'endif', 'source', 'osource', 'rsource', 'orsource', 'mainmenu',
+}
+
+CMAKE_COMMAND_RE = re.compile(r'^\s*([A-Za-z_][A-Za-z0-9_]*)\s*\(')
+CMAKE_DEFINED_RE = re.compile(r'^\s*if\s*\(\s*DEFINED\s+CONFIG_([A-Za-z0-9_]+)\s*\)\s*$')
+CMAKE_SUBDIR_RE = re.compile(r'add_subdirectory_if_exist\s*\(\s*"?([^\s")]+)"?\s*\)')
+CMAKE_INSTALL_RE = re.compile(r'install_sdk\s*\(\s*"\$\{CMAKE_CURRENT_SOURCE_DIR\}/([^"]+)"')
+CMAKE_SET_RE = re.compile(r'^\s*set\s*\(\s*([A-Za-z0-9_]+)')
+KCONFIG_SOURCE_RE = re.compile(r'^\s*o?r?source\s+"([^"]+)"')
+
+class Block:
+    __slots__ = ('kind', 'text', 'keys')
+
+    def __init__(self, kind, text, keys=()):
+        self.kind = kind
+        self.text = text
+        self.keys = list(keys)
+
+class ConfigFile:
+    """Kconfig / CMakeLists.txt 的公共块模型"""
+
+    def __init__(self, path, content=None):
+        self.path = path
+        if content is None:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        self.original = content
+        self.blocks = []
+        self.index = {}
+        self.removed = set()
+        self.before = {}
+        self.after = {}
+        self.tail = []
+        self._parse(content.splitlines(keepends=True))
+        for i, block in enumerate(self.blocks):
+            for key in block.keys:
+                self.index.setdefault(key, i)
+
+    def _add_raw(self, line, keys=()):
+        self.blocks.append(Block('raw', line, keys))
+
+    def _add_stanza(self, kind, lines, keys):
+        # 生成的配置段总是以一个空行开头，把紧邻的空行归入该配置段
+        prefix = ''
+        if (self.blocks and self.blocks[-1].kind == 'raw' and not self.blocks[-1].keys
+                and self.blocks[-1].text.strip() == ''):
+            prefix = self.blocks.pop().text
+        self.blocks.append(Block(kind, prefix + ''.join(lines), keys))
+
+    def _parse(self, lines):
+        raise NotImplementedError
+
+    def find(self, key):
+        """返回键对应的块序号，不存在或已删除时返回 None"""
+        i = self.index.get(key)
+        if i is None or i in self.removed:
+            return None
+        return i
+
+    def has(self, key):
+        return self.find(key) is not None
+
+    def remove(self, key):
+        i = self.find(key)
+        if i is None:
+            return False
+        self.removed.add(i)
+        return True
+
+    def insert_before(self, i, text):
+        self.before.setdefault(i, []).append(text)
+
+    def insert_after(self, i, text):
+        self.after.setdefault(i, []).append(text)
+
+    def append(self, text):
+        self.tail.append(text)
+
+    def last_index(self, kind):
+        for i in range(len(self.blocks) - 1, -1, -1):
+            if self.blocks[i].kind == kind and i not in self.removed:
+                return i
+        return None
+
+    def serialize(self):
+        out = []
+        for i, block in enumerate(self.blocks):
+            out.extend(self.before.get(i, ()))
+            if i not in self.removed:
+                out.append(block.text)
+            out.extend(self.after.get(i, ()))
+        out.extend(self.tail)
+        return ''.join(out)
+
+    def changed(self):
+        return self.serialize() != self.original
+
+    def save(self):
+        """内容有变化时写回文件，返回是否写入"""
+        content = self.serialize()
+        if content == self.original:
+            return False
+        written = xs_fileio.write_text(self.path, content)
+        self.original = content
+        return written
+
+def _first_word(line):
+    parts = line.split(None, 1)
+    return parts[0] if parts else ''
+
+def _indent(line):
+    return len(line) - len(line.lstrip(' \t'))
+
+class KconfigFile(ConfigFile):
+
+    def _config_entry_end(self, lines, i):
+        """返回 config 条目结束位置(不含末尾空行)"""
+        n = len(lines)
+        end = i + 1
+        j = i + 1
+        help_indent = None
+        in_help = False
+        while j < n:
+            line = lines[j]
+            stripped = line.strip()
+            if in_help:
+                if not stripped:
+                    j += 1
+                    continue
+                if help_indent is None:
+                    help_indent = _indent(line)
+                if _indent(line) >= help_indent and help_indent > 0:
+                    end = j = j + 1
+                    continue
+                in_help = False
+            if not stripped:
+                j += 1
+                continue
+            word = _first_word(stripped)
+            if word in KCONFIG_KEYWORDS or (stripped.startswith('#') and _indent(line) == 0):
+                break
+            if word in ('help', '---help---'):
+                in_help = True
+                help_indent = None
+            end = j = j + 1
+        return end
+
+    def _if_block_end(self, lines, i):
+        """返回与 lines[i] 处 if 匹配的 endif 之后的位置，未闭合时返回 None"""
+        depth = 0
+        for j in range(i, len(lines)):
+            word = _first_word(lines[j].strip())
+            if word == 'if':
+                depth += 1
+            elif word == 'endif':
+                depth -= 1
+                if depth == 0:
+                    return j + 1
+        return None
+
+    def _parse(self, lines):
+        n = len(lines)
+        i = 0
+        while i < n:
+            line = lines[i]
+            parts = line.split()
+            if len(parts) == 2 and parts[0] in ('config', 'menuconfig'):
+                symbol = parts[1]
+                end = self._config_entry_end(lines, i)
+                # 紧随其后的 if <symbol> ... endif 属于同一个配置段
+                k = end
+                while k < n and not lines[k].strip():
+                    k += 1
+                if k < n and lines[k].split() == ['if', symbol]:
+                    if_end = self._if_block_end(lines, k)
+                    if if_end is not None:
+                        end = if_end
+                keys = [('config', symbol)]
+                for sub in lines[i:end]:
+                    m = KCONFIG_SOURCE_RE.match(sub)
+                    if m:
+                        keys.append(('osource', m.group(1)))
+                self._add_stanza('config', lines[i:end], keys)
+                i = end
+                continue
+
+            m = KCONFIG_SOURCE_RE.match(line)
+            self._add_raw(line, [('osource', m.group(1))] if m else ())
+            i += 1
+
+class CMakeFile(ConfigFile):
+
+    def _command_end(self, lines, i):
+        """返回从 lines[i] 开始的命令调用结束位置(支持跨行参数)"""
+        depth = 0
+        in_quote = False
+        for j in range(i, len(lines)):
+            for ch in lines[j]:
+                if ch == '"':
+                    in_quote = not in_quote
+                elif in_quote:
+                    continue
+                elif ch == '#':
+                    break
+                elif ch == '(':
+                    depth += 1
+                elif ch == ')':
+                    depth -= 1
+            if depth <= 0 and not in_quote:
+                return j + 1
+        return len(lines)
+
+    def _if_block_end(self, lines, i):
+        depth = 0
+        j = i
+        while j < len(lines):
+            m = CMAKE_COMMAND_RE.match(lines[j])
+            if m:
+                name = m.group(1).lower()
+                if name == 'if':
+                    depth += 1
+                elif name == 'endif':
+                    depth -= 1
+                    if depth == 0:
+                        return self._command_end(lines, j)
+                j = self._command_end(lines, j)
+            else:
+                j += 1
+        return None
+
+    def _parse(self, lines):
+        n = len(lines)
+        i = 0
+        while i < n:
+            line = lines[i]
+            if line.lstrip().startswith('#'):
+                self._add_raw(line)
+                i += 1
+                continue
+
+            m = CMAKE_DEFINED_RE.match(line)
+            if m:
+                end = self._if_block_end(lines, i)
+                if end is not None:
+                    keys = [('config', m.group(1))]
+                    for sub in lines[i:end]:
+                        sm = CMAKE_SUBDIR_RE.search(sub)
+                        if sm:
+                            keys.append(('subdir', sm.group(1)))
+                    self._add_stanza('if', lines[i:end], keys)
+                    i = end
+                    continue
+
+            m = CMAKE_COMMAND_RE.match(line)
+            if not m:
+                self._add_raw(line)
+                i += 1
+                continue
+
+            end = self._command_end(lines, i)
+            text = ''.join(lines[i:end])
+            name = m.group(1)
+            keys = [('command', name)]
+            sm = CMAKE_SUBDIR_RE.search(text)
+            if sm:
+                keys.append(('subdir', sm.group(1)))
+            im = CMAKE_INSTALL_RE.search(text)
+            if im:
+                keys.append(('install', im.group(1)))
+            setm = CMAKE_SET_RE.match(text)
+            if setm:
+                keys.append(('set', setm.group(1)))
+            self.blocks.append(Block('command', text, keys))
+            i = end
+
+def load_kconfig(path):
+    if not os.path.exists(path):
+        return None
+    return KconfigFile(path)
+
+def load_cmakelists(path):
+    if not os.path.exists(path):
+        return None
+    return CMakeFile(path)
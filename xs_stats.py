@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""项目规模统计及其按文件的缓存
+
+统计每个项目/用户代码空间的文件数、C 代码行数(.c/.h)、源码字节数和最近修改时间。
+每个文件的行数按 (路径, mtime, size) 缓存在 SDK 根目录下的 .xs_stats.json 中，
+再次统计时只对变化的文件重新读取内容，其余文件只需一次 stat。
+"""
+import os
+import json
+import time
+
+import xs_fileio
+import xs_index
+
+STATS_FILE = '.xs_stats.json'
+STATS_VERSION = 1
+
+SOURCE_EXTS = ('.c', '.h')
+
+SKIP_DIRS = {'__pycache__', '.git'}
+
+# 可用于排序的字段，数值字段从大到小、mtime 从新到旧
+SORT_KEYS = ('name', 'files', 'lines', 'bytes', 'mtime')
+
+def empty_stats():
+    return {'files': 0, 'lines': 0, 'bytes': 0, 'mtime': 0}
+
+def merge(total, stats):
+    total['files'] += stats['files']
+    total['lines'] += stats['lines']
+    total['bytes'] += stats['bytes']
+    total['mtime'] = max(total['mtime'], stats['mtime'])
+    return total
+
+def count_lines(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    return data.count(b'\n') + (1 if data and not data.endswith(b'\n') else 0)
+
+class StatsCache:
+
+    def __init__(self, sdk_root):
+        self.sdk_root = sdk_root
+        self.path = os.path.join(sdk_root, STATS_FILE)
+        self.files = {}
+        self.scanned = set()
+        self.seen = set()
+        self.reread = 0
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == STATS_VERSION:
+                self.files = data.get('files', {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def dir_stats(self, path, skip=()):
+        """递归统计目录，skip 为不统计的直接子目录名"""
+        stats = empty_stats()
+        now = time.time_ns()
+        stack = [(path, skip)]
+        while stack:
+            directory, skip_names = stack.pop()
+            self.scanned.add(os.path.relpath(directory, self.sdk_root))
+            try:
+                with os.scandir(directory) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS and entry.name not in skip_names:
+                        stack.append((entry.path, ()))
+                    continue
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                st = entry.stat(follow_symlinks=False)
+                stats['files'] += 1
+                stats['bytes'] += st.st_size
+                stats['mtime'] = max(stats['mtime'], st.st_mtime_ns)
+                if entry.name.endswith(SOURCE_EXTS):
+                    stats['lines'] += self._lines(entry.path, st, now)
+        return stats
+
+    def _lines(self, path, st, now):
+        rel = os.path.relpath(path, self.sdk_root)
+        cached = self.files.get(rel)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            self.seen.add(rel)
+            return cached[2]
+        try:
+            lines = count_lines(path)
+        except OSError:
+            return 0
+        self.reread += 1
+        # 与 xs_index 相同: mtime 太新的文件可能在同一时间粒度内再被修改，不缓存
+        if now - st.st_mtime_ns >= xs_index.RACY_WINDOW_NS:
+            self.files[rel] = [st.st_mtime_ns, st.st_size, lines]
+            self.seen.add(rel)
+        else:
+            self.files.pop(rel, None)
+        return lines
+
+    def save(self):
+        """写回缓存，并去掉本次扫描过的目录中已不存在的文件(内容未变化时不写入)"""
+        files = {rel: value for rel, value in self.files.items()
+                 if rel in self.seen or os.path.dirname(rel) not in self.scanned}
+        content = json.dumps({'version': STATS_VERSION, 'files': files}, separators=(',', ':'))
+        try:
+            xs_fileio.write_text(self.path, content, record=False)
+        except OSError:
+            pass
+
+def sort_rows(rows, key):
+    """rows 为 [(名称, 统计)]"""
+    if key == 'name':
+        return sorted(rows, key=lambda row: row[0])
+    return sorted(rows, key=lambda row: (-row[1][key], row[0]))
+
+def format_mtime(mtime_ns):
+    if not mtime_ns:
+        return '-'
+    return time.strftime('%Y-%m-%d %H:%M', time.localtime(mtime_ns / 1e9))
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""application/samples 下所有 Kconfig 配置符号和 osource 路径的全局索引
+
+从 samples/Kconfig、各用户代码空间和项目的 Kconfig 出发，沿 osource 引用找到
+所有参与配置的 Kconfig 文件。每个文件的解析结果按 (mtime, size) 缓存在 SDK 根目录下的
+.xs_symbols.json 中，只有变化的文件才会重新解析；查询某个符号在哪些文件中定义是 O(1) 的。
+同时记录每个符号的类型、depends on(含外层 if 和 osource 处继承的条件)、select 和默认值，
+供 xs config 直接修改 .config 时解析依赖。
+"""
+import os
+import sys
+import json
+import fnmatch
+import re
+import time
+import argparse
+
+from xs_common import find_application_dir
+import xs_fileio
+import xs_index
+import xs_parse
+
+SYMBOLS_FILE = '.xs_symbols.json'
+SYMBOLS_VERSION = 2
+
+KCONFIG_TYPES = ('bool', 'tristate', 'string', 'int', 'hex')
+KCONFIG_STRING = re.compile(r'"(?:[^"\\]|\\.)*"')
+
+def normalize_symbol(name):
+    return name[len('CONFIG_'):] if name.startswith('CONFIG_') else name
+
+class SymbolIndex:
+
+    def __init__(self, sdk_root, persist=True):
+        self.sdk_root = sdk_root
+        self.samples_dir = os.path.join(sdk_root, 'application', 'samples')
+        self.path = os.path.join(sdk_root, SYMBOLS_FILE)
+        self.persist = persist
+        self.files = {}
+        self.symbols = {}
+        self.osources = {}
+        if persist:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == SYMBOLS_VERSION:
+                    self.files = data.get('files', {})
+            except (OSError, ValueError, AttributeError):
+                pass
+        self._build_maps()
+
+    def _build_maps(self):
+        symbols = {}
+        osources = {}
+        for rel, entry in self.files.items():
+            for name in entry['symbols']:
+                symbols.setdefault(name, []).append(rel)
+            for path in entry['osources']:
+                osources.setdefault(path, []).append(rel)
+        self.symbols = symbols
+        self.osources = osources
+        self._inherited = {}
+
+    def _parse(self, rel):
+        kconfig = xs_parse.KconfigFile(os.path.join(self.sdk_root, rel))
+        symbols = []
+        osources = []
+        for block in kconfig.blocks:
+            for kind, value in block.keys:
+                if kind == 'config':
+                    symbols.append(value)
+                elif kind == 'osource':
+                    osources.append(value)
+        attrs, conds = scan_attributes(kconfig.original)
+        return symbols, osources, attrs, conds
+
+    def refresh(self, tree=None):
+        """按 mtime 增量刷新，返回是否有文件发生变化"""
+        if tree is None:
+            tree = xs_index.scan_tree(self.samples_dir, xs_index.load_index(self.samples_dir))
+
+        samples_rel = os.path.relpath(self.samples_dir, self.sdk_root)
+        queue = [os.path.join(samples_rel, 'Kconfig')]
+        for space, node in tree['children'].items():
+            queue.append(os.path.join(samples_rel, space, 'Kconfig'))
+            for project in node.get('children', {}):
+                queue.append(os.path.join(samples_rel, space, project, 'Kconfig'))
+
+        files = {}
+        changed = False
+        scan_start_ns = time.time_ns()
+        while queue:
+            rel = os.path.normpath(queue.pop())
+            if rel in files:
+                continue
+            try:
+                st = os.stat(os.path.join(self.sdk_root, rel))
+            except OSError:
+                continue
+            entry = self.files.get(rel)
+            if not entry or entry['mtime'] != st.st_mtime_ns or entry['size'] != st.st_size:
+                try:
+                    symbols, osources, attrs, conds = self._parse(rel)
+                except (OSError, UnicodeDecodeError):
+                    continue
+                # 与 xs_index 相同: mtime 距扫描时刻太近的文件在同一时间粒度内可能再被修改(大小不变时
+                # 无法察觉)，不记录 mtime，下次刷新时重新解析
+                mtime = st.st_mtime_ns if st.st_mtime_ns < scan_start_ns - xs_index.RACY_WINDOW_NS else None
+                entry = {'mtime': mtime, 'size': st.st_size, 'symbols': symbols, 'osources': osources,
+                         'attrs': attrs, 'conds': conds}
+                changed = True
+            files[rel] = entry
+            # 只跟随 samples 目录内的 osource，SDK 其他部分不在索引范围内
+            for path in entry['osources']:
+                if path.startswith(samples_rel + '/'):
+                    queue.append(path)
+
+        if changed or files.keys() != self.files.keys():
+            self.files = files
+            self._build_maps()
+            if self.persist:
+                self.save()
+            return True
+        return False
+
+    def save(self):
+        content = json.dumps({'version': SYMBOLS_VERSION, 'files': self.files}, separators=(',', ':'))
+        try:
+            xs_fileio.write_text(self.path, content, record=False)
+        except OSError:
+            pass
+
+    def lookup(self, symbol):
+        """返回定义该符号的文件列表(同一文件重复定义时会出现多次)"""
+        return self.symbols.get(normalize_symbol(symbol), [])
+
+    def osource_users(self, path):
+        return self.osources.get(path, [])
+
+    def query(self, pattern):
+        pattern = normalize_symbol(pattern)
+        if not any(ch in pattern for ch in '*?['):
+            return {pattern: self.symbols[pattern]} if pattern in self.symbols else {}
+        return {name: files for name, files in sorted(self.symbols.items())
+                if fnmatch.fnmatchcase(name, pattern)}
+
+    def subset(self, names, osources=()):
+        """只取出指定符号和 osource 路径的定义位置，供常驻服务回答 lookup 请求"""
+        return {
+            'symbols': {normalize_symbol(name): self.lookup(name) for name in names},
+            'osources': {path: self.osource_users(path) for path in osources},
+        }
+
+    def conflicts(self):
+        """返回被定义了不止一次的符号"""
+        return {name: files for name, files in sorted(self.symbols.items()) if len(files) > 1}
+
+    def _file_conditions(self, rel, visiting=()):
+        """文件经 osource 引入时所处的 if/menu 条件(沿引用链向上累积)"""
+        if rel in self._inherited:
+            return self._inherited[rel]
+        conds = []
+        for parent in self.osources.get(rel, []):
+            if parent in visiting:
+                continue
+            for cond in self._file_conditions(parent, visiting + (rel,)) + self.files[parent]['conds'].get(rel, []):
+                if cond not in conds:
+                    conds.append(cond)
+        self._inherited[rel] = conds
+        return conds
+
+    def attributes(self, symbol):
+        """返回符号的 {type, depends, selects, default}，depends 包含继承的条件；未定义时返回 None"""
+        name = normalize_symbol(symbol)
+        files = self.symbols.get(name)
+        if not files:
+            return None
+        attrs = self.files[files[0]]['attrs'].get(name)
+        if attrs is None:
+            return None
+        attrs = dict(attrs)
+        attrs['depends'] = self._file_conditions(files[0]) + attrs['depends']
+        return attrs
+
+class SymbolTable:
+    """lookup / osource_users 与 SymbolIndex 相同、只包含部分符号的查询结果，来自常驻服务"""
+
+    def __init__(self, symbols, osources=None):
+        self.symbols = symbols
+        self.osources = osources or {}
+
+    def lookup(self, symbol):
+        return self.symbols.get(normalize_symbol(symbol), [])
+
+    def osource_users(self, path):
+        return self.osources.get(path, [])
+
+def scan_attributes(text):
+    """逐行扫描 Kconfig，返回 ({符号: 属性}, {osource 路径: 所处条件})
+
+    只识别脚手架和示例 Kconfig 中用到的语法: 类型、depends on、select、无条件 default、
+    if/endif、menu/endmenu(含 menu 上的 depends on)和 choice/endchoice。
+    """
+    attrs = {}
+    conds = {}
+    stack = []
+    current = None
+    help_indent = None
+    for raw in text.splitlines():
+        stripped = raw.strip()
+        if help_indent is not None:
+            indent = len(raw) - len(raw.lstrip())
+            if not stripped or indent > help_indent:
+                continue
+            help_indent = None
+        if not stripped or stripped.startswith('#'):
+            continue
+        keyword, _, rest = stripped.partition(' ')
+        rest = rest.strip()
+        if keyword in ('config', 'menuconfig'):
+            current = attrs.setdefault(rest, {'type': None, 'depends': [c for frame in stack for c in frame],
+                                              'selects': [], 'default': None})
+        elif keyword in ('if', 'menu', 'choice'):
+            stack.append([rest] if keyword == 'if' else [])
+            current = None if keyword == 'if' else stack[-1]
+        elif keyword in ('endif', 'endmenu', 'endchoice'):
+            if stack:
+                stack.pop()
+            current = None
+        elif keyword in ('source', 'osource', 'rsource', 'orsource'):
+            conds[rest.strip('"')] = [c for frame in stack for c in frame]
+            current = None
+        elif keyword == 'comment' or keyword == 'mainmenu':
+            current = None
+        elif keyword in ('help', '---help---'):
+            help_indent = len(raw) - len(raw.lstrip())
+        elif isinstance(current, list):
+            # menu/choice 上的 depends on 作用于其中所有条目
+            if keyword == 'depends' and rest.startswith('on '):
+                current.append(rest[3:].strip())
+        elif current is None:
+            continue
+        elif keyword in KCONFIG_TYPES:
+            current['type'] = keyword
+        elif keyword in ('def_bool', 'def_tristate'):
+            current['type'] = keyword[4:]
+            if current['default'] is None and ' if ' not in rest:
+                current['default'] = rest
+        elif keyword == 'depends' and rest.startswith('on '):
+            current['depends'].append(rest[3:].strip())
+        elif keyword == 'select':
+            current['selects'].append(rest.split()[0])
+        elif keyword == 'default' and current['default'] is None:
+            # 带 if 的默认值取决于其他符号，不作为字面默认值
+            if ' if ' not in KCONFIG_STRING.sub('""', rest):
+                current['default'] = rest
+    return attrs, conds
+
+def foreign_definitions(index, symbol, own=()):
+    """返回 own 之外定义了该符号的文件，用于创建/清理前的冲突检查"""
+    return [rel for rel in index.lookup(symbol) if rel not in own]
+
+def load(sdk_root, tree=None):
+    """加载并增量刷新符号索引"""
+    index = SymbolIndex(sdk_root)
+    index.refresh(tree)
+    return index
+
+def print_conflicts(conflicts):
+    print(f"警告: 发现 {len(conflicts)} 个重复定义的配置符号:")
+    for name, files in conflicts.items():
+        print(f"  - {name}: {', '.join(files)}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='配置符号查询工具')
+    parser.add_argument('pattern', nargs='?', default='*', help='符号名或通配符，可带 CONFIG_ 前缀')
+    parser.add_argument('--conflicts', action='store_true', help='只列出重复定义的符号')
+    parser.add_argument('--json', action='store_true', help='以 JSON 格式输出')
+
+    args = parser.parse_args(argv)
+
+    sdk_root = os.path.dirname(find_application_dir())
+
+    # 常驻服务在运行时直接使用其内存中的符号表
+    import xs_daemon
+    result = xs_daemon.query_or_load(sdk_root, 'symbols', pattern=args.pattern)
+    if args.conflicts:
+        result = {name: files for name, files in result.items() if len(files) > 1}
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return 0
+    if not result:
+        print("未找到匹配的配置符号")
+        return 0
+    for name, files in result.items():
+        mark = '  [重复定义]' if len(files) > 1 else ''
+        print(f"{name}{mark}")
+        for rel in files:
+            print(f"    {rel}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
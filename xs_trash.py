@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""删除目录时先原子地移入 SDK 根目录下的 .xs_trash/，由后台进程回收
+
+每个回收站条目的结构:
+    .xs_trash/<条目名>/payload     被删除的目录
+    .xs_trash/<条目名>/meta.json   原始位置、类型和删除时间
+
+移入回收站只是一次 os.rename，命令可以立即返回。后台回收进程同一时间只运行一个，
+删除超过保留期的条目，删除并发数受 REAPER_JOBS 限制。保留期内可以用
+xs trash --restore 恢复误删的项目或用户代码空间。
+"""
+import os
+import sys
+import json
+import time
+import errno
+import fcntl
+import shutil
+import argparse
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from xs_common import find_application_dir
+
+TRASH_DIR = '.xs_trash'
+LOCK_FILE = '.reaper.lock'
+REAPER_JOBS = 2
+
+# 回收站条目的保留时间(秒)，可通过环境变量 XS_TRASH_GRACE 调整
+DEFAULT_GRACE = 600
+
+def trash_dir(sdk_root):
+    return os.path.join(sdk_root, TRASH_DIR)
+
+def grace_period():
+    try:
+        return max(0, int(os.environ.get('XS_TRASH_GRACE', DEFAULT_GRACE)))
+    except ValueError:
+        return DEFAULT_GRACE
+
+def move_to_trash(path, sdk_root, kind, space, name):
+    """把目录移入回收站，返回条目名；不在同一文件系统时直接删除并返回 None"""
+    root = trash_dir(sdk_root)
+    os.makedirs(root, exist_ok=True)
+    prefix = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{kind}-{space}" + (f"-{name}" if name else '')
+    # 同一秒内重复删除同名目录(如脚本中反复创建和删除同一个项目)时由 mkdtemp 保证条目名唯一
+    entry_dir = tempfile.mkdtemp(prefix=prefix + '-', dir=root)
+    entry = os.path.basename(entry_dir)
+    try:
+        os.rename(path, os.path.join(entry_dir, 'payload'))
+    except OSError as e:
+        os.rmdir(entry_dir)
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.rmtree(path)
+        return None
+
+    meta = {
+        'kind': kind,
+        'space': space,
+        'name': name,
+        'original': os.path.relpath(path, sdk_root),
+        'deleted_at': time.time(),
+    }
+    with open(os.path.join(entry_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    return entry
+
+def list_entries(sdk_root):
+    """返回 [(条目名, meta)]，按删除时间排序"""
+    root = trash_dir(sdk_root)
+    entries = []
+    try:
+        names = os.listdir(root)
+    except FileNotFoundError:
+        return []
+    for entry in names:
+        if entry.startswith('.'):
+            continue
+        try:
+            with open(os.path.join(root, entry, 'meta.json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            # 元数据还没写完或已损坏的条目，按目录 mtime 处理
+            try:
+                meta = {'deleted_at': os.stat(os.path.join(root, entry)).st_mtime}
+            except OSError:
+                continue
+        entries.append((entry, meta))
+    entries.sort(key=lambda item: item[1].get('deleted_at', 0))
+    return entries
+
+def purge_entry(sdk_root, entry):
+    shutil.rmtree(os.path.join(trash_dir(sdk_root), entry), ignore_errors=True)
+    return entry
+
+def spawn_reaper(sdk_root):
+    """启动脱离终端的后台回收进程"""
+    tools_dir = os.path.dirname(os.path.abspath(__file__))
+    subprocess.Popen([sys.executable, os.path.join(tools_dir, 'xs_trash.py'), '--reap'],
+                     cwd=sdk_root, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                     stderr=subprocess.DEVNULL, start_new_session=True)
+
+def reap(sdk_root):
+    """后台回收: 删除超过保留期的条目，直到回收站为空"""
+    root = trash_dir(sdk_root)
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, LOCK_FILE), 'w') as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            # 已有回收进程在运行
+            return 0
+        try:
+            os.nice(10)
+        except OSError:
+            pass
+
+        grace = grace_period()
+        with ThreadPoolExecutor(max_workers=REAPER_JOBS) as executor:
+            while True:
+                entries = list_entries(sdk_root)
+                if not entries:
+                    return 0
+                now = time.time()
+                expired = [entry for entry, meta in entries if now - meta.get('deleted_at', 0) >= grace]
+                list(executor.map(lambda entry: purge_entry(sdk_root, entry), expired))
+                if len(expired) == len(entries):
+                    continue
+                oldest = min(meta.get('deleted_at', now) for entry, meta in entries if entry not in expired)
+                time.sleep(max(1.0, oldest + grace - now))
+
+def restore(sdk_root, entry):
+    """恢复回收站条目，并重新注册到 Kconfig 和 CMakeLists.txt"""
+    entry_dir = os.path.join(trash_dir(sdk_root), entry)
+    try:
+        with open(os.path.join(entry_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        print(f"错误: 回收站中不存在条目 '{entry}'!")
+        return 1
+
+    original = os.path.join(sdk_root, meta['original'])
+    if os.path.exists(original):
+        print(f"错误: {original} 已存在，无法恢复!")
+        return 1
+    if not os.path.isdir(os.path.dirname(original)):
+        print(f"错误: {os.path.dirname(original)} 目录不存在，请先恢复所属的用户代码空间!")
+        return 1
+
+    # 与 create-project / make-user-space 相同: 恢复后会重新注册的配置符号不能已在别处定义
+    samples_dir = os.path.join(sdk_root, 'application', 'samples')
+    if meta['kind'] == 'project':
+        import mkpro
+        ok = mkpro.check_symbol_conflicts([(meta['space'], meta['name'])], samples_dir)
+    else:
+        import mucs
+        ok = mucs.check_symbol_conflicts(samples_dir, meta['space'])
+    if not ok:
+        print(f"错误: 无法恢复 '{entry}'，请先处理上述配置符号冲突")
+        return 1
+
+    os.rename(os.path.join(entry_dir, 'payload'), original)
+
+    if meta['kind'] == 'project':
+        space_dir = os.path.join(samples_dir, meta['space'])
+        mkpro.update_cmakelists([meta['name']], space_dir)
+        mkpro.update_kconfig([meta['name']], space_dir)
+    else:
+        mucs.update_samples_kconfig(samples_dir, meta['space'])
+        mucs.update_samples_cmakelists(samples_dir, meta['space'])
+
+    shutil.rmtree(entry_dir, ignore_errors=True)
+
+    import xs_index
+    xs_index.refresh_index(samples_dir)
+    print(f"已恢复: {original}")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='回收站管理')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--purge', nargs='*', metavar='ENTRY', help='立即删除指定条目，不指定时清空回收站')
+    group.add_argument('--restore', metavar='ENTRY', help='恢复指定条目')
+    group.add_argument('--reap', action='store_true', help=argparse.SUPPRESS)
+
+    args = parser.parse_args(argv)
+
+    sdk_root = os.path.dirname(find_application_dir())
+
+    if args.reap:
+        return reap(sdk_root)
+
+    if args.restore:
+        return restore(sdk_root, args.restore)
+
+    entries = list_entries(sdk_root)
+
+    if args.purge is not None:
+        targets = args.purge or [entry for entry, _ in entries]
+        known = {entry for entry, _ in entries}
+        for entry in targets:
+            if entry not in known:
+                print(f"警告: 回收站中不存在条目 '{entry}'")
+                continue
+            purge_entry(sdk_root, entry)
+            print(f"已彻底删除: {entry}")
+        return 0
+
+    if not entries:
+        print("回收站为空")
+        return 0
+    grace = grace_period()
+    now = time.time()
+    print(f"回收站中有 {len(entries)} 个条目 (保留 {grace} 秒后由后台进程回收):")
+    for entry, meta in entries:
+        remaining = max(0, int(meta.get('deleted_at', now) + grace - now))
+        print(f"- {entry}  原位置: {meta.get('original', '?')}  剩余 {remaining} 秒")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""基于 os.scandir 的 application/samples 并行遍历
+
+每个用户代码空间交给线程池中的一个线程扫描，结果按名称顺序逐个产出，
+调用方可以边遍历边输出，提前结束迭代时未开始的扫描会被取消。
+"""
+import os
+import fnmatch
+from concurrent.futures import ThreadPoolExecutor
+
+MARKER_FILES = ('CMakeLists.txt', 'Kconfig')
+
+def default_jobs():
+    # 网络文件系统上扫描主要耗在等待 IO，线程数可以比 CPU 数多
+    return min(32, (os.cpu_count() or 1) * 4)
+
+def scan_dir(path, want_subdirs=True):
+    """扫描单个目录，返回 (是否包含 CMakeLists.txt/Kconfig, 子目录名列表)
+
+    子目录判断使用 DirEntry 自带的类型信息，大多数文件系统上不需要额外 stat。
+    """
+    is_project = False
+    subdirs = []
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.name in MARKER_FILES:
+                is_project = True
+            elif want_subdirs and entry.is_dir():
+                subdirs.append(entry.name)
+    subdirs.sort()
+    return is_project, subdirs
+
+def list_candidate_spaces(samples_dir):
+    """列出 samples 下的所有子目录(尚未判断是否为用户代码空间)"""
+    return scan_dir(samples_dir)[1]
+
+def scan_space(samples_dir, user_space, depth=2, pattern=None):
+    """扫描一个用户代码空间，返回 (是否为用户代码空间, 项目列表)"""
+    space_dir = os.path.join(samples_dir, user_space)
+    try:
+        is_space, subdirs = scan_dir(space_dir, want_subdirs=depth > 1)
+    except OSError:
+        return False, []
+
+    projects = []
+    for name in subdirs:
+        if pattern and not fnmatch.fnmatchcase(name, pattern):
+            continue
+        try:
+            if scan_dir(os.path.join(space_dir, name), want_subdirs=False)[0]:
+                projects.append(name)
+        except OSError:
+            continue
+    return is_space, projects
+
+def walk_spaces(samples_dir, spaces=None, depth=2, pattern=None, jobs=None):
+    """并行扫描用户代码空间，按名称顺序产出 (用户代码空间, 项目列表)
+
+    spaces 为 None 时扫描 samples 下的全部子目录，不是用户代码空间的目录会被跳过。
+    """
+    if spaces is None:
+        spaces = list_candidate_spaces(samples_dir)
+    if not spaces:
+        return
+
+    executor = ThreadPoolExecutor(max_workers=min(jobs or default_jobs(), len(spaces)))
+    try:
+        futures = [executor.submit(scan_space, samples_dir, space, depth, pattern) for space in spaces]
+        for space, future in zip(spaces, futures):
+            is_space, projects = future.result()
+            if is_space:
+                yield space, projects
+    finally:
+        # 调用方提前停止迭代(如 --limit)时，取消尚未开始的扫描
+        executor.shutdown(wait=False, cancel_futures=True)
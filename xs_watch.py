@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""xs watch: 修改源码后自动增量编译
+
+监视示例目录(指定 SPACE/PROJECT 时只监视该项目和所在用户代码空间的配置文件)以及目标配置文件，
+优先使用 inotify(通过 ctypes 调用 libc，无需第三方库)，不可用时回退到按 mtime 轮询。
+一连串保存在静默 DEBOUNCE 秒后合并为一次 xs b <目标>，编译过程中又有修改时默认取消当前编译
+并立即重新开始，--queue 时等当前编译结束后再编译一次。
+"""
+import os
+import sys
+import time
+import errno
+import select
+import signal
+import struct
+import fnmatch
+import argparse
+import subprocess
+
+from xs_common import DEFAULT_TARGET, find_application_dir
+import xs_only
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEBOUNCE = 0.3
+# 持续有修改时最多等待这么久就开始编译
+MAX_DEBOUNCE = 2.0
+POLL_INTERVAL = 0.5
+
+# 编辑器和 xs 自身写入时产生的临时文件
+IGNORE_PATTERNS = ('*.swp', '*.swx', '*~', '.#*', '4913', '*.tmp', '.xs_*', '*.pyc')
+SKIP_DIRS = {'__pycache__', '.git'}
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+EVENT_HEADER = struct.Struct('iIII')
+
+def ignored(path):
+    name = os.path.basename(path)
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in IGNORE_PATTERNS)
+
+def iter_dirs(root):
+    yield root
+    for dirpath, dirnames, _ in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        for name in dirnames:
+            yield os.path.join(dirpath, name)
+
+class InotifyWatcher:
+    """递归监视目录，files 中的文件通过监视其所在目录实现"""
+
+    def __init__(self, dirs, files):
+        import ctypes
+        import ctypes.util
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 失败')
+        self.watches = {}
+        self.recursive = set()
+        self.files = {os.path.abspath(path) for path in files}
+        try:
+            for directory in dirs:
+                for path in iter_dirs(directory):
+                    self._add(path, True)
+            for path in self.files:
+                self._add(os.path.dirname(path), False)
+        except OSError:
+            # 调用方会回退到轮询，不能留下已打开的 inotify 实例
+            self.close()
+            raise
+
+    def _add(self, path, recursive):
+        import ctypes
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            # 目录已被删除时忽略；监视数量达到上限等其他错误交给调用方回退到轮询
+            if err in (errno.ENOENT, errno.ENOTDIR):
+                return
+            raise OSError(err, f'inotify_add_watch {path} 失败: {os.strerror(err)}')
+        self.watches[wd] = path
+        if recursive:
+            self.recursive.add(path)
+
+    def wait(self, timeout):
+        """等待最多 timeout 秒，返回发生变化的路径集合"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'replace')
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                # 事件队列溢出时无法知道具体文件，当作整体发生了变化
+                changed.add('*')
+                continue
+            directory = self.watches.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                del self.watches[wd]
+                self.recursive.discard(directory)
+                continue
+            path = os.path.join(directory, name) if name else directory
+            if directory not in self.recursive and path not in self.files:
+                continue
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and directory in self.recursive:
+                for sub in iter_dirs(path):
+                    self._add(sub, True)
+            if not ignored(path):
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    """按 (mtime, size) 快照轮询，inotify 不可用时使用"""
+
+    def __init__(self, dirs, files, interval=POLL_INTERVAL):
+        self.dirs = list(dirs)
+        self.files = [os.path.abspath(path) for path in files]
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        paths = list(self.files)
+        for directory in self.dirs:
+            for dirpath, dirnames, filenames in os.walk(directory):
+                dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+                paths.extend(os.path.join(dirpath, name) for name in filenames)
+        for path in paths:
+            if ignored(path):
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            changed = {path for path in snapshot.keys() | self.snapshot.keys()
+                       if snapshot.get(path) != self.snapshot.get(path)}
+            self.snapshot = snapshot
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+def create_watcher(dirs, files, poll=False):
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(dirs, files), 'inotify'
+        except (OSError, AttributeError) as e:
+            print(f"inotify 不可用 ({e})，改用轮询")
+    return PollingWatcher(dirs, files), f'轮询 (每 {POLL_INTERVAL:g} 秒)'
+
+def debounce(watcher, changes, quiet=DEBOUNCE, limit=MAX_DEBOUNCE):
+    """一直合并修改，直到静默 quiet 秒或累计等待 limit 秒"""
+    start = time.monotonic()
+    while time.monotonic() - start < limit:
+        more = watcher.wait(quiet)
+        if not more:
+            break
+        changes |= more
+    return changes
+
+def describe(changes, sdk_root):
+    names = sorted('(事件队列溢出)' if path == '*' else os.path.relpath(path, sdk_root) for path in changes)
+    if len(names) > 3:
+        return f"{', '.join(names[:3])} 等 {len(names)} 个文件"
+    return ', '.join(names)
+
+def start_build(build_argv):
+    # 独立进程组，取消时连同 build.py 及其子进程一起终止
+    return subprocess.Popen([sys.executable, os.path.join(TOOLS_DIR, '__main__.py')] + build_argv,
+                            start_new_session=True)
+
+def cancel_build(proc):
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+    except OSError:
+        pass
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        os.killpg(proc.pid, signal.SIGKILL)
+        proc.wait()
+
+def watch_loop(watcher, build_argv, sdk_root, queue=False, quiet=DEBOUNCE):
+    changes = set()
+    while True:
+        if not changes:
+            changes = watcher.wait(3600)
+            if not changes:
+                continue
+        changes = debounce(watcher, changes, quiet)
+        print(f"\n[{time.strftime('%H:%M:%S')}] 检测到修改: {describe(changes, sdk_root)}，开始编译", flush=True)
+        changes = set()
+
+        start = time.perf_counter()
+        proc = start_build(build_argv)
+        cancelled = False
+        try:
+            while proc.poll() is None:
+                more = watcher.wait(0.2)
+                if not more:
+                    continue
+                changes |= more
+                if not queue:
+                    cancel_build(proc)
+                    cancelled = True
+                    break
+        except KeyboardInterrupt:
+            cancel_build(proc)
+            raise
+
+        elapsed = time.perf_counter() - start
+        stamp = time.strftime('%H:%M:%S')
+        if cancelled:
+            print(f"[{stamp}] 编译期间又有修改，已取消当前编译 ({elapsed:.1f} 秒)", flush=True)
+        elif proc.returncode == 0:
+            print(f"[{stamp}] 编译成功，耗时 {elapsed:.1f} 秒", flush=True)
+        else:
+            print(f"[{stamp}] 编译失败 (退出码 {proc.returncode})，耗时 {elapsed:.1f} 秒", flush=True)
+        if changes and not cancelled:
+            print(f"[{stamp}] 编译期间有新的修改，重新编译", flush=True)
+        if not changes:
+            print("等待修改... (Ctrl+C 退出)", flush=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='监视源码修改并自动增量编译')
+    parser.add_argument('project', nargs='?', metavar='SPACE/PROJECT', help='只监视指定项目，默认监视全部示例')
+    parser.add_argument('-t', '--target', default=DEFAULT_TARGET, help=f'编译目标，默认 {DEFAULT_TARGET}')
+    parser.add_argument('--only', action='store_true', help='按最小配置只编译指定项目(xs build --only)')
+    parser.add_argument('--queue', action='store_true', help='编译期间的修改排队到本次编译结束后，而不是取消当前编译')
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE, help=f'静默多少秒后开始编译，默认 {DEBOUNCE}')
+    parser.add_argument('--poll', action='store_true', help='不使用 inotify，强制轮询')
+    parser.add_argument('--fail-fast', action='store_true', help='遇到第一个编译错误即中止编译')
+
+    args = parser.parse_args(argv)
+    if args.only and not args.project:
+        parser.error('--only 需要指定 SPACE/PROJECT')
+
+    samples_dir = os.path.join(find_application_dir(), 'samples')
+    sdk_root = os.path.dirname(os.path.dirname(samples_dir))
+
+    files = []
+    if args.project:
+        space, project = xs_only.parse_only(args.project)
+        project_dir = os.path.join(samples_dir, space, project)
+        if not os.path.isdir(project_dir):
+            print(f"错误: 项目 {space}/{project} 不存在!")
+            return 1
+        dirs = [project_dir]
+        files += [os.path.join(samples_dir, space, name) for name in ('Kconfig', 'CMakeLists.txt')]
+    else:
+        dirs = [samples_dir]
+    config_rel = xs_only.find_target_config(sdk_root, args.target)
+    if config_rel:
+        files.append(os.path.join(sdk_root, config_rel))
+
+    build_argv = ['b', args.target]
+    if args.only:
+        build_argv += ['--only', f'{space}/{project}']
+    if args.fail_fast:
+        build_argv.append('--fail-fast')
+
+    watcher, mode = create_watcher(dirs, files, args.poll)
+    print(f"正在监视 {', '.join(os.path.relpath(d, sdk_root) for d in dirs)}"
+          f"{' 和 ' + config_rel if config_rel else ''} ({mode})")
+    print(f"修改后执行: xs {' '.join(build_argv)}")
+    print("等待修改... (Ctrl+C 退出)", flush=True)
+    try:
+        watch_loop(watcher, build_argv, sdk_root, args.queue, args.debounce)
+    except KeyboardInterrupt:
+        print("\n已停止监视")
+    finally:
+        watcher.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())